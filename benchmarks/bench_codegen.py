@@ -0,0 +1,84 @@
+# ============================================
+# Nova codegen throughput benchmark
+# Measures how many IR instructions per second
+# LLVMBackend can lower into LLVM IR.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_codegen
+# ============================================
+
+import time
+
+from compiler.ir import IRModule, IRFunction, IRInstruction, IRConst, OpCode
+from compiler.codegen_nomc import LLVMBackend
+
+FUNCTIONS = 50
+INSTRUCTIONS_PER_FUNCTION = 2000
+ROUNDS = 5
+
+# Opcodes cycled through by the synthetic workload, so handlers
+# across the whole dispatch table are exercised.
+BINARY_OPS = [
+    OpCode.ADD, OpCode.SUB, OpCode.MUL, OpCode.DIV, OpCode.MOD,
+    OpCode.EQ, OpCode.NE, OpCode.LT, OpCode.LE, OpCode.GT, OpCode.GE,
+]
+
+
+def build_workload(functions=FUNCTIONS, size=INSTRUCTIONS_PER_FUNCTION):
+    """Build a synthetic IRModule of straight-line integer code."""
+    module = IRModule("bench_codegen")
+
+    for f in range(functions):
+        func = IRFunction(f"bench_{f}")
+        block = func.new_block("entry")
+        module.add_function(func)
+
+        def emit(opcode, operands, result=True):
+            temp = func.new_temp() if result else None
+            block.add(IRInstruction(opcode, operands, result=temp))
+            return temp
+
+        acc = emit(OpCode.LOAD_CONST, [IRConst(1)])
+        emit(OpCode.STORE_VAR, ["acc", acc], result=False)
+
+        i = 0
+        while len(block.instructions) < size:
+            lhs = emit(OpCode.LOAD_VAR, ["acc"])
+            rhs = emit(OpCode.LOAD_CONST, [IRConst(i % 7 + 1)])
+            op = BINARY_OPS[i % len(BINARY_OPS)]
+            res = emit(op, [lhs, rhs])
+            if op in (OpCode.ADD, OpCode.SUB, OpCode.MUL, OpCode.DIV, OpCode.MOD):
+                emit(OpCode.STORE_VAR, ["acc", res], result=False)
+            i += 1
+
+        emit(OpCode.RETURN, [emit(OpCode.LOAD_VAR, ["acc"])], result=False)
+
+    return module
+
+
+def count_instructions(module):
+    return sum(
+        len(block.instructions)
+        for func in module.functions
+        for block in func.blocks
+    )
+
+
+def run():
+    module = build_workload()
+    total = count_instructions(module)
+
+    best = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        LLVMBackend().build_llvm_module(module)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"IR instructions : {total}")
+    print(f"best of {ROUNDS}       : {best * 1000:.1f} ms")
+    print(f"throughput      : {total / best:,.0f} instr/s")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,235 @@
+# ============================================
+# Nova streaming JSON benchmark
+# std/json.loads_iter over a JSON Lines log and
+# std/json.dump_to of a large array, next to the
+# whole-document json.loads / json.dumps they
+# replace: wall time, and peak Python memory
+# (tracemalloc, separate smaller run).
+#
+# Compiled: stdlib/json.nova's streaming natives
+# lowered through LLVMBackend and driven from
+# compiled code, and dumps' nesting pattern as
+# compiled code: one output string threaded
+# through the recursion (json.nova's dump_list)
+# vs every level returning its own string that
+# the parent copies (the old dumps, quadratic
+# in the nesting depth).
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_json
+# ============================================
+
+import ctypes
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from compiler.ir import OpCode
+from compiler.codegen_nomc import LLVMBackend
+from benchmarks.common import FunctionWriter, jit_compile, best_time, native_wrappers
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "runtime"))
+import native_objects  # noqa: E402
+from json_stream import dump_to, loads_iter  # noqa: E402
+from native_bridge import NativeBridge  # noqa: E402
+
+RECORDS = 400_000
+MEMORY_RECORDS = 50_000
+DEPTHS = [1_000, 4_000, 16_000]
+STREAM_NATIVES = {"dump_to", "loads_iter", "next_value"}
+
+
+def record(i):
+    return {"ts": 1_700_000_000 + i, "level": "info" if i % 10 else "warn",
+            "msg": f"request {i} served", "ms": i % 97 * 0.25, "tags": ["api", "v2"]}
+
+
+def write_log(path, n):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps(record(i)))
+            f.write("\n")
+
+
+def read_whole(path):
+    with open(path, "rb") as f:
+        return sum(1 for line in f.read().decode("utf8").splitlines() if json.loads(line))
+
+
+def read_stream(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return sum(1 for _ in loads_iter(fd))
+    finally:
+        os.close(fd)
+
+
+def write_whole(path, values):
+    with open(path, "w", encoding="utf-8") as f:
+        return f.write(json.dumps(values))
+
+
+def write_stream(path, values):
+    with open(path, "w", encoding="utf-8") as f:
+        return dump_to(values, f)
+
+
+def build_count_values():
+    # use std/json
+    # func count_values(fd: int) -> int {
+    #     values = json.loads_iter(fd)
+    #     count = 0
+    #     value = json.next_value(values)
+    #     while value != 0 { count = count + 1; sys.release(value); value = json.next_value(values) }
+    #     sys.release(values)
+    #     return count
+    # }
+    w = FunctionWriter("count_values", ["fd"], ["int"], "int")
+    w.emit(OpCode.STORE_VAR, ["values", w.emit(OpCode.CALL, ["loads_iter", [w.load("fd")]])], result=False)
+    w.emit(OpCode.STORE_VAR, ["count", w.const(0)], result=False)
+    w.emit(OpCode.STORE_VAR, ["value", w.emit(OpCode.CALL, ["next_value", [w.load("values")]])], result=False)
+    w.emit(OpCode.JUMP, ["cond"], result=False)
+
+    w.new_block("cond")
+    w.emit(OpCode.JUMP_IF_TRUE, [w.emit(OpCode.EQ, [w.load("value"), w.const(0)]), "done"], result=False)
+    w.emit(OpCode.STORE_VAR, ["count", w.emit(OpCode.ADD, [w.load("count"), w.const(1)])], result=False)
+    w.emit(OpCode.NATIVE_CALL, ["std/sys.release", [w.load("value")], "void"], result=False)
+    w.emit(OpCode.STORE_VAR, ["value", w.emit(OpCode.CALL, ["next_value", [w.load("values")]])], result=False)
+    w.emit(OpCode.JUMP, ["cond"], result=False)
+
+    w.new_block("done")
+    w.emit(OpCode.NATIVE_CALL, ["std/sys.release", [w.load("values")], "void"], result=False)
+    w.emit(OpCode.RETURN, [w.load("count")], result=False)
+    return w.func
+
+
+def build_dump_nested():
+    # As json.nova's dump_list, for a list nested depth times:
+    # func dump_nested(out: str, depth: int) -> str {
+    #     out = out + "["
+    #     if depth > 0 { out = dump_nested(out, depth - 1) }
+    #     return out + "]"
+    # }
+    w = FunctionWriter("dump_nested", ["out", "depth"], ["str", "int"], "str")
+    w.emit(OpCode.STORE_VAR, ["out", w.emit(OpCode.ADD, [w.load("out"), w.const("[")])], result=False)
+    w.emit(OpCode.JUMP_IF_FALSE, [w.emit(OpCode.GT, [w.load("depth"), w.const(0)]), "close"], result=False)
+    inner = w.emit(OpCode.CALL, ["dump_nested", [w.load("out"), w.emit(OpCode.SUB, [w.load("depth"), w.const(1)])]])
+    w.emit(OpCode.STORE_VAR, ["out", inner], result=False)
+    w.emit(OpCode.JUMP, ["close"], result=False)
+    w.new_block("close")
+    w.emit(OpCode.RETURN, [w.emit(OpCode.ADD, [w.load("out"), w.const("]")])], result=False)
+    return w.func
+
+
+def build_dump_nested_copy():
+    # The old dumps: every level builds its own string
+    # func dump_nested_copy(depth: int) -> str {
+    #     out = "["
+    #     if depth > 0 { out = out + dump_nested_copy(depth - 1) }
+    #     return out + "]"
+    # }
+    w = FunctionWriter("dump_nested_copy", ["depth"], ["int"], "str")
+    w.emit(OpCode.STORE_VAR, ["out", w.const("[")], result=False)
+    w.emit(OpCode.JUMP_IF_FALSE, [w.emit(OpCode.GT, [w.load("depth"), w.const(0)]), "close"], result=False)
+    inner = w.emit(OpCode.CALL, ["dump_nested_copy", [w.emit(OpCode.SUB, [w.load("depth"), w.const(1)])]])
+    w.emit(OpCode.STORE_VAR, ["out", w.emit(OpCode.ADD, [w.load("out"), inner])], result=False)
+    w.emit(OpCode.JUMP, ["close"], result=False)
+    w.new_block("close")
+    w.emit(OpCode.RETURN, [w.emit(OpCode.ADD, [w.load("out"), w.const("]")])], result=False)
+    return w.func
+
+
+def build_dumps_length(name, dump, threaded):
+    # func <name>(depth: int) -> int { return len(dump_nested("", depth))  or  len(dump_nested_copy(depth)) }
+    w = FunctionWriter(name, ["depth"], ["int"], "int")
+    args = [w.const(""), w.load("depth")] if threaded else [w.load("depth")]
+    w.emit(OpCode.RETURN, [w.emit(OpCode.STR_LEN, [w.emit(OpCode.CALL, [dump, args])])], result=False)
+    return w.func
+
+
+def compile_json_module():
+    """json.nova's streaming natives plus the compiled cases, JIT-compiled with the bridge registered."""
+    module, _ = native_wrappers(os.path.join(ROOT, "stdlib", "json.nova"))
+    wrapped = {func.name for func in module.functions}
+    assert wrapped == STREAM_NATIVES, f"json.nova native wrappers: {sorted(wrapped)}"
+    module.add_function(build_count_values())
+    module.add_function(build_dump_nested())
+    module.add_function(build_dump_nested_copy())
+    module.add_function(build_dumps_length("dumps_threaded", "dump_nested", True))
+    module.add_function(build_dumps_length("dumps_copying", "dump_nested_copy", False))
+
+    backend = LLVMBackend()
+    backend.build_llvm_module(module)  # every wrapper must lower; collects the trampolines
+    bridge = NativeBridge()
+    bridge.register(sorted(backend.natives))  # before finalize, as the launcher does
+    return bridge, jit_compile(module, backend)
+
+
+def count_compiled(count_values, path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return count_values(fd)
+    finally:
+        os.close(fd)
+
+
+def peak_memory(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run():
+    with tempfile.TemporaryDirectory() as tmp:
+        log = os.path.join(tmp, "log.jsonl")
+        out = os.path.join(tmp, "out.json")
+        write_log(log, RECORDS)
+        size = os.path.getsize(log)
+        values = [record(i) for i in range(RECORDS)]
+        print(f"{RECORDS:,} records, {size / (1 << 20):.1f} MiB")
+
+        for label, whole, stream, args in (
+            ("decode", read_whole, read_stream, (log,)),
+            ("encode", write_whole, write_stream, (out, values)),
+        ):
+            t_whole, n_whole = best_time(whole, *args, rounds=3)
+            t_stream, n_stream = best_time(stream, *args, rounds=3)
+            assert n_whole == n_stream
+            print(f"  {label}   whole {t_whole * 1000:7.0f} ms   streaming {t_stream * 1000:7.0f} ms")
+
+        bridge, engine = compile_json_module()
+        fn = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_int)
+        count_values = fn(engine.get_function_address("count_values"))
+        t_compiled, count = best_time(count_compiled, count_values, log, rounds=3)
+        assert count == RECORDS
+        assert list(native_objects.objects) == [0], "count_values leaked handles"
+        print(f"  decode   compiled json.nova loads_iter/next_value {t_compiled * 1000:7.0f} ms")
+
+        print("compiled dumps of a list nested depth times:")
+        threaded = fn(engine.get_function_address("dumps_threaded"))
+        copying = fn(engine.get_function_address("dumps_copying"))
+        for depth in DEPTHS:
+            t_threaded, n_threaded = best_time(threaded, depth, rounds=3)
+            t_copying, n_copying = best_time(copying, depth, rounds=1)
+            assert n_threaded == n_copying == 2 * (depth + 1)
+            print(f"  depth {depth:>6,}   one output string {t_threaded * 1000:8.2f} ms   "
+                  f"string per level {t_copying * 1000:8.2f} ms")
+
+        write_log(log, MEMORY_RECORDS)
+        small = values[:MEMORY_RECORDS]
+        print(f"peak Python memory, {MEMORY_RECORDS:,} records "
+              f"({os.path.getsize(log) / (1 << 20):.1f} MiB):")
+        print(f"  decode   whole {peak_memory(read_whole, log) / (1 << 20):6.1f} MiB   "
+              f"streaming {peak_memory(read_stream, log) / (1 << 20):6.1f} MiB")
+        print(f"  encode   whole {peak_memory(write_whole, out, small) / (1 << 20):6.1f} MiB   "
+              f"streaming {peak_memory(write_stream, out, small) / (1 << 20):6.1f} MiB")
+
+
+if __name__ == "__main__":
+    run()
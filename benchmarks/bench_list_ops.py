@@ -0,0 +1,87 @@
+# ============================================
+# Nova bulk list operation benchmark
+# Compares the vectorized list intrinsics from
+# stdlib/collections.nova against the same
+# reduction written as a for-each loop, and
+# reports effective memory throughput.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_list_ops
+# ============================================
+
+import ctypes
+import random
+
+from compiler.ir import IRModule, IRConst, OpCode
+from benchmarks.common import FunctionWriter, for_each, jit_compile, best_time, host_list
+
+SIZES = [1_000, 100_000, 4_000_000]
+
+
+def build_module():
+    module = IRModule("bench_list_ops")
+
+    # func scalar_sum(xs: list[float]) -> float
+    w = FunctionWriter("scalar_sum", ["xs"], ["list[float]"], "float")
+    w.emit(OpCode.STORE_VAR, ["acc", w.const(0.0)], result=False)
+    for_each(w, w.load("xs"), "sum",
+             lambda x: w.emit(OpCode.STORE_VAR, ["acc", w.emit(OpCode.ADD, [w.load("acc"), x])], result=False))
+    w.emit(OpCode.RETURN, [w.load("acc")], result=False)
+    module.add_function(w.func)
+
+    # func scalar_dot(a: list[float], b: list[float]) -> float
+    w = FunctionWriter("scalar_dot", ["a", "b"], ["list[float]", "list[float]"], "float")
+    w.emit(OpCode.STORE_VAR, ["acc", w.const(0.0)], result=False)
+    w.emit(OpCode.STORE_VAR, ["i", w.const(0)], result=False)
+
+    def dot_step(x):
+        y = w.emit(OpCode.LIST_GET, [w.load("b"), w.load("i")])
+        prod = w.emit(OpCode.MUL, [x, y])
+        w.emit(OpCode.STORE_VAR, ["acc", w.emit(OpCode.ADD, [w.load("acc"), prod])], result=False)
+        w.emit(OpCode.STORE_VAR, ["i", w.emit(OpCode.ADD, [w.load("i"), w.const(1)])], result=False)
+
+    for_each(w, w.load("a"), "dot", dot_step)
+    w.emit(OpCode.RETURN, [w.load("acc")], result=False)
+    module.add_function(w.func)
+
+    # Intrinsic versions, as written in stdlib/collections.nova
+    for name, params in (("sum", ["xs"]), ("dot", ["a", "b"])):
+        w = FunctionWriter(f"vector_{name}", params, ["list[float]"] * len(params), "float")
+        args = [w.load(p) for p in params]
+        res = w.emit(OpCode.CALL, ["__intrinsic__", [IRConst(f"list.{name}")] + args])
+        w.emit(OpCode.RETURN, [res], result=False)
+        module.add_function(w.func)
+
+    return module
+
+
+def run():
+    engine = jit_compile(build_module())
+
+    def load(name, nargs):
+        proto = ctypes.CFUNCTYPE(ctypes.c_double, *([ctypes.c_void_p] * nargs))
+        return proto(engine.get_function_address(name))
+
+    kernels = [
+        ("sum", 1, load("scalar_sum", 1), load("vector_sum", 1)),
+        ("dot", 2, load("scalar_dot", 2), load("vector_dot", 2)),
+    ]
+
+    rng = random.Random(0)
+    for n in SIZES:
+        lists = [host_list(ctypes.c_double, (rng.random() for _ in range(n))) for _ in range(2)]
+        ptrs = [ctypes.addressof(lst) for lst in lists]
+        rounds = max(3, 10_000_000 // n)
+
+        for name, nargs, scalar, vector in kernels:
+            t_scalar, expected = best_time(scalar, *ptrs[:nargs], rounds=rounds)
+            t_vector, got = best_time(vector, *ptrs[:nargs], rounds=rounds)
+            assert abs(got - expected) <= 1e-9 * max(1.0, abs(expected))
+
+            gbps = nargs * n * 8 / t_vector / 1e9
+            print(f"{name} n={n:<9} scalar {t_scalar * 1e6:9.1f} us   "
+                  f"vector {t_vector * 1e6:9.1f} us   x{t_scalar / t_vector:4.1f}   {gbps:5.1f} GB/s")
+
+
+if __name__ == "__main__":
+    run()
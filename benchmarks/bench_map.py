@@ -0,0 +1,69 @@
+# ============================================
+# Nova map lookup benchmark
+# Builds a map[int] from N string keys and times
+# MAP_GET over all of them in compiled code.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_map
+# ============================================
+
+import ctypes
+
+from compiler.ir import IRModule, IRConst, OpCode
+from benchmarks.common import FunctionWriter, for_each, jit_compile, best_time, host_str_list
+
+KEYS = 100_000
+LOOKUP_ROUNDS = 10
+
+
+def build_module():
+    # func build(keys: list[str]) -> map[int]
+    b = FunctionWriter("build", ["keys"], ["list[str]"], "map[int]")
+    b.emit(OpCode.STORE_VAR, ["m", b.emit(OpCode.MAP_NEW, [IRConst("int")])], result=False)
+    for_each(b, b.load("keys"), "fill",
+             lambda k: b.emit(OpCode.MAP_SET, [b.load("m"), k, b.const(1)], result=False))
+    b.emit(OpCode.RETURN, [b.load("m")], result=False)
+
+    # func lookup(m: map[int], keys: list[str], rounds: int) -> int
+    w = FunctionWriter("lookup", ["m", "keys", "rounds"], ["map[int]", "list[str]", "int"], "int")
+    w.emit(OpCode.STORE_VAR, ["acc", w.const(0)], result=False)
+    w.emit(OpCode.STORE_VAR, ["r", w.const(0)], result=False)
+    w.emit(OpCode.JUMP, ["rounds_cond"], result=False)
+    w.new_block("rounds_cond")
+    more = w.emit(OpCode.LT, [w.load("r"), w.load("rounds")])
+    w.emit(OpCode.JUMP_IF_FALSE, [more, "done"], result=False)
+
+    def add(k):
+        val = w.emit(OpCode.MAP_GET, [w.load("m"), k])
+        w.emit(OpCode.STORE_VAR, ["acc", w.emit(OpCode.ADD, [w.load("acc"), val])], result=False)
+
+    for_each(w, w.load("keys"), "scan", add)
+    w.emit(OpCode.STORE_VAR, ["r", w.emit(OpCode.ADD, [w.load("r"), w.const(1)])], result=False)
+    w.emit(OpCode.JUMP, ["rounds_cond"], result=False)
+    w.new_block("done")
+    w.emit(OpCode.RETURN, [w.load("acc")], result=False)
+
+    module = IRModule("bench_map")
+    module.add_function(b.func)
+    module.add_function(w.func)
+    return module
+
+
+def run():
+    engine = jit_compile(build_module())
+    build = ctypes.CFUNCTYPE(ctypes.c_void_p, ctypes.c_void_p)(engine.get_function_address("build"))
+    lookup = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int)(
+        engine.get_function_address("lookup"))
+
+    lst = host_str_list(f"config.key.{i}".encode() for i in range(KEYS))
+
+    t_build, m = best_time(build, ctypes.addressof(lst), rounds=1)
+    t_lookup, total = best_time(lookup, m, ctypes.addressof(lst), LOOKUP_ROUNDS)
+    assert total == KEYS * LOOKUP_ROUNDS
+
+    print(f"insert : {t_build / KEYS * 1e9:6.1f} ns/key  ({KEYS} keys)")
+    print(f"lookup : {t_lookup / (KEYS * LOOKUP_ROUNDS) * 1e9:6.1f} ns/key")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,222 @@
+# ============================================
+# Nova std/math benchmark
+# sqrt, exp, log and sin two ways:
+#
+#   nova   the pure-Nova bodies of stdlib/math.nova
+#          (Newton / Taylor series), what --no-libm
+#          builds call
+#   llvm   math.<name>(x) lowered by the backend to
+#          llvm.sqrt/exp/log/sin intrinsics (libm)
+#
+# Speed: ns per call of a loop summing f(x) over a
+# list. Precision: worst error against Python's
+# math module, relative (absolute for |f(x)| < 1).
+# Also checks that math.sqrt(2.0) is constant-folded.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_math
+# ============================================
+
+import ctypes
+import math
+
+from compiler.codegen_nomc import LLVMBackend
+from compiler.ir import IRModule, OpCode
+from benchmarks.common import FunctionWriter, for_each, jit_compile, best_time, host_list
+
+N = 100_000
+SAMPLES = 2_000
+PI = 3.141592653589793
+
+# name -> (Python reference, input range)
+FUNCTIONS = {
+    "sqrt": (math.sqrt, (0.01, 10_000.0)),
+    "exp": (math.exp, (-10.0, 10.0)),
+    "log": (math.log, (0.1, 10.0)),
+    "sin": (math.sin, (-100.0, 100.0)),
+}
+
+
+def counted_loop(w, label, count, body):
+    # i = 0; while i < count { body(i); i = i + 1 }
+    w.emit(OpCode.STORE_VAR, [f"{label}_i", w.const(0)], result=False)
+    w.emit(OpCode.JUMP, [f"{label}_cond"], result=False)
+    w.new_block(f"{label}_cond")
+    done = w.emit(OpCode.GE, [w.load(f"{label}_i"), w.const(count)])
+    w.emit(OpCode.JUMP_IF_TRUE, [done, f"{label}_end"], result=False)
+    body(w.load(f"{label}_i"))
+    w.emit(OpCode.STORE_VAR, [f"{label}_i", w.emit(OpCode.ADD, [w.load(f"{label}_i"), w.const(1)])],
+           result=False)
+    w.emit(OpCode.JUMP, [f"{label}_cond"], result=False)
+    w.new_block(f"{label}_end")
+
+
+# --------------------------------------------
+# stdlib/math.nova, written as IR
+# --------------------------------------------
+def build_sqrt():
+    # guess = x; 20 Newton steps guess = 0.5 * (guess + x / guess)
+    w = FunctionWriter("sqrt", ["x"], ["float"], "float")
+    zero = w.emit(OpCode.EQ, [w.load("x"), w.const(0.0)])
+    w.emit(OpCode.JUMP_IF_FALSE, [zero, "newton"], result=False)
+    w.emit(OpCode.RETURN, [w.const(0.0)], result=False)
+
+    w.new_block("newton")
+    w.emit(OpCode.STORE_VAR, ["guess", w.load("x")], result=False)
+
+    def step(_):
+        ratio = w.emit(OpCode.DIV, [w.load("x"), w.load("guess")])
+        half = w.emit(OpCode.MUL, [w.const(0.5), w.emit(OpCode.ADD, [w.load("guess"), ratio])])
+        w.emit(OpCode.STORE_VAR, ["guess", half], result=False)
+
+    counted_loop(w, "step", 20, step)
+    w.emit(OpCode.RETURN, [w.load("guess")], result=False)
+    return w.func
+
+
+def build_exp():
+    # Taylor series, 20 terms: term = term * (x / n); sum = sum + term
+    w = FunctionWriter("exp", ["x"], ["float"], "float")
+    w.emit(OpCode.STORE_VAR, ["term", w.const(1.0)], result=False)
+    w.emit(OpCode.STORE_VAR, ["sum", w.const(1.0)], result=False)
+    w.emit(OpCode.STORE_VAR, ["n", w.const(1.0)], result=False)
+
+    def term(_):
+        ratio = w.emit(OpCode.DIV, [w.load("x"), w.load("n")])
+        w.emit(OpCode.STORE_VAR, ["term", w.emit(OpCode.MUL, [w.load("term"), ratio])], result=False)
+        w.emit(OpCode.STORE_VAR, ["sum", w.emit(OpCode.ADD, [w.load("sum"), w.load("term")])], result=False)
+        w.emit(OpCode.STORE_VAR, ["n", w.emit(OpCode.ADD, [w.load("n"), w.const(1.0)])], result=False)
+
+    counted_loop(w, "term", 19, term)
+    w.emit(OpCode.RETURN, [w.load("sum")], result=False)
+    return w.func
+
+
+def build_log():
+    # y = 1.0; 30 Newton steps on exp(y) = x
+    w = FunctionWriter("log", ["x"], ["float"], "float")
+    w.emit(OpCode.STORE_VAR, ["y", w.const(1.0)], result=False)
+
+    def step(_):
+        ey = w.emit(OpCode.CALL, ["exp", [w.load("y")]])
+        delta = w.emit(OpCode.DIV, [w.emit(OpCode.SUB, [ey, w.load("x")]), ey])
+        w.emit(OpCode.STORE_VAR, ["y", w.emit(OpCode.SUB, [w.load("y"), delta])], result=False)
+
+    counted_loop(w, "step", 30, step)
+    w.emit(OpCode.RETURN, [w.load("y")], result=False)
+    return w.func
+
+
+def build_sin():
+    # x = x % TWO_PI, folded into (-PI, PI]; 4-term Taylor series
+    w = FunctionWriter("sin", ["x"], ["float"], "float")
+    w.emit(OpCode.STORE_VAR, ["x", w.emit(OpCode.MOD, [w.load("x"), w.const(2.0 * PI)])], result=False)
+    above = w.emit(OpCode.GT, [w.load("x"), w.const(PI)])
+    w.emit(OpCode.JUMP_IF_FALSE, [above, "series"], result=False)
+    w.emit(OpCode.STORE_VAR, ["x", w.emit(OpCode.SUB, [w.load("x"), w.const(2.0 * PI)])], result=False)
+    w.emit(OpCode.JUMP, ["series"], result=False)
+
+    w.new_block("series")
+    x = w.load("x")
+    x2 = w.emit(OpCode.MUL, [x, x])
+    x3 = w.emit(OpCode.MUL, [x, x2])
+    x5 = w.emit(OpCode.MUL, [x3, x2])
+    x7 = w.emit(OpCode.MUL, [x5, x2])
+    result = w.emit(OpCode.SUB, [x, w.emit(OpCode.DIV, [x3, w.const(6.0)])])
+    result = w.emit(OpCode.ADD, [result, w.emit(OpCode.DIV, [x5, w.const(120.0)])])
+    result = w.emit(OpCode.SUB, [result, w.emit(OpCode.DIV, [x7, w.const(5040.0)])])
+    w.emit(OpCode.RETURN, [result], result=False)
+    return w.func
+
+
+# --------------------------------------------
+# Callers, one set per path
+# --------------------------------------------
+def build_call(name, callee):
+    # func call_<name>(x: float) -> float { return <callee>(x) }
+    w = FunctionWriter(f"call_{name}", ["x"], ["float"], "float")
+    w.emit(OpCode.RETURN, [w.emit(OpCode.CALL, [callee, [w.load("x")]])], result=False)
+    return w.func
+
+
+def build_sum(name, callee):
+    # func sum_<name>(xs: list[float]) -> float {
+    #     total = 0.0
+    #     for x in xs { total = total + <callee>(x) }
+    #     return total
+    # }
+    w = FunctionWriter(f"sum_{name}", ["xs"], ["list[float]"], "float")
+    w.emit(OpCode.STORE_VAR, ["total", w.const(0.0)], result=False)
+
+    def body(x):
+        value = w.emit(OpCode.CALL, [callee, [x]])
+        w.emit(OpCode.STORE_VAR, ["total", w.emit(OpCode.ADD, [w.load("total"), value])], result=False)
+
+    for_each(w, w.load("xs"), "loop", body)
+    w.emit(OpCode.RETURN, [w.load("total")], result=False)
+    return w.func
+
+
+def build_module(path):
+    module = IRModule(f"bench_math_{path}")
+    if path == "nova":
+        for build in (build_sqrt, build_exp, build_log, build_sin):
+            module.add_function(build())
+    for name in FUNCTIONS:
+        callee = name if path == "nova" else f"math.{name}"
+        module.add_function(build_call(name, callee))
+        module.add_function(build_sum(name, callee))
+    return module
+
+
+def sqrt2_folded():
+    """True when math.sqrt(2.0) is a constant after -O3."""
+    w = FunctionWriter("sqrt2", [], [], "float")
+    w.emit(OpCode.RETURN, [w.emit(OpCode.CALL, ["math.sqrt", [w.const(2.0)]])], result=False)
+    module = IRModule("bench_math_fold")
+    module.add_function(w.func)
+
+    backend = LLVMBackend()
+    llvm_module = backend.build_llvm_module(module)
+    optimized = backend.optimize(llvm_module, backend.create_target_machine())
+    return "call" not in str(optimized.get_function("sqrt2"))
+
+
+# --------------------------------------------
+# Measurements
+# --------------------------------------------
+def inputs(lo, hi, n):
+    return [lo + (hi - lo) * (i + 0.5) / n for i in range(n)]
+
+
+def max_error(func, reference, xs):
+    worst = 0.0
+    for x in xs:
+        expected = reference(x)
+        err = abs(func(x) - expected) / max(1.0, abs(expected))
+        worst = max(worst, err) if err == err else math.inf  # NaN: no usable result
+    return worst
+
+
+def run():
+    scalar = ctypes.CFUNCTYPE(ctypes.c_double, ctypes.c_double)
+    summed = ctypes.CFUNCTYPE(ctypes.c_double, ctypes.c_void_p)
+
+    engines = {path: jit_compile(build_module(path)) for path in ("nova", "llvm")}
+    print(f"{N:,} calls per function, error over {SAMPLES:,} points")
+    for name, (reference, (lo, hi)) in FUNCTIONS.items():
+        xs = host_list(ctypes.c_double, inputs(lo, hi, N))
+        samples = inputs(lo, hi, SAMPLES)
+        line = f"{name:<5} {f'[{lo:g}, {hi:g}]':<15}"
+        for path, engine in engines.items():
+            call = scalar(engine.get_function_address(f"call_{name}"))
+            total = summed(engine.get_function_address(f"sum_{name}"))
+            elapsed, _ = best_time(total, ctypes.addressof(xs), rounds=5)
+            line += f"   {path} {elapsed / N * 1e9:6.1f} ns, err {max_error(call, reference, samples):8.1e}"
+        print(line)
+
+    print(f"math.sqrt(2.0) constant-folded: {'yes' if sqrt2_folded() else 'no'}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,143 @@
+# ============================================
+# Nova native call benchmark
+# Per-call cost of OpCode.NATIVE_CALL: compiled
+# code calling runtime/native.py through the
+# launcher's ctypes trampolines (per-site handle
+# cache), next to the same calls made from
+# CPython directly and through __native__(),
+# and a list transformed one bridge call per
+# element vs one batched std/math.sqrt_many.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_native_call
+# ============================================
+
+import ctypes
+import math
+import os
+import sys
+
+from compiler.ir import IRModule, OpCode
+from benchmarks.common import FunctionWriter, jit_compile, best_time, host_list
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "runtime"))
+import native  # noqa: E402
+from native_bridge import NativeBridge  # noqa: E402
+
+CALLS = 200_000
+BATCH = 100_000
+
+# (function name, native path, result type, argument kind, Python equivalent)
+CASES = [
+    ("call_sqrt", "math.sqrt", "float", "int", lambda i: math.sqrt(i)),
+    ("call_abs", "builtins.abs", "int", "int", lambda i: abs(i)),
+    ("call_len", "builtins.len", "int", "str", lambda i: len("nova")),
+]
+
+
+def build_loop(name, path, ret, arg):
+    # func <name>(n: int) -> int {
+    #     i = 0
+    #     while i < n { __native__(<path>, i or "nova"); i = i + 1 }
+    #     return i
+    # }
+    w = FunctionWriter(name, ["n"], ["int"], "int")
+    w.emit(OpCode.STORE_VAR, ["i", w.const(0)], result=False)
+    w.emit(OpCode.JUMP, ["cond"], result=False)
+
+    w.new_block("cond")
+    more = w.emit(OpCode.LT, [w.load("i"), w.load("n")])
+    w.emit(OpCode.JUMP_IF_FALSE, [more, "done"], result=False)
+    value = w.load("i") if arg == "int" else w.const("nova")
+    w.emit(OpCode.NATIVE_CALL, [path, [value], ret])
+    w.emit(OpCode.STORE_VAR, ["i", w.emit(OpCode.ADD, [w.load("i"), w.const(1)])], result=False)
+    w.emit(OpCode.JUMP, ["cond"], result=False)
+
+    w.new_block("done")
+    w.emit(OpCode.RETURN, [w.load("i")], result=False)
+    return w.func
+
+
+def build_sqrt_each():
+    # func sqrt_each(xs: list[float]) -> int {
+    #     i = 0
+    #     while i < len(xs) { xs[i] = __native__("std/math.sqrt", xs[i]); i = i + 1 }
+    #     return i
+    # }
+    w = FunctionWriter("sqrt_each", ["xs"], ["list[float]"], "int")
+    w.emit(OpCode.STORE_VAR, ["i", w.const(0)], result=False)
+    w.emit(OpCode.JUMP, ["cond"], result=False)
+
+    w.new_block("cond")
+    more = w.emit(OpCode.LT, [w.load("i"), w.emit(OpCode.LIST_LEN, [w.load("xs")])])
+    w.emit(OpCode.JUMP_IF_FALSE, [more, "done"], result=False)
+    x = w.emit(OpCode.LIST_GET, [w.load("xs"), w.load("i")])
+    root = w.emit(OpCode.NATIVE_CALL, ["std/math.sqrt", [x], "float"])
+    w.emit(OpCode.LIST_SET, [w.load("xs"), w.load("i"), root], result=False)
+    w.emit(OpCode.STORE_VAR, ["i", w.emit(OpCode.ADD, [w.load("i"), w.const(1)])], result=False)
+    w.emit(OpCode.JUMP, ["cond"], result=False)
+
+    w.new_block("done")
+    w.emit(OpCode.RETURN, [w.load("i")], result=False)
+    return w.func
+
+
+def build_sqrt_batch():
+    # func sqrt_batch(xs: list[float]) -> int {
+    #     __native__("std/math.sqrt_many", xs, xs)
+    #     return len(xs)
+    # }
+    w = FunctionWriter("sqrt_batch", ["xs"], ["list[float]"], "int")
+    w.emit(OpCode.NATIVE_CALL, ["std/math.sqrt_many", [w.load("xs"), w.load("xs")], "void"], result=False)
+    w.emit(OpCode.RETURN, [w.emit(OpCode.LIST_LEN, [w.load("xs")])], result=False)
+    return w.func
+
+
+def python_loop(func, n):
+    for i in range(n):
+        func(i)
+    return n
+
+
+def native_loop(path, arg, n):
+    value = "nova"
+    for i in range(n):
+        native.__native__(path, i if arg == "int" else value)
+    return n
+
+
+def run():
+    bridge = NativeBridge()
+    bridge.register(["d_i", "i_i", "i_s", "d_d", "v_FF"])  # before finalize, as the launcher does
+
+    module = IRModule("bench_native_call")
+    for name, path, ret, arg, _ in CASES:
+        module.add_function(build_loop(name, path, ret, arg))
+    module.add_function(build_sqrt_each())
+    module.add_function(build_sqrt_batch())
+    engine = jit_compile(module)
+
+    for name, path, ret, arg, python in CASES:
+        loop = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_int)(engine.get_function_address(name))
+        t_nova, count = best_time(loop, CALLS, rounds=3)
+        assert count == CALLS
+        t_py, _ = best_time(python_loop, python, CALLS, rounds=3)
+        t_native, _ = best_time(native_loop, path, arg, CALLS, rounds=3)
+
+        print(f"{path:<14} compiled {t_nova / CALLS * 1e9:7.0f} ns/call   "
+              f"__native__ {t_native / CALLS * 1e9:7.0f} ns/call   "
+              f"python {t_py / CALLS * 1e9:6.0f} ns/call")
+
+    print(f"\nsqrt over list[float] of {BATCH:,} ({'NumPy' if native.numpy else 'no NumPy'}):")
+    for name in ("sqrt_each", "sqrt_batch"):
+        func = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p)(engine.get_function_address(name))
+        xs = host_list(ctypes.c_double, (float(i * i) for i in range(BATCH)))
+        elapsed, count = best_time(func, ctypes.addressof(xs), rounds=1)
+        assert count == BATCH
+        values = (ctypes.c_double * BATCH).from_address(xs.data)
+        assert values[BATCH - 1] == BATCH - 1
+        print(f"  {name:<11} {elapsed * 1000:8.2f} ms   {elapsed / BATCH * 1e9:6.0f} ns/element")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,69 @@
+# ============================================
+# .novar open benchmark
+# Time to reach the entry .nomc bytes in archives
+# with a growing number of resource members:
+# indexed mmap (NovarArchive) vs. a tarfile scan.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_novar_open
+# ============================================
+
+import os
+import sys
+import tarfile
+import tempfile
+import time
+
+from compiler.novar_pack import pack_novar
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "runtime"))
+from novar_archive import NovarArchive  # noqa: E402
+
+RESOURCE_COUNTS = [10, 1_000, 10_000]
+RESOURCE_SIZE = 4096
+ROUNDS = 5
+
+
+def build_archive(tmp, resources):
+    bin_dir = os.path.join(tmp, f"bin{resources}")
+    os.makedirs(os.path.join(bin_dir, "res"))
+    with open(os.path.join(bin_dir, "main.nomc"), "wb") as f:
+        f.write(os.urandom(64 * 1024))
+    for i in range(resources):
+        with open(os.path.join(bin_dir, "res", f"asset{i:05}.bin"), "wb") as f:
+            f.write(os.urandom(RESOURCE_SIZE))
+    return pack_novar(os.path.join(tmp, f"app{resources}.novar"), bin_dir)
+
+
+def with_index(path):
+    with NovarArchive(path) as archive:
+        return len(archive.read("bin/main.nomc"))
+
+
+def with_tarfile(path):
+    with tarfile.open(path, "r") as tar:
+        return len(tar.extractfile("bin/main.nomc").read())
+
+
+def best(func, path):
+    times = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func(path)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run():
+    with tempfile.TemporaryDirectory() as tmp:
+        for resources in RESOURCE_COUNTS:
+            path = build_archive(tmp, resources)
+            size_mb = os.path.getsize(path) / 1e6
+            t_index = best(with_index, path)
+            t_tar = best(with_tarfile, path)
+            print(f"{resources:>6} members ({size_mb:6.1f} MB)   "
+                  f"index+mmap {t_index * 1000:7.2f} ms   tarfile {t_tar * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,101 @@
+# ============================================
+# Nova recursion benchmark
+# fib and ackermann compiled through LLVMBackend
+# (typed params, direct calls, tail calls) and
+# compared against the same code in CPython.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_recursion
+# ============================================
+
+import ctypes
+import sys
+
+from compiler.ir import IRModule, OpCode
+from benchmarks.common import FunctionWriter, jit_compile, best_time
+
+FIB_N = 27
+ACK_M, ACK_N = 2, 2000
+
+
+def build_fib():
+    # func fib(n: int) -> int {
+    #     if n < 2 { return n }
+    #     return fib(n - 1) + fib(n - 2)
+    # }
+    w = FunctionWriter("fib", ["n"], ["int"], "int")
+    cond = w.emit(OpCode.LT, [w.load("n"), w.const(2)])
+    w.emit(OpCode.JUMP_IF_FALSE, [cond, "recurse"], result=False)
+    w.emit(OpCode.RETURN, [w.load("n")], result=False)
+
+    w.new_block("recurse")
+    a = w.emit(OpCode.CALL, ["fib", [w.emit(OpCode.SUB, [w.load("n"), w.const(1)])]])
+    b = w.emit(OpCode.CALL, ["fib", [w.emit(OpCode.SUB, [w.load("n"), w.const(2)])]])
+    w.emit(OpCode.RETURN, [w.emit(OpCode.ADD, [a, b])], result=False)
+    return w.func
+
+
+def build_ackermann():
+    # func ack(m: int, n: int) -> int {
+    #     if m == 0 { return n + 1 }
+    #     if n == 0 { return ack(m - 1, 1) }
+    #     return ack(m - 1, ack(m, n - 1))
+    # }
+    w = FunctionWriter("ack", ["m", "n"], ["int", "int"], "int")
+    cond = w.emit(OpCode.EQ, [w.load("m"), w.const(0)])
+    w.emit(OpCode.JUMP_IF_FALSE, [cond, "m_nonzero"], result=False)
+    w.emit(OpCode.RETURN, [w.emit(OpCode.ADD, [w.load("n"), w.const(1)])], result=False)
+
+    w.new_block("m_nonzero")
+    cond = w.emit(OpCode.EQ, [w.load("n"), w.const(0)])
+    w.emit(OpCode.JUMP_IF_FALSE, [cond, "general"], result=False)
+    m1 = w.emit(OpCode.SUB, [w.load("m"), w.const(1)])
+    w.emit(OpCode.RETURN, [w.emit(OpCode.CALL, ["ack", [m1, w.const(1)]])], result=False)
+
+    w.new_block("general")
+    inner = w.emit(OpCode.CALL, ["ack", [w.load("m"), w.emit(OpCode.SUB, [w.load("n"), w.const(1)])]])
+    m1 = w.emit(OpCode.SUB, [w.load("m"), w.const(1)])
+    w.emit(OpCode.RETURN, [w.emit(OpCode.CALL, ["ack", [m1, inner]])], result=False)
+    return w.func
+
+
+def py_fib(n):
+    if n < 2:
+        return n
+    return py_fib(n - 1) + py_fib(n - 2)
+
+
+def py_ack(m, n):
+    if m == 0:
+        return n + 1
+    if n == 0:
+        return py_ack(m - 1, 1)
+    return py_ack(m - 1, py_ack(m, n - 1))
+
+
+def report(name, native, python):
+    (t_native, r_native), (t_py, r_py) = native, python
+    assert r_native == r_py, f"{name}: {r_native} != {r_py}"
+    print(f"{name:<16} nova {t_native * 1000:8.2f} ms   "
+          f"python {t_py * 1000:8.2f} ms   x{t_py / t_native:,.0f}")
+
+
+def run():
+    module = IRModule("bench_recursion", exports=["fib", "ack"])
+    module.add_function(build_fib())
+    module.add_function(build_ackermann())
+    engine = jit_compile(module)
+
+    fib = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_int)(engine.get_function_address("fib"))
+    ack = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_int, ctypes.c_int)(
+        engine.get_function_address("ack"))
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), ACK_N * 4))
+
+    report(f"fib({FIB_N})", best_time(fib, FIB_N), best_time(py_fib, FIB_N, rounds=1))
+    report(f"ack({ACK_M}, {ACK_N})", best_time(ack, ACK_M, ACK_N),
+           best_time(py_ack, ACK_M, ACK_N, rounds=1))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,67 @@
+# ============================================
+# Nova module load benchmark
+# Times launcher.load_nomc_from_bytes on the same
+# .nomc container twice: linking the embedded
+# precompiled object vs. JIT-compiling its bitcode.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_startup
+# ============================================
+
+import os
+import sys
+import tempfile
+import time
+
+from compiler.ir import IRModule
+from compiler.codegen_nomc import generate_nomc
+from benchmarks.bench_codegen import build_workload
+from benchmarks.bench_map import build_module as build_map_module
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "runtime"))
+import launcher  # noqa: E402
+from nomc_format import BITCODE, OBJECT, unpack_nomc  # noqa: E402
+
+ROUNDS = 5
+
+
+def build_module():
+    """A small tool: the map benchmark plus a few hundred lines of arithmetic."""
+    module = IRModule("bench_startup")
+    for source in (build_map_module(), build_workload(functions=4, size=500)):
+        for func in source.functions:
+            module.add_function(func)
+    return module
+
+
+def best_load(data):
+    best = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        engine = launcher.load_nomc_from_bytes(data)
+        elapsed = time.perf_counter() - start
+        assert engine.get_function_address("lookup")
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_startup.nomc")
+        generate_nomc(build_module(), output=path)
+        with open(path, "rb") as f:
+            data = f.read()
+
+    meta, sections = unpack_nomc(data)
+    assert launcher.object_matches_host(meta)
+
+    t_object = best_load(data)
+    t_bitcode = best_load(bytes(sections[BITCODE]))
+
+    print(f".nomc size      : {len(data):,} bytes (object {len(sections[OBJECT]):,})")
+    print(f"load object     : {t_object * 1000:7.2f} ms")
+    print(f"JIT bitcode     : {t_bitcode * 1000:7.2f} ms   x{t_bitcode / t_object:.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,59 @@
+# ============================================
+# Nova string append benchmark
+# Times the "out = out + c" loop pattern used
+# throughout stdlib/json.nova. With the builder
+# fast path in STR_CONCAT the cost per append
+# stays flat as the string grows.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_str_concat
+# ============================================
+
+import ctypes
+
+from compiler.ir import IRModule, OpCode
+from benchmarks.common import FunctionWriter, jit_compile, best_time
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def build_module():
+    # func build(n: int) -> int {
+    #     out = ""
+    #     i = 0
+    #     while i < n { out = out + "0123456789"[i % 10]; i = i + 1 }
+    #     return len(out)
+    # }
+    w = FunctionWriter("build", ["n"], ["int"], "int")
+    w.emit(OpCode.STORE_VAR, ["out", w.const("")], result=False)
+    w.emit(OpCode.STORE_VAR, ["i", w.const(0)], result=False)
+    w.emit(OpCode.JUMP, ["cond"], result=False)
+
+    w.new_block("cond")
+    more = w.emit(OpCode.LT, [w.load("i"), w.load("n")])
+    w.emit(OpCode.JUMP_IF_FALSE, [more, "done"], result=False)
+    digit = w.emit(OpCode.STR_GET, [w.const("0123456789"), w.emit(OpCode.MOD, [w.load("i"), w.const(10)])])
+    w.emit(OpCode.STORE_VAR, ["out", w.emit(OpCode.ADD, [w.load("out"), digit])], result=False)
+    w.emit(OpCode.STORE_VAR, ["i", w.emit(OpCode.ADD, [w.load("i"), w.const(1)])], result=False)
+    w.emit(OpCode.JUMP, ["cond"], result=False)
+
+    w.new_block("done")
+    w.emit(OpCode.RETURN, [w.emit(OpCode.STR_LEN, [w.load("out")])], result=False)
+
+    module = IRModule("bench_str_concat")
+    module.add_function(w.func)
+    return module
+
+
+def run():
+    engine = jit_compile(build_module())
+    build = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_int)(engine.get_function_address("build"))
+
+    for n in SIZES:
+        elapsed, length = best_time(build, n, rounds=3)
+        assert length == n
+        print(f"{n:>10} appends : {elapsed * 1000:8.2f} ms   {elapsed / n * 1e9:6.1f} ns/append")
+
+
+if __name__ == "__main__":
+    run()
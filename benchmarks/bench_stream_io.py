@@ -0,0 +1,152 @@
+# ============================================
+# Nova streaming I/O benchmark
+# Reads a file and a socket to the end from
+# compiled code, chunk by chunk, two ways:
+#
+#   str     fs.read(fd, chunk) -> a new str per
+#           chunk (bytes -> str -> runtime copy)
+#   buffer  fs.readinto / net.recv_into into one
+#           bytes_buffer (io.buffer), filled in
+#           place through a writable memoryview
+#
+# The socket is opened by the compiled program
+# with stdlib/net.nova's connect/close, lowered
+# through LLVMBackend with the benchmark.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_stream_io
+# ============================================
+
+import ctypes
+import os
+import socket
+import sys
+import tempfile
+import threading
+
+from compiler.ir import OpCode
+from compiler.codegen_nomc import LLVMBackend
+from benchmarks.common import FunctionWriter, jit_compile, best_time, native_wrappers
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "runtime"))
+from native_bridge import NativeBridge  # noqa: E402
+
+TOTAL_BYTES = 16 << 20
+CHUNKS = [4 << 10, 64 << 10]
+
+
+def build_reader(name, path):
+    # func <name>(fd: int, chunk: int) -> int {
+    #     buf = io.buffer(chunk)                      (buffer readers only)
+    #     total = 0
+    #     while true {
+    #         n = len(fs.read(fd, chunk))  or  <path>(fd, buf)
+    #         if n == 0 { break }
+    #         total = total + n
+    #     }
+    #     return total
+    # }
+    w = FunctionWriter(name, ["fd", "chunk"], ["int", "int"], "int")
+    if path != "std/fs.read":
+        buf = w.emit(OpCode.CALL, ["__intrinsic__", [w.const("bytes.new"), w.load("chunk")]])
+        w.emit(OpCode.STORE_VAR, ["buf", buf], result=False)
+    w.emit(OpCode.STORE_VAR, ["total", w.const(0)], result=False)
+    w.emit(OpCode.JUMP, ["loop"], result=False)
+
+    w.new_block("loop")
+    if path == "std/fs.read":
+        text = w.emit(OpCode.NATIVE_CALL, [path, [w.load("fd"), w.load("chunk")], "str"])
+        n = w.emit(OpCode.STR_LEN, [text])
+    else:
+        n = w.emit(OpCode.NATIVE_CALL, [path, [w.load("fd"), w.load("buf")], "int"])
+    w.emit(OpCode.STORE_VAR, ["n", n], result=False)
+    w.emit(OpCode.JUMP_IF_TRUE, [w.emit(OpCode.EQ, [w.load("n"), w.const(0)]), "done"], result=False)
+    w.emit(OpCode.STORE_VAR, ["total", w.emit(OpCode.ADD, [w.load("total"), w.load("n")])], result=False)
+    w.emit(OpCode.JUMP, ["loop"], result=False)
+
+    w.new_block("done")
+    w.emit(OpCode.RETURN, [w.load("total")], result=False)
+    return w.func
+
+
+def build_fetch(name, reader):
+    # use std/net
+    # func <name>(port: int, chunk: int) -> int {
+    #     sock = net.connect("127.0.0.1", port)
+    #     total = <reader>(sock, chunk)
+    #     net.close(sock)
+    #     return total
+    # }
+    w = FunctionWriter(name, ["port", "chunk"], ["int", "int"], "int")
+    sock = w.emit(OpCode.CALL, ["connect", [w.const("127.0.0.1"), w.load("port")]])
+    w.emit(OpCode.STORE_VAR, ["sock", sock], result=False)
+    total = w.emit(OpCode.CALL, [reader, [w.load("sock"), w.load("chunk")]])
+    w.emit(OpCode.CALL, ["close", [w.load("sock")]], result=False)
+    w.emit(OpCode.RETURN, [total], result=False)
+    return w.func
+
+
+def read_file(reader, path, chunk):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return reader(fd, chunk)
+    finally:
+        os.close(fd)
+
+
+def read_socket(fetch, payload, chunk):
+    server = socket.create_server(("127.0.0.1", 0))
+
+    def send():
+        conn, _ = server.accept()
+        with conn:
+            conn.sendall(payload)
+
+    sender = threading.Thread(target=send)
+    sender.start()
+    try:
+        return fetch(server.getsockname()[1], chunk)
+    finally:
+        sender.join()
+        server.close()
+
+
+def run():
+    module, others = native_wrappers(os.path.join(ROOT, "stdlib", "net.nova"))
+    assert not others, f"net.nova defs that are not native wrappers: {others}"
+    module.add_function(build_reader("read_str", "std/fs.read"))
+    module.add_function(build_reader("readinto", "std/fs.readinto"))
+    module.add_function(build_reader("recv_all", "std/net.recv_into"))
+    module.add_function(build_fetch("fetch_str", "read_str"))
+    module.add_function(build_fetch("fetch_buffer", "recv_all"))
+
+    backend = LLVMBackend()
+    backend.build_llvm_module(module)  # collects the trampolines
+    bridge = NativeBridge()
+    bridge.register(sorted(backend.natives))  # before finalize, as the launcher does
+    engine = jit_compile(module, backend)
+    fn = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_int, ctypes.c_int)
+    readers = {name: fn(engine.get_function_address(name))
+               for name in ("read_str", "readinto", "fetch_str", "fetch_buffer")}
+
+    payload = b"nova" * (TOTAL_BYTES // 4)
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        f.write(payload)
+    try:
+        for source, stream, names in (("file", read_file, ("read_str", "readinto")),
+                                      ("socket", read_socket, ("fetch_str", "fetch_buffer"))):
+            target = f.name if stream is read_file else payload
+            for chunk in CHUNKS:
+                line = f"{source:<6} {chunk >> 10:>3} KiB chunks"
+                for label, name in zip(("str", "buffer"), names):
+                    elapsed, total = best_time(stream, readers[name], target, chunk, rounds=3)
+                    assert total == TOTAL_BYTES
+                    line += f"   {label} {TOTAL_BYTES / elapsed / (1 << 20):8.0f} MiB/s"
+                print(line)
+    finally:
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    run()
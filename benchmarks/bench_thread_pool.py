@@ -0,0 +1,157 @@
+# ============================================
+# Nova worker pool benchmark
+# std/thread task overhead and CPU scaling:
+#
+#   spawn        one threading.Thread per task
+#                (the old thread.spawn + join)
+#   pool submit  the same tasks on a persistent
+#                pool, collected with wait_all
+#   parallel_map a CPU-bound function over a list,
+#                serial vs thread vs process pool
+#   compiled     stdlib/thread.nova lowered through
+#                LLVMBackend, submitting the tiny
+#                tasks from compiled code (handles)
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_thread_pool
+# ============================================
+
+import ctypes
+import os
+import sys
+import threading
+
+from compiler.ir import IRConst, OpCode
+from compiler.codegen_nomc import LLVMBackend
+from benchmarks.common import FunctionWriter, for_each, jit_compile, best_time, native_wrappers
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "runtime"))
+import native_objects  # noqa: E402
+from native_bridge import NativeBridge  # noqa: E402
+from worker_pool import WorkerPool, wait_all  # noqa: E402
+
+TASKS = 5_000
+ITEMS = 64
+WORK = 100_000
+
+
+def tiny(i):
+    return i + 1
+
+
+def busy(n):
+    # Module level so process pools can pickle it
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+
+def spawn_each(n):
+    threads = [threading.Thread(target=tiny, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return n
+
+
+def submit_each(pool, n):
+    return len(wait_all([pool.submit(tiny, i) for i in range(n)]))
+
+
+def build_submit_each():
+    # use std/thread
+    # func submit_each(n: int) -> int {
+    #     workers = thread.pool(0, "thread", 0)
+    #     work = thread.task("builtins.abs")
+    #     futures: list[handle] = []
+    #     i = 0
+    #     while i < n { futures.append(thread.submit(workers, work, [i])); i = i + 1 }
+    #     results = thread.wait_all(futures)
+    #     count = __native__("builtins.len", results)
+    #     for f in futures { sys.release(f) }
+    #     thread.shutdown(workers)
+    #     sys.release(results); sys.release(work); sys.release(workers)
+    #     return count
+    # }
+    w = FunctionWriter("submit_each", ["n"], ["int"], "int")
+    w.emit(OpCode.STORE_VAR, ["workers", w.emit(OpCode.CALL, ["pool", [w.const(0), w.const("thread"), w.const(0)]])],
+           result=False)
+    w.emit(OpCode.STORE_VAR, ["work", w.emit(OpCode.CALL, ["task", [w.const("builtins.abs")]])], result=False)
+    w.emit(OpCode.STORE_VAR, ["futures", w.emit(OpCode.LIST_NEW, [IRConst("handle")])], result=False)
+    w.emit(OpCode.STORE_VAR, ["i", w.const(0)], result=False)
+    w.emit(OpCode.JUMP, ["cond"], result=False)
+
+    w.new_block("cond")
+    more = w.emit(OpCode.LT, [w.load("i"), w.load("n")])
+    w.emit(OpCode.JUMP_IF_FALSE, [more, "done"], result=False)
+    args = w.emit(OpCode.LIST_NEW, [IRConst("int")])
+    w.emit(OpCode.LIST_APPEND, [args, w.load("i")], result=False)
+    future = w.emit(OpCode.CALL, ["submit", [w.load("workers"), w.load("work"), args]])
+    w.emit(OpCode.LIST_APPEND, [w.load("futures"), future], result=False)
+    w.emit(OpCode.STORE_VAR, ["i", w.emit(OpCode.ADD, [w.load("i"), w.const(1)])], result=False)
+    w.emit(OpCode.JUMP, ["cond"], result=False)
+
+    w.new_block("done")
+    results = w.emit(OpCode.CALL, ["wait_all", [w.load("futures")]])
+    count = w.emit(OpCode.NATIVE_CALL, ["builtins.len", [results], "int"])
+    for_each(w, w.load("futures"), "free",
+             lambda f: w.emit(OpCode.NATIVE_CALL, ["std/sys.release", [f], "void"], result=False))
+    w.emit(OpCode.CALL, ["shutdown", [w.load("workers")]], result=False)
+    for obj in (results, w.load("work"), w.load("workers")):
+        w.emit(OpCode.NATIVE_CALL, ["std/sys.release", [obj], "void"], result=False)
+    w.emit(OpCode.RETURN, [count], result=False)
+    return w.func
+
+
+def compile_thread_module():
+    """stdlib/thread.nova plus submit_each, JIT-compiled with the native bridge registered."""
+    module, others = native_wrappers(os.path.join(ROOT, "stdlib", "thread.nova"))
+    assert not others, f"thread.nova defs that are not native wrappers: {others}"
+    module.add_function(build_submit_each())
+
+    backend = LLVMBackend()
+    backend.build_llvm_module(module)  # every wrapper must lower; collects the trampolines
+    bridge = NativeBridge()
+    bridge.register(sorted(backend.natives))  # before finalize, as the launcher does
+    return bridge, jit_compile(module, backend)
+
+
+def run():
+    workers = os.cpu_count() or 1
+    with WorkerPool(workers) as threads, WorkerPool(workers, mode="process") as processes:
+        t_spawn, _ = best_time(spawn_each, TASKS, rounds=3)
+        t_pool, _ = best_time(submit_each, threads, TASKS, rounds=3)
+        print(f"{TASKS:,} tiny tasks:  spawn {t_spawn / TASKS * 1e6:6.1f} us/task   "
+              f"pool submit {t_pool / TASKS * 1e6:6.1f} us/task")
+
+        bridge, engine = compile_thread_module()
+        submit_compiled = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_int)(engine.get_function_address("submit_each"))
+        t_compiled, count = best_time(submit_compiled, TASKS, rounds=3)
+        assert count == TASKS
+        assert list(native_objects.objects) == [0], "compiled submit_each leaked handles"
+        print(f"{TASKS:,} tiny tasks submitted from compiled thread.nova: {t_compiled / TASKS * 1e6:6.1f} us/task "
+              f"({len(bridge.handles)} call sites bound)")
+
+        items = [WORK] * ITEMS
+        expected = [busy(WORK)] * ITEMS
+        t_serial, result = best_time(lambda: [busy(n) for n in items], rounds=1)
+        assert result == expected
+        processes.map(busy, items[:workers])  # start the worker processes
+        print(f"parallel_map busy({WORK:,}) x {ITEMS}, {workers} workers:")
+        print(f"  serial   {t_serial * 1000:8.1f} ms")
+        for pool in (threads, processes):
+            elapsed, result = best_time(pool.map, busy, items, rounds=1)
+            assert result == expected
+            print(f"  {pool.mode:<8} {elapsed * 1000:8.1f} ms   x{t_serial / elapsed:4.1f}")
+
+        m = threads.metrics()
+        print(f"thread pool: {m['completed']:,} tasks, max queue depth {m['max_queue_depth']}, "
+              f"wait avg {m['avg_wait_ms']:.3f} ms max {m['max_wait_ms']:.1f} ms, "
+              f"run avg {m['avg_run_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,146 @@
+# ============================================
+# Shared helpers for Nova benchmarks
+# --------------------------------------------
+# The benchmarks build IR directly (no parser
+# involved) and JIT it through the same
+# LLVMBackend pipeline that emits .nomc files.
+# ============================================
+
+import ctypes
+import re
+import time
+
+from llvmlite import binding
+
+from compiler.ir import IRFunction, IRInstruction, IRConst, IRModule, OpCode
+from compiler.codegen_nomc import LLVMBackend
+
+
+class FunctionWriter:
+    """Tiny helper to write IRFunction bodies by hand."""
+
+    def __init__(self, name, params=None, param_types=None, return_type="int"):
+        self.func = IRFunction(name, params, param_types, return_type)
+        self.block = self.func.new_block("entry")
+
+    def new_block(self, name):
+        self.block = self.func.new_block(name)
+        return self.block
+
+    def emit(self, opcode, operands=None, result=True):
+        temp = self.func.new_temp() if result else None
+        self.block.add(IRInstruction(opcode, operands, result=temp))
+        return temp
+
+    def const(self, value):
+        return self.emit(OpCode.LOAD_CONST, [IRConst(value)])
+
+    def load(self, name):
+        return self.emit(OpCode.LOAD_VAR, [name])
+
+
+def for_each(w, lst, label, body):
+    """Emit a MAKE_ITER/ITER_NEXT loop over lst; body(value) writes the loop body."""
+    it = w.emit(OpCode.MAKE_ITER, [lst])
+    w.emit(OpCode.JUMP, [f"{label}_cond"], result=False)
+    w.new_block(f"{label}_cond")
+    has_next = w.emit(OpCode.ITER_HAS_NEXT, [it])
+    w.emit(OpCode.JUMP_IF_FALSE, [has_next, f"{label}_end"], result=False)
+    body(w.emit(OpCode.ITER_NEXT, [it]))
+    w.emit(OpCode.JUMP, [f"{label}_cond"], result=False)
+    w.new_block(f"{label}_end")
+
+
+# A stdlib wrapper: def name(params) -> ret: with one __native__ call as its body
+NATIVE_WRAPPER = re.compile(
+    r'^def (\w+)\((.*)\)(?: -> ([\w\[\]]+))?:\n    __native__\("([^"]+)"((?:, \w+)*)\)\n', re.M
+)
+
+
+def native_wrappers(path):
+    """
+    IRModule of the native wrappers in a stdlib .nova file, lowered the way
+    the front end lowers them (untyped parameters are "any"). Also returns
+    the names of defs that are not one-line wrappers.
+    """
+    with open(path, encoding="utf8") as f:
+        source = f.read()
+
+    module = IRModule(path.rsplit("/", 1)[-1].split(".")[0])
+    for name, params, ret, native, args in NATIVE_WRAPPER.findall(source):
+        names, types = [], []
+        for param in filter(None, params.split(", ")):
+            param = param.split(" = ")[0]
+            param_name, _, type_name = param.partition(": ")
+            names.append(param_name)
+            types.append(type_name or "any")
+
+        w = FunctionWriter(name, names, types, ret or "void")
+        values = [w.load(arg) for arg in args.split(", ")[1:]]
+        result = w.emit(OpCode.NATIVE_CALL, [native, values, ret or "void"], result=bool(ret))
+        w.emit(OpCode.RETURN, [result] if ret else [], result=False)
+        module.add_function(w.func)
+
+    wrapped = {func.name for func in module.functions}
+    others = [name for name in re.findall(r"^def (\w+)", source, re.M) if name not in wrapped]
+    return module, others
+
+
+class NovaList(ctypes.Structure):
+    """Host view of list<T> = { i64 len, i64 cap, T* data }."""
+    _fields_ = [
+        ("len", ctypes.c_int64),
+        ("cap", ctypes.c_int64),
+        ("data", ctypes.c_void_p),
+    ]
+
+
+class NovaStr(ctypes.Structure):
+    """Host view of str = { i64 len, i64 hash, i8* data, strbuf* buf }."""
+    _fields_ = [
+        ("len", ctypes.c_int64),
+        ("hash", ctypes.c_int64),
+        ("data", ctypes.c_char_p),
+        ("buf", ctypes.c_void_p),
+    ]
+
+
+def host_list(ctype, values):
+    """Build a list<T> compiled code can read; keeps its storage alive."""
+    values = list(values)
+    storage = (ctype * len(values))(*values)
+    lst = NovaList(len(values), len(values), ctypes.cast(storage, ctypes.c_void_p))
+    lst.storage = storage
+    return lst
+
+
+def host_str_list(items):
+    """Build a list<str> from bytes objects (hashes left for the runtime to cache)."""
+    strs = [NovaStr(len(b), 0, b, None) for b in items]
+    lst = host_list(ctypes.c_void_p, [ctypes.addressof(s) for s in strs])
+    lst.strs = strs
+    return lst
+
+
+def jit_compile(ir_module, backend=None):
+    """Lower, optimize and JIT an IRModule; returns the MCJIT engine."""
+    backend = backend or LLVMBackend()
+    llvm_module = backend.build_llvm_module(ir_module)
+    target_machine = backend.create_target_machine()
+    mod = backend.optimize(llvm_module, target_machine)
+
+    engine = binding.create_mcjit_compiler(mod, target_machine)
+    engine.finalize_object()
+    return engine
+
+
+def best_time(func, *args, rounds=5):
+    """Best wall-clock time of func(*args) over rounds; returns (seconds, result)."""
+    best = None
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
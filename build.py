@@ -7,7 +7,7 @@ import sys
 from compiler.lexer import tokenize
 from compiler.parser import parse
 from compiler.ir_builder import build_ir
-from compiler.codegen_nomc import generate_nomc
+from compiler.codegen_nomc import generate_nomc, module_signatures
 from compiler.novar_builder import build_novar
 from compiler.issues import IssueReporter
 
@@ -23,8 +23,8 @@ def build():
 
     reporter = IssueReporter()
 
-    # Compile all .nova files in source_dir
-    compiled_files = []
+    # Parse all .nova files in source_dir
+    ir_modules = []
     for fname in os.listdir(SOURCE_DIR):
         if fname.endswith(".nova"):
             path = os.path.join(SOURCE_DIR, fname)
@@ -44,11 +44,15 @@ def build():
                 reporter.report()
                 sys.exit(1)
 
-            # Build IR and compile to .nomc
-            ir_module = build_ir(ast)
-            nomc_path = os.path.join(BIN_DIR, fname.replace(".nova", ".nomc"))
-            generate_nomc(ir_module, output=nomc_path)
-            compiled_files.append(nomc_path)
+            ir_modules.append((fname, build_ir(ast)))
+
+    # Compile to .nomc; calls between modules use the callee's types
+    signatures = module_signatures(ir_module for _, ir_module in ir_modules)
+    compiled_files = []
+    for fname, ir_module in ir_modules:
+        nomc_path = os.path.join(BIN_DIR, fname.replace(".nova", ".nomc"))
+        generate_nomc(ir_module, output=nomc_path, signatures=signatures)
+        compiled_files.append(nomc_path)
 
     # Package into NovAr
     novar_path = build_novar(PROJECT_NAME, source_dir=SOURCE_DIR,
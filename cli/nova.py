@@ -1,19 +1,134 @@
 # nova.py — Nova CLI wrapper
 # This file goes into PATH and only forwards commands to the real launcher.
+# When a warm `nova --daemon` is listening, runs are handed to it over its
+# Unix socket (see runtime/daemon.py); otherwise the runtime is started.
 
 import sys
 import subprocess
 import os
+import json
+import socket
+import stat
+import struct
+import tempfile
+
+# Must match runtime/daemon.py
+DAEMON_PROTOCOL_VERSION = 1
+REQUEST_HEADER = struct.Struct("<I")
+EXIT_STATUS = struct.Struct("<i")
+
+# Environment handed to the daemon's worker: what the runtime and the
+# program's libraries read, never the caller's tokens or keys
+DAEMON_ENV = ("PATH", "HOME", "USER", "LANG", "TERM", "TZ")
+DAEMON_ENV_PREFIXES = ("LC_", "NOVA_")
+
+
+def daemon_socket_path():
+    override = os.environ.get("NOVA_DAEMON_SOCKET")
+    if override:
+        return override
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"nova-{os.getuid()}")
+    return os.path.join(base, "nova-daemon.sock")
+
+
+def is_private(path, expect):
+    """path is a file of type expect (stat.S_ISDIR / S_ISSOCK) owned by us, no group/other bits."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return expect(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def peer_is_us(sock):
+    """The process listening on sock runs as our user (SO_PEERCRED where available)."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True  # ownership of the socket and its directory was checked
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", creds)
+    return uid == os.getuid()
+
+
+def daemon_env():
+    return {key: value for key, value in os.environ.items()
+            if key in DAEMON_ENV or key.startswith(DAEMON_ENV_PREFIXES)}
+
+
+def run_in_daemon(argv):
+    """
+    Run argv in the warm daemon with this process's stdio.
+    Returns the exit status, or None when no daemon is listening.
+    """
+    if not hasattr(socket, "send_fds"):
+        return None  # no descriptor passing on this platform
+
+    # Our stdio and environment go to whoever listens: only to ourselves
+    path = daemon_socket_path()
+    if not (is_private(os.path.dirname(path) or ".", stat.S_ISDIR) and is_private(path, stat.S_ISSOCK)):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        trusted = peer_is_us(sock)
+    except OSError:
+        trusted = False
+    if not trusted:
+        sock.close()
+        return None
+
+    with sock:
+        payload = json.dumps({
+            "version": DAEMON_PROTOCOL_VERSION,
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "env": daemon_env(),
+        }).encode("utf8")
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        try:
+            socket.send_fds(sock, [REQUEST_HEADER.pack(len(payload))], [0, 1, 2])
+            sock.sendall(payload)
+
+            status = b""
+            while len(status) < EXIT_STATUS.size:
+                chunk = sock.recv(EXIT_STATUS.size - len(status))
+                if not chunk:
+                    break
+                status += chunk
+        except OSError as e:
+            print(f"Lost connection to the Nova daemon: {e}")
+            return 1
+
+    if len(status) < EXIT_STATUS.size:
+        print("The Nova daemon closed the connection without an exit status")
+        return 1
+    return EXIT_STATUS.unpack(status)[0]
+
 
 def main():
-    if len(sys.argv) < 3:
+    args = sys.argv[1:]
+
+    use_daemon = True
+    if args and args[0] == "--no-daemon":
+        use_daemon = False
+        args = args[1:]
+
+    if args != ["--daemon"] and len(args) < 2:
         print("Usage:")
         print("  nova -nomc <file.nomc>")
         print("  nova -novar <file.novar>")
+        print("  nova --daemon                 keep a warm runtime for later runs")
+        print("  nova --no-daemon -novar ...   never hand the run to the daemon")
         sys.exit(1)
 
-    mode = sys.argv[1]
-    path = sys.argv[2]
+    # Hand the run to a warm daemon if one is listening
+    if use_daemon and args != ["--daemon"]:
+        status = run_in_daemon(args)
+        if status is not None:
+            sys.exit(status)
 
     # Path to the real runtime executable
     # After Nuitka build: nova-runtime.exe (or just "nova-runtime" on Linux)
@@ -28,7 +143,7 @@ def main():
         sys.exit(1)
 
     # Forward the call to the runtime
-    cmd = [runtime_exe, mode, path] + sys.argv[3:]
+    cmd = [runtime_exe] + args
 
     try:
         result = subprocess.call(cmd)
@@ -6,14 +6,68 @@ import os
 from compiler.lexer import tokenize
 from compiler.parser import parse
 from compiler.ir_builder import build_ir
-from compiler.codegen_nomc import generate_nomc
+from compiler.codegen_nomc import generate_nomc, generate_nomc_variants, generate_native_object
+from compiler.native_link import NativeLinkError, link_executable
 from compiler.issues import IssueReporter
+from compiler.pgo import ProfileError, ProfileUse, load_profile
 
 from novar_builder import build_novar  
 
 
-def compile_nomc(path: str):
-    """Compile a single .nova file into a .nomc file."""
+def parse_options(args):
+    """Parse the options after the input path (see main() for the list)."""
+    options = {"cpu": "", "features": "", "multiversion": False, "with_object": True,
+               "instrument": False, "profile": None, "native": False, "embed_native": False,
+               "compress": False, "libm": True}
+
+    for arg in args:
+        if arg.startswith("--cpu="):
+            options["cpu"] = arg[len("--cpu="):]
+        elif arg.startswith("--features="):
+            options["features"] = arg[len("--features="):]
+        elif arg == "--multiversion":
+            options["multiversion"] = True
+        elif arg == "--no-object":
+            options["with_object"] = False
+        elif arg == "--profile-generate":
+            options["instrument"] = True
+        elif arg == "--native":
+            options["native"] = True
+        elif arg == "--embed-native":
+            options["embed_native"] = True
+        elif arg == "--compress":
+            options["compress"] = True
+        elif arg == "--no-libm":
+            options["libm"] = False
+        elif arg.startswith("--profile-use="):
+            try:
+                options["profile"] = ProfileUse(load_profile(arg[len("--profile-use="):]))
+            except ProfileError as e:
+                print(e)
+                sys.exit(1)
+        else:
+            print(f"Unknown option: {arg}")
+            sys.exit(1)
+
+    if options["multiversion"] and (options["cpu"] or options["features"]):
+        print("--multiversion cannot be combined with --cpu or --features")
+        sys.exit(1)
+
+    if options["instrument"] and options["profile"]:
+        print("--profile-generate cannot be combined with --profile-use")
+        sys.exit(1)
+
+    if options["instrument"] and (options["native"] or options["embed_native"]):
+        print("--profile-generate needs the launcher to write profiles; drop --native")
+        sys.exit(1)
+
+    return options
+
+
+def compile_nomc(path: str, cpu="", features="", multiversion=False, with_object=True,
+                 instrument=False, profile=None, native=False, embed_native=False, compress=False,
+                 libm=True):
+    """Compile a single .nova file into a .nomc file (and an executable with native)."""
     if not os.path.exists(path):
         print(f"Error: File not found: {path}")
         sys.exit(1)
@@ -47,6 +101,9 @@ def compile_nomc(path: str):
         print(f"IR generation failed: {e}")
         sys.exit(1)
 
+    # Named after the source file: symbol prefixes, profiles and perf maps use it
+    ir_module.name = os.path.splitext(os.path.basename(path))[0]
+
     # Output path (.nova → .nomc)
     if path.endswith(".nova"):
         out_path = path[:-5] + ".nomc"
@@ -55,15 +112,40 @@ def compile_nomc(path: str):
 
     # Codegen
     try:
-        generate_nomc(ir_module, output=out_path)
+        if multiversion:
+            _, variants = generate_nomc_variants(ir_module, output=out_path, with_object=with_object,
+                                                 instrument=instrument, profile=profile, libm=libm)
+        else:
+            generate_nomc(ir_module, output=out_path, cpu=cpu, features=features,
+                          with_object=with_object, instrument=instrument, profile=profile, libm=libm)
+            variants = []
     except Exception as e:
         print(f"Codegen failed: {e}")
         sys.exit(1)
 
     print(f"✅ Compiled .nova → .nomc: {out_path}")
-
-
-def compile_project(project_root: str):
+    for variant in variants:
+        print(f"   {variant['variant']:<9} {variant['path']}")
+
+    if native or embed_native:
+        # Never overwrite the source when it has no .nova suffix
+        exe_path = path[:-5] if path.endswith(".nova") else path + ".bin"
+        try:
+            obj = generate_native_object(ir_module, cpu=cpu, features=features, entry=True, libm=libm)
+            link_executable([obj], exe_path)
+        except NativeLinkError as e:
+            print(e)
+            sys.exit(1)
+        except Exception as e:
+            print(f"Native codegen failed: {e}")
+            sys.exit(1)
+
+        print(f"✅ Linked native executable: {exe_path}")
+
+
+def compile_project(project_root: str, cpu="", features="", multiversion=False, with_object=True,
+                    instrument=False, profile=None, native=False, embed_native=False, compress=False,
+                    libm=True):
     """Compile a full Nova project into a .novar archive."""
     if not os.path.isdir(project_root):
         print(f"Error: Project root not found: {project_root}")
@@ -78,12 +160,24 @@ def compile_project(project_root: str):
     source_dir = os.path.join(project_root, "nova")
     bin_dir = os.path.join(project_root, "bin")
     target_dir = os.path.join(project_root, "target")
+    resource_dir = os.path.join(project_root, "res")
 
     novar_path = build_novar(
         project_name=project_name,
         source_dir=source_dir,
         bin_dir=bin_dir,
         target_dir=target_dir,
+        cpu=cpu,
+        features=features,
+        multiversion=multiversion,
+        with_object=with_object,
+        instrument=instrument,
+        profile=profile,
+        native=native,
+        embed_native=embed_native,
+        resource_dir=resource_dir,
+        compress=compress,
+        libm=libm,
     )
 
     if novar_path is None:
@@ -96,16 +190,28 @@ def compile_project(project_root: str):
 def main():
     if len(sys.argv) < 3:
         print("Usage:")
-        print("  novac -n <file.nova>")
-        print("  novac -p <project root>")
+        print("  novac -n <file.nova> [options]")
+        print("  novac -p <project root> [options]")
+        print("Options:")
+        print("  --cpu=native|<name>   tune for this host or a named CPU")
+        print("  --features=<list>     LLVM features, e.g. +avx2,+fma")
+        print("  --multiversion        emit baseline/AVX2/AVX-512 variants")
+        print("  --no-object           bitcode only (always JIT at launch)")
+        print("  --profile-generate    add PGO counters (written by nova on exit)")
+        print("  --profile-use=<file>  optimize with a (merged) .novaprof profile")
+        print("  --native              also link a standalone executable (system linker)")
+        print("  --embed-native        --native, and pack the executable into the .novar")
+        print("  --compress            compress .novar members (zlib/lzma, per member)")
+        print("  --no-libm             std/math in pure Nova (no LLVM math intrinsics/libm)")
         sys.exit(1)
 
     mode = sys.argv[1]
+    options = parse_options(sys.argv[3:])
 
     if mode == "-n":
-        compile_nomc(sys.argv[2])
+        compile_nomc(sys.argv[2], **options)
     elif mode == "-p":
-        compile_project(sys.argv[2])
+        compile_project(sys.argv[2], **options)
     else:
         print(f"Unknown option: {mode}")
         sys.exit(1)
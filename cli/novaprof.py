@@ -0,0 +1,68 @@
+# novaprof.py — Nova profile tool
+# Merges and inspects .novaprof files written by instrumented
+# builds (novac --profile-generate) for novac --profile-use.
+
+import sys
+
+from compiler.pgo import ProfileError, load_profile, merge_profiles, save_profile
+
+
+def merge(args):
+    if len(args) < 3 or args[0] != "-o":
+        print("Usage: novaprof merge -o <out.novaprof> <in.novaprof>...")
+        sys.exit(1)
+
+    out_path, inputs = args[1], args[2:]
+    try:
+        merged = merge_profiles(load_profile(path) for path in inputs)
+    except ProfileError as e:
+        print(e)
+        sys.exit(1)
+
+    save_profile(merged, out_path)
+    print(f"✅ Merged {len(inputs)} profile(s), {merged['runs']} run(s) → {out_path}")
+
+
+def show(args, top=20):
+    if len(args) != 1:
+        print("Usage: novaprof show <file.novaprof>")
+        sys.exit(1)
+
+    try:
+        profile = load_profile(args[0])
+    except ProfileError as e:
+        print(e)
+        sys.exit(1)
+
+    rows = []
+    for module_name, functions in profile["modules"].items():
+        for func_name, counts in functions.items():
+            rows.append((sum(counts["blocks"].values()), counts["entry"], f"{module_name}.{func_name}"))
+
+    rows.sort(reverse=True)
+    print(f"{profile['runs']} run(s), {len(rows)} function(s)")
+    print(f"{'blocks':>14} {'calls':>12}  function")
+    for blocks, entry, name in rows[:top]:
+        print(f"{blocks:>14,} {entry:>12,}  {name}")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage:")
+        print("  novaprof merge -o <out.novaprof> <in.novaprof>...")
+        print("  novaprof show <file.novaprof>")
+        sys.exit(1)
+
+    mode = sys.argv[1]
+
+    if mode == "merge":
+        merge(sys.argv[2:])
+    elif mode == "show":
+        show(sys.argv[2:])
+    else:
+        print(f"Unknown command: {mode}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
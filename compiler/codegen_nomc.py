@@ -3,81 +3,286 @@
 # Emits optimized native machine code into .nomc files
 # ============================================
 
+import os
+
 from llvmlite import ir, binding
-from .ir import IRConst, IRTemp, OpCode
+from .ir import IRConst, IRTemp, IRInstruction, OpCode
+from .native_link import ENTRY_SYMBOL, pic_target_machine
+from .nomc_format import pack_nomc
+from .pgo import CounterLayout, branch_key
+from .runtime_ir import (
+    NovaRuntime,
+    ITER_KINDS,
+    LIST_DATA,
+    LIST_KINDS,
+    MAP_KINDS,
+    STR,
+    element_kind,
+    iter_struct,
+    list_type,
+    map_type,
+)
 
 binding.initialize()
 binding.initialize_native_target()
 binding.initialize_native_asmprinter()
 
 
+# ============================================
+# Errors
+# ============================================
+
+class CodegenError(Exception):
+    """Raised when an IR module cannot be lowered to LLVM IR."""
+    pass
+
+
+# ============================================
+# Static lowering tables
+# ============================================
+
+# Nova type name -> LLVM type
+NOVA_TYPES = {
+    "int": ir.IntType(32),
+    "bool": ir.IntType(1),
+    "float": ir.DoubleType(),
+    "str": STR,
+    "list": list_type("int"),
+    "bytes_buffer": list_type("byte"),
+    "map": map_type("int"),
+    "any": ir.IntType(8).as_pointer(),
+    "handle": ir.IntType(64),  # launcher object (runtime/native_objects.py); 0 is null
+    "void": ir.VoidType(),
+}
+
+# OpCode -> IRBuilder method name for integer arithmetic
+INT_ARITH = {
+    OpCode.ADD: "add",
+    OpCode.SUB: "sub",
+    OpCode.MUL: "mul",
+    OpCode.DIV: "sdiv",
+    OpCode.MOD: "srem",
+}
+
+# OpCode -> IRBuilder method name for float arithmetic
+FLOAT_ARITH = {
+    OpCode.ADD: "fadd",
+    OpCode.SUB: "fsub",
+    OpCode.MUL: "fmul",
+    OpCode.DIV: "fdiv",
+    OpCode.MOD: "frem",
+}
+
+# OpCode -> signed integer predicate
+INT_PREDICATES = {
+    OpCode.EQ: "==",
+    OpCode.NE: "!=",
+    OpCode.LT: "<",
+    OpCode.LE: "<=",
+    OpCode.GT: ">",
+    OpCode.GE: ">=",
+}
+
+# Ordered float comparisons share the integer predicate spelling
+FLOAT_PREDICATES = INT_PREDICATES
+
+# Multiversioning variants, best first: (name, target CPU, required host
+# features). Each variant is the module compiled for one x86-64
+# micro-architecture level; the launcher loads the first one the host
+# CPU can run.
+CPU_VARIANTS = [
+    ("avx512", "x86-64-v4", ("avx512f", "avx512bw", "avx512cd", "avx512dq", "avx512vl")),
+    ("avx2", "x86-64-v3", ("avx", "avx2", "bmi", "bmi2", "f16c", "fma", "lzcnt", "movbe")),
+    ("baseline", "x86-64", ()),
+]
+
+# __intrinsic__("<name>", list, ...) -> NovaRuntime method building the
+# vectorized helper; only int and float lists are supported
+LIST_INTRINSICS = {
+    "list.sum": "list_sum",
+    "list.dot": "list_dot",
+    "list.min": "list_min",
+    "list.max": "list_max",
+    "list.scale": "list_scale",
+    "list.add": "list_add",
+}
+NUMERIC_KINDS = ("int", "float")
+
+# __intrinsic__("bytes.new", size) -> NovaRuntime method building the helper
+BYTES_INTRINSICS = {
+    "bytes.new": "bytes_new",
+}
+
+# std/math calls lowered in place of the pure-Nova bodies: math.<name>,
+# std/math.<name>, and <name> in a module with "use std/math" that does
+# not define <name> itself. name -> (libm symbol, LLVM intrinsic or None,
+# arity). Intrinsics are constant-folded and vectorized by LLVM (sqrt,
+# fabs, floor, ceil and fma become instructions where the target has
+# them, the rest libm calls); names without one call libm directly.
+MATH_FUNCTIONS = {
+    "sqrt": ("sqrt", "llvm.sqrt", 1),
+    "sin": ("sin", "llvm.sin", 1),
+    "cos": ("cos", "llvm.cos", 1),
+    "exp": ("exp", "llvm.exp", 1),
+    "log": ("log", "llvm.log", 1),
+    "pow": ("pow", "llvm.pow", 2),
+    "fma": ("fma", "llvm.fma", 3),
+    "abs": ("fabs", "llvm.fabs", 1),
+    "floor": ("floor", "llvm.floor", 1),
+    "ceil": ("ceil", "llvm.ceil", 1),
+    "tan": ("tan", None, 1),
+    "atan": ("atan", None, 1),
+    "atan2": ("atan2", None, 2),
+    "hypot": ("hypot", None, 2),
+}
+MATH_INT_RESULTS = {"floor", "ceil"}  # std/math returns these as int
+
+# NATIVE_CALL marshalling codes (see runtime/native_bridge.py): each
+# signature "<ret>_<args>" is one launcher trampoline __nova_native_<sig>
+NATIVE_SYMBOL_PREFIX = "__nova_native_"
+NATIVE_UNBOUND_SYMBOL = NATIVE_SYMBOL_PREFIX + "unbound"
+NATIVE_CODES = {
+    ir.IntType(32): "i",
+    ir.DoubleType(): "d",
+    ir.IntType(1): "b",
+    STR: "s",
+    list_type("int"): "I",
+    list_type("float"): "F",
+    list_type("byte"): "B",
+    ir.IntType(64): "h",
+    list_type("handle"): "H",
+}
+NATIVE_RETURNS = {"int": "i", "float": "d", "bool": "b", "str": "s", "handle": "h", "void": "v"}
+NATIVE_TYPES = {code: ty for ty, code in NATIVE_CODES.items()}
+NATIVE_TYPES["v"] = ir.VoidType()
+
+# CPU names whose code runs on any host of the triple that has the
+# object's required features
+PORTABLE_CPUS = {"", "generic"} | {cpu for _, cpu, _ in CPU_VARIANTS}
+
+# OpCode -> handler method name, filled by @lowers
+_DISPATCH = {}
+
+
+def lowers(*opcodes):
+    """Register the decorated LLVMBackend method as handler for opcodes."""
+    def register(method):
+        for op in opcodes:
+            _DISPATCH[op] = method.__name__
+        return method
+    return register
+
+
+def llvm_type(type_name):
+    """Map a Nova type name (e.g. "int", "list[float]", "map[str]") to its LLVM type."""
+    if type_name.startswith("list[") and type_name.endswith("]"):
+        return list_type(element_kind(type_name[5:-1]))
+    if type_name.startswith("map[") and type_name.endswith("]"):
+        return map_type(element_kind(type_name[4:-1]))
+    try:
+        return NOVA_TYPES[type_name]
+    except KeyError:
+        raise CodegenError(f"Unknown Nova type: {type_name}")
+
+
 # ============================================
 # LLVM Backend
 # ============================================
 
 class LLVMBackend:
-    def __init__(self):
-        self.printf = None
-        self.string_cache = {}
+    def __init__(self, cpu="", features="", with_object=True, instrument=False, profile=None,
+                 libm=True, signatures=None):
+        # Target CPU name ("native" = this host) and LLVM feature string
+        self.cpu = cpu
+        self.features = features
+        # Lower std/math calls to LLVM intrinsics / libm; without it they
+        # call the pure-Nova stdlib/math.nova (targets without libm)
+        self.libm = libm
+        self.uses_math = False    # module has "use std/math": bare sqrt(x) etc. are std/math calls
+        # Functions other modules export: name -> (param types, return type),
+        # see module_signatures(); calls to them are declared with these types
+        self.signatures = signatures or {}
+        # Embed a precompiled object next to the bitcode in each .nomc
+        self.with_object = with_object
+        # PGO: emit block/branch counters, or optimize with a pgo.ProfileUse
+        self.instrument = instrument
+        self.profile = profile
+
+        self.runtime = None
         self.value_map = {}       # IRTemp.name -> LLVM value
         self.var_map = {}         # var_name -> LLVM pointer
         self.block_map = {}       # IRBlock.name -> LLVM BasicBlock
+        self.functions = {}       # function name -> LLVM Function
         self.current_function = None
+        self.alloca_builder = None
+
+        self.module_name = None
+        self.exports = []            # functions other modules may call
+        self.spans = {}              # function name -> [line, column] in the source
+        self.imports = set()         # functions called here but defined elsewhere
+        self.natives = set()         # NATIVE_CALL trampoline signatures used here
+        self.native_sites = 0
+        self.counter_layouts = {}    # function name -> pgo.CounterLayout
+        self.counters = None         # (layout, counter global) of the current function
+        self.function_profiles = {}  # function name -> pgo.FunctionProfile
+        self.current_profile = None
+        self.current_block = None    # IRBlock name, for branch profile keys
+        self.branch_ordinal = 0
+
+        # OpCode -> bound handler, resolved once per backend
+        self.handlers = {op: getattr(self, name) for op, name in _DISPATCH.items()}
+
+        # Operand type -> resolver, avoids isinstance chains in to_llvm
+        self.operand_resolvers = {
+            IRTemp: self.resolve_temp,
+            IRConst: self.resolve_const,
+            str: self.resolve_var,
+        }
 
     # ----------------------------------------
     # printf declaration
     # ----------------------------------------
     def get_printf(self, module):
-        if self.printf:
-            return self.printf
-
-        printf_ty = ir.FunctionType(
-            ir.IntType(32),
-            [ir.PointerType(ir.IntType(8))],
-            var_arg=True
-        )
-        self.printf = ir.Function(module, printf_ty, name="printf")
-        return self.printf
+        return self.runtime.libc("printf")
 
     # ----------------------------------------
-    # Global string
+    # Global C string (printf formats)
     # ----------------------------------------
     def get_global_string(self, module, text):
-        if text in self.string_cache:
-            return self.string_cache[text]
-
-        arr = bytearray(text.encode("utf8")) + b"\00"
-        string_ty = ir.ArrayType(ir.IntType(8), len(arr))
-        global_var = ir.GlobalVariable(module, string_ty, name=f".str_{len(self.string_cache)}")
-        global_var.linkage = "internal"
-        global_var.global_constant = True
-        global_var.initializer = ir.Constant(string_ty, arr)
-
-        ptr = global_var.bitcast(ir.IntType(8).as_pointer())
-        self.string_cache[text] = ptr
-        return ptr
+        return self.runtime.cstring(text)
 
     # ----------------------------------------
     # Convert IR operand → LLVM value
     # ----------------------------------------
     def to_llvm(self, builder, module, operand):
-        if isinstance(operand, IRConst):
-            if isinstance(operand.value, int):
-                return ir.IntType(32)(operand.value)
-            if isinstance(operand.value, str):
-                return self.get_global_string(module, operand.value)
-            raise ValueError("Unsupported IRConst type")
+        resolve = self.operand_resolvers.get(type(operand))
+        if resolve is None:
+            # Already an LLVM value
+            return operand
+        return resolve(builder, module, operand)
 
-        if isinstance(operand, IRTemp):
-            return self.value_map[operand.name]
+    def resolve_temp(self, builder, module, operand):
+        return self.value_map[operand.name]
 
-        if isinstance(operand, str):
-            # variable name → load from alloca
-            if operand in self.var_map:
-                return builder.load(self.var_map[operand])
-            raise ValueError(f"Unknown variable: {operand}")
+    def resolve_const(self, builder, module, operand):
+        value = operand.value
+        value_ty = type(value)
+        if value_ty is int:
+            return ir.IntType(32)(value)
+        if value_ty is bool:
+            return ir.IntType(1)(value)
+        if value_ty is float:
+            return ir.DoubleType()(value)
+        if value_ty is str:
+            return self.runtime.str_literal(value)
+        raise CodegenError(f"Unsupported IRConst type: {value_ty.__name__}")
 
-        return operand
+    def resolve_var(self, builder, module, operand):
+        # variable name → load from alloca
+        ptr = self.var_map.get(operand)
+        if ptr is None:
+            raise CodegenError(f"Unknown variable: {operand}")
+        return builder.load(ptr)
 
     # ----------------------------------------
     # Bind result temp
@@ -87,170 +292,694 @@ class LLVMBackend:
             self.value_map[instr.result.name] = llvm_val
 
     # ----------------------------------------
-    # Runtime helper declarations
+    # Stack slots live in the function prologue,
+    # so mem2reg can promote them
+    # ----------------------------------------
+    def alloca(self, ty, name=""):
+        return self.alloca_builder.alloca(ty, name=name)
+
+    # ----------------------------------------
+    # Type conversion helpers
     # ----------------------------------------
-    def declare_runtime(self, module):
-        # Example runtime functions (you can implement them in C later)
-        def declare(name, ret, args):
-            fnty = ir.FunctionType(ret, args)
-            return ir.Function(module, fnty, name=name)
+    def coerce(self, builder, val, ty):
+        """Convert val to LLVM type ty (int width, int <-> float, pointer casts)."""
+        src = val.type
+        if src == ty:
+            return val
+
+        if isinstance(src, ir.IntType) and isinstance(ty, ir.IntType):
+            if src.width == 1:
+                return builder.zext(val, ty)
+            if src.width < ty.width:
+                return builder.sext(val, ty)
+            return builder.trunc(val, ty)
+
+        if isinstance(src, ir.IntType) and isinstance(ty, ir.DoubleType):
+            return builder.sitofp(val, ty)
+
+        if isinstance(src, ir.DoubleType) and isinstance(ty, ir.IntType):
+            return builder.fptosi(val, ty)
 
-        self.rt_list_new = declare("nova_list_new", ir.IntType(8).as_pointer(), [])
-        self.rt_list_append = declare("nova_list_append", ir.VoidType(),
-                                      [ir.IntType(8).as_pointer(), ir.IntType(32)])
-        self.rt_iter_make = declare("nova_iter_make", ir.IntType(8).as_pointer(),
-                                    [ir.IntType(8).as_pointer()])
-        self.rt_iter_has_next = declare("nova_iter_has_next", ir.IntType(1),
-                                        [ir.IntType(8).as_pointer()])
-        self.rt_iter_next = declare("nova_iter_next", ir.IntType(32),
-                                    [ir.IntType(8).as_pointer()])
+        if isinstance(src, ir.PointerType) and isinstance(ty, ir.PointerType):
+            return builder.bitcast(val, ty)
+
+        raise CodegenError(f"Cannot convert {src} to {ty}")
+
+    def unify(self, builder, lhs, rhs):
+        """Bring both operands of a binary op to a common type."""
+        if lhs.type == rhs.type:
+            return lhs, rhs
+        if isinstance(lhs.type, ir.IntType) and isinstance(rhs.type, ir.IntType):
+            ty = max(lhs.type, rhs.type, key=lambda t: t.width)
+        elif isinstance(lhs.type, ir.DoubleType) or isinstance(rhs.type, ir.DoubleType):
+            ty = ir.DoubleType()
+        else:
+            raise CodegenError(f"Incompatible operand types: {lhs.type}, {rhs.type}")
+        return self.coerce(builder, lhs, ty), self.coerce(builder, rhs, ty)
+
+    def as_bool(self, builder, val):
+        """Truthiness of a value as i1."""
+        ty = val.type
+        if isinstance(ty, ir.IntType):
+            if ty.width == 1:
+                return val
+            return builder.icmp_signed("!=", val, ty(0))
+        if isinstance(ty, ir.DoubleType):
+            return builder.fcmp_ordered("!=", val, ty(0.0))
+        if isinstance(ty, ir.PointerType):
+            return builder.icmp_unsigned("!=", val, ir.Constant(ty, None))
+        raise CodegenError(f"Value of type {ty} has no truth value")
+
+    # ----------------------------------------
+    # Runtime value kinds
+    # ----------------------------------------
+    def list_kind(self, val):
+        kind = LIST_KINDS.get(val.type)
+        if kind is None:
+            raise CodegenError(f"Expected a list, got value of type {val.type}")
+        return kind
+
+    def iter_kind(self, val):
+        kind = ITER_KINDS.get(val.type)
+        if kind is None:
+            raise CodegenError(f"Expected an iterator, got value of type {val.type}")
+        return kind
+
+    def map_kind(self, val):
+        kind = MAP_KINDS.get(val.type)
+        if kind is None:
+            raise CodegenError(f"Expected a map, got value of type {val.type}")
+        return kind
+
+    def element_value(self, builder, kind, val):
+        """An element loaded from a list<kind>, as compiled code sees it (bytes are unsigned)."""
+        if kind == "byte":
+            return builder.zext(val, ir.IntType(32))
+        return val
+
+    def expect_str(self, val):
+        if val.type != STR:
+            raise CodegenError(f"Expected a str, got value of type {val.type}")
+        return val
+
+    def map_key(self, builder, module, operand):
+        return self.expect_str(self.to_llvm(builder, module, operand))
 
     # ----------------------------------------
     # Lower a single IR instruction
     # ----------------------------------------
     def lower_instruction(self, builder, module, instr):
-        op = instr.opcode
-
-        # ----------------------------------------
-        # PRINT
-        # ----------------------------------------
-        if op == OpCode.PRINT:
-            val = self.to_llvm(builder, module, instr.operands[0])
-            printf = self.get_printf(module)
-
-            if isinstance(val.type, ir.IntType):
-                fmt = self.get_global_string(module, "%d\n")
-                builder.call(printf, [fmt, val])
-            else:
-                builder.call(printf, [val])
-            return
+        handler = self.handlers.get(instr.opcode)
+        if handler is None:
+            raise CodegenError(
+                f"Unimplemented IR opcode {instr.opcode} "
+                f"in function '{self.current_function.name}'"
+            )
+        handler(builder, module, instr)
 
-        # ----------------------------------------
-        # LOAD_CONST
-        # ----------------------------------------
-        if op == OpCode.LOAD_CONST:
-            llvm_val = self.to_llvm(builder, module, instr.operands[0])
-            self.bind_result(instr, llvm_val)
-            return
+    # ----------------------------------------
+    # PRINT
+    # ----------------------------------------
+    @lowers(OpCode.PRINT)
+    def lower_print(self, builder, module, instr):
+        val = self.to_llvm(builder, module, instr.operands[0])
+        printf = self.get_printf(module)
 
-        # ----------------------------------------
-        # LOAD_VAR
-        # ----------------------------------------
-        if op == OpCode.LOAD_VAR:
-            var_name = instr.operands[0]
-            llvm_val = builder.load(self.var_map[var_name])
-            self.bind_result(instr, llvm_val)
-            return
+        if isinstance(val.type, ir.IntType):
+            fmt = self.get_global_string(module, "%d\n")
+            builder.call(printf, [fmt, self.coerce(builder, val, ir.IntType(32))])
+        elif isinstance(val.type, ir.DoubleType):
+            fmt = self.get_global_string(module, "%f\n")
+            builder.call(printf, [fmt, val])
+        else:
+            text = self.expect_str(val)
+            fmt = self.get_global_string(module, "%.*s\n")
+            data = self.runtime.str_data(builder, text)
+            builder.call(printf, [fmt, self.runtime.str_len_i32(builder, text), data])
 
-        # ----------------------------------------
-        # STORE_VAR
-        # ----------------------------------------
-        if op == OpCode.STORE_VAR:
-            var_name, src = instr.operands
-            llvm_val = self.to_llvm(builder, module, src)
-            if var_name not in self.var_map:
-                self.var_map[var_name] = builder.alloca(ir.IntType(32))
-            builder.store(llvm_val, self.var_map[var_name])
-            return
+    # ----------------------------------------
+    # LOAD_CONST
+    # ----------------------------------------
+    @lowers(OpCode.LOAD_CONST)
+    def lower_load_const(self, builder, module, instr):
+        llvm_val = self.to_llvm(builder, module, instr.operands[0])
+        self.bind_result(instr, llvm_val)
 
-        # ----------------------------------------
-        # Arithmetic
-        # ----------------------------------------
-        if op in (OpCode.ADD, OpCode.SUB, OpCode.MUL, OpCode.DIV, OpCode.MOD):
-            lhs = self.to_llvm(builder, module, instr.operands[0])
-            rhs = self.to_llvm(builder, module, instr.operands[1])
-
-            if op == OpCode.ADD:
-                res = builder.add(lhs, rhs)
-            elif op == OpCode.SUB:
-                res = builder.sub(lhs, rhs)
-            elif op == OpCode.MUL:
-                res = builder.mul(lhs, rhs)
-            elif op == OpCode.DIV:
-                res = builder.sdiv(lhs, rhs)
-            elif op == OpCode.MOD:
-                res = builder.srem(lhs, rhs)
+    # ----------------------------------------
+    # LOAD_VAR
+    # ----------------------------------------
+    @lowers(OpCode.LOAD_VAR)
+    def lower_load_var(self, builder, module, instr):
+        llvm_val = self.resolve_var(builder, module, instr.operands[0])
+        self.bind_result(instr, llvm_val)
 
-            self.bind_result(instr, res)
-            return
+    # ----------------------------------------
+    # STORE_VAR
+    # ----------------------------------------
+    @lowers(OpCode.STORE_VAR)
+    def lower_store_var(self, builder, module, instr):
+        var_name, src = instr.operands
+        llvm_val = self.to_llvm(builder, module, src)
+        ptr = self.var_map.get(var_name)
+        if ptr is None:
+            ptr = self.var_map[var_name] = self.alloca(llvm_val.type, name=var_name)
+        builder.store(self.coerce(builder, llvm_val, ptr.type.pointee), ptr)
 
-        # ----------------------------------------
-        # Comparison
-        # ----------------------------------------
-        if op in (OpCode.EQ, OpCode.NE, OpCode.LT, OpCode.LE, OpCode.GT, OpCode.GE):
-            lhs = self.to_llvm(builder, module, instr.operands[0])
-            rhs = self.to_llvm(builder, module, instr.operands[1])
-
-            cmp_map = {
-                OpCode.EQ: "==",
-                OpCode.NE: "!=",
-                OpCode.LT: "<",
-                OpCode.LE: "<=",
-                OpCode.GT: ">",
-                OpCode.GE: ">=",
-            }
-
-            pred = cmp_map[op]
-            res = builder.icmp_signed(pred, lhs, rhs)
-            self.bind_result(instr, res)
+    # ----------------------------------------
+    # Arithmetic
+    # ----------------------------------------
+    @lowers(*INT_ARITH)
+    def lower_arith(self, builder, module, instr):
+        lhs = self.to_llvm(builder, module, instr.operands[0])
+        rhs = self.to_llvm(builder, module, instr.operands[1])
+        if instr.opcode == OpCode.ADD and lhs.type == STR:
+            self.bind_result(instr, self.concat(builder, lhs, rhs))
             return
+        lhs, rhs = self.unify(builder, lhs, rhs)
+        table = FLOAT_ARITH if isinstance(lhs.type, ir.DoubleType) else INT_ARITH
+        res = getattr(builder, table[instr.opcode])(lhs, rhs)
+        self.bind_result(instr, res)
 
-        # ----------------------------------------
-        # Control Flow
-        # ----------------------------------------
-        if op == OpCode.JUMP:
-            label = instr.operands[0]
-            builder.branch(self.block_map[label])
+    # ----------------------------------------
+    # Comparison
+    # ----------------------------------------
+    @lowers(*INT_PREDICATES)
+    def lower_compare(self, builder, module, instr):
+        lhs = self.to_llvm(builder, module, instr.operands[0])
+        rhs = self.to_llvm(builder, module, instr.operands[1])
+        if lhs.type == STR:
+            self.bind_result(instr, self.compare_str(builder, instr.opcode, lhs, rhs))
             return
+        lhs, rhs = self.unify(builder, lhs, rhs)
+        if isinstance(lhs.type, ir.DoubleType):
+            res = builder.fcmp_ordered(FLOAT_PREDICATES[instr.opcode], lhs, rhs)
+        else:
+            res = builder.icmp_signed(INT_PREDICATES[instr.opcode], lhs, rhs)
+        self.bind_result(instr, res)
+
+    def compare_str(self, builder, opcode, lhs, rhs):
+        if opcode not in (OpCode.EQ, OpCode.NE):
+            raise CodegenError(f"Strings do not support {opcode.name}")
+        eq = builder.call(self.runtime.str_eq(), [lhs, self.expect_str(rhs)])
+        return eq if opcode == OpCode.EQ else builder.not_(eq)
+
+    # ----------------------------------------
+    # Strings
+    # ----------------------------------------
+    def concat(self, builder, lhs, rhs):
+        return builder.call(self.runtime.str_concat(), [self.expect_str(lhs), self.expect_str(rhs)])
+
+    @lowers(OpCode.STR_CONCAT)
+    def lower_str_concat(self, builder, module, instr):
+        lhs = self.to_llvm(builder, module, instr.operands[0])
+        rhs = self.to_llvm(builder, module, instr.operands[1])
+        self.bind_result(instr, self.concat(builder, lhs, rhs))
+
+    @lowers(OpCode.STR_LEN)
+    def lower_str_len(self, builder, module, instr):
+        text = self.expect_str(self.to_llvm(builder, module, instr.operands[0]))
+        self.bind_result(instr, self.runtime.str_len_i32(builder, text))
+
+    @lowers(OpCode.STR_GET)
+    def lower_str_get(self, builder, module, instr):
+        text = self.expect_str(self.to_llvm(builder, module, instr.operands[0]))
+        idx = self.to_llvm(builder, module, instr.operands[1])
+        res = builder.call(self.runtime.str_get(), [text, self.coerce(builder, idx, ir.IntType(64))])
+        self.bind_result(instr, res)
+
+    # ----------------------------------------
+    # Control Flow
+    # ----------------------------------------
+    @lowers(OpCode.JUMP)
+    def lower_jump(self, builder, module, instr):
+        label = instr.operands[0]
+        builder.branch(self.block_map[label])
+
+    @lowers(OpCode.JUMP_IF_TRUE, OpCode.JUMP_IF_FALSE)
+    def lower_cond_jump(self, builder, module, instr):
+        cond = self.as_bool(builder, self.to_llvm(builder, module, instr.operands[0]))
+        target = self.block_map[instr.operands[1]]
+        jump_if_true = instr.opcode == OpCode.JUMP_IF_TRUE
+
+        ordinal = self.branch_ordinal
+        self.branch_ordinal += 1
+        if self.counters is not None:
+            self.count_branch(builder, cond, jump_if_true, ordinal)
+
+        # Fall through into a fresh block holding the rest of this IRBlock
+        cont = self.current_function.append_basic_block(f"{builder.block.name}.cont")
+        if jump_if_true:
+            br = builder.cbranch(cond, target, cont)
+        else:
+            br = builder.cbranch(cond, cont, target)
+
+        if self.current_profile is not None:
+            weights = self.current_profile.branch_weights(self.current_block, ordinal)
+            if weights is not None:
+                # Profile order is (taken, not taken); LLVM wants (true, false)
+                br.set_weights(weights if jump_if_true else weights[::-1])
+
+        builder.position_at_end(cont)
+
+    # ----------------------------------------
+    # CALL
+    # ----------------------------------------
+    @lowers(OpCode.CALL)
+    def lower_call(self, builder, module, instr):
+        func_name, arg_operands = instr.operands
+        if func_name == "__intrinsic__":
+            return self.lower_intrinsic(builder, module, instr)
+
+        math_name = self.math_function(func_name)
+        if math_name is not None:
+            return self.lower_math_call(builder, module, instr, math_name)
+
+        args = [self.to_llvm(builder, module, a) for a in arg_operands]
+
+        callee = self.functions.get(func_name)
+        if callee is None:
+            callee = self.declare_external(module, func_name)
+
+        param_types = callee.function_type.args
+        if len(param_types) != len(args):
+            raise CodegenError(
+                f"'{func_name}' expects {len(param_types)} argument(s), got {len(args)}"
+            )
+
+        args = [self.coerce(builder, a, t) for a, t in zip(args, param_types)]
+        res = builder.call(callee, args)
+        self.bind_result(instr, res)
 
-        if op == OpCode.JUMP_IF_FALSE:
-            cond = self.to_llvm(builder, module, instr.operands[0])
-            label = instr.operands[1]
-            builder.cbranch(cond, self.block_map[label], builder.block)
+    def math_function(self, func_name):
+        """MATH_FUNCTIONS key if func_name is a std/math call to lower, else None."""
+        if not self.libm or func_name in self.functions:
+            return None
+
+        module_name, _, name = func_name.rpartition(".")
+        if module_name not in ("math", "std/math") and not (module_name == "" and self.uses_math):
+            return None
+        if name not in MATH_FUNCTIONS:
+            return None
+
+        # A Nova function owning the libm symbol would capture the call
+        if MATH_FUNCTIONS[name][0] in self.functions:
+            return None
+        return name
+
+    def lower_math_call(self, builder, module, instr, name):
+        """math.sqrt(x) -> llvm.sqrt.f64(x); math.tan(x) -> tan(x) from libm."""
+        symbol, intrinsic, arity = MATH_FUNCTIONS[name]
+        arg_operands = instr.operands[1]
+        if len(arg_operands) != arity:
+            raise CodegenError(f"'math.{name}' expects {arity} argument(s), got {len(arg_operands)}")
+
+        f64 = ir.DoubleType()
+        if intrinsic is not None:
+            callee = module.declare_intrinsic(intrinsic, [f64], ir.FunctionType(f64, [f64] * arity))
+        else:
+            callee = self.runtime.libc(symbol)
+
+        args = [self.coerce(builder, self.to_llvm(builder, module, a), f64) for a in arg_operands]
+        res = builder.call(callee, args)
+        if name in MATH_INT_RESULTS:
+            res = builder.fptosi(res, ir.IntType(32))
+        self.bind_result(instr, res)
+
+    def lower_intrinsic(self, builder, module, instr):
+        """
+        __intrinsic__("list.sum", xs) and friends -> vectorized runtime loops;
+        __intrinsic__("bytes.new", size) -> a zero-filled bytes_buffer.
+        """
+        name_operand, *arg_operands = instr.operands[1]
+        name = self.const_str(builder, module, name_operand)
+
+        if name in BYTES_INTRINSICS:
+            helper = getattr(self.runtime, BYTES_INTRINSICS[name])()
+            param_types = helper.function_type.args
+            if len(param_types) != len(arg_operands):
+                raise CodegenError(
+                    f"Intrinsic '{name}' expects {len(param_types)} argument(s), got {len(arg_operands)}"
+                )
+            args = [self.coerce(builder, self.to_llvm(builder, module, a), t)
+                    for a, t in zip(arg_operands, param_types)]
+            self.bind_result(instr, builder.call(helper, args))
             return
 
-        # ----------------------------------------
-        # RETURN
-        # ----------------------------------------
-        if op == OpCode.RETURN:
-            if instr.operands:
-                val = self.to_llvm(builder, module, instr.operands[0])
-                builder.ret(val)
+        method = LIST_INTRINSICS.get(name)
+        if method is None:
+            raise CodegenError(f"Unknown intrinsic: {name!r}")
+
+        args = [self.to_llvm(builder, module, a) for a in arg_operands]
+        if not args:
+            raise CodegenError(f"Intrinsic '{name}' expects a list argument")
+
+        kind = self.list_kind(args[0])
+        if kind not in NUMERIC_KINDS:
+            raise CodegenError(f"Intrinsic '{name}' needs a list[int] or list[float], got list[{kind}]")
+
+        for arg in args[1:]:
+            if arg.type in LIST_KINDS and arg.type != args[0].type:
+                raise CodegenError(f"Intrinsic '{name}' needs lists of the same element type")
+
+        helper = getattr(self.runtime, method)(kind)
+        param_types = helper.function_type.args
+        if len(param_types) != len(args):
+            raise CodegenError(
+                f"Intrinsic '{name}' expects {len(param_types)} argument(s), got {len(args)}"
+            )
+
+        args = [self.coerce(builder, a, t) for a, t in zip(args, param_types)]
+        self.bind_result(instr, builder.call(helper, args))
+
+    def const_str(self, builder, module, operand):
+        """Python text of a string literal operand (IRConst or a LOAD_CONST temp)."""
+        if isinstance(operand, IRConst) and isinstance(operand.value, str):
+            return operand.value
+
+        text = self.runtime.literal_text(self.to_llvm(builder, module, operand))
+        if text is None:
+            raise CodegenError(f"Expected a string literal, got {operand!r}")
+        return text
+
+    # ----------------------------------------
+    # NATIVE_CALL
+    # ----------------------------------------
+    @lowers(OpCode.NATIVE_CALL)
+    def lower_native_call(self, builder, module, instr):
+        """
+        __native__("math.sqrt", x) -> a direct call of the launcher trampoline
+        for its static signature (runtime/native_bridge.py):
+
+            ret __nova_native_<ret>_<args>(i8* path, i64* site, i64 cached, args...)
+
+        str, list[int], list[float], bytes_buffer and list[handle]
+        arguments are passed as (i8* data, i64 len); natives see lists and
+        byte buffers as writable memoryviews, so batched calls like
+        std/math.sqrt_many(xs, xs) and reads like std/fs.readinto(fd, buf)
+        fill them in place. A handle (i64) stands for a launcher object
+        such as a worker pool, a future or a callable; natives get the
+        object and object results come back as handles. site is this
+        call site's handle slot: the address of __nova_native_unbound until
+        the first call resolves the path, then the handle object, loaded
+        into cached so the trampoline calls it without a lookup. Operands:
+        native name, args and optionally the result type name (int by
+        default, like external calls).
+        """
+        name_operand, arg_operands, *rest = instr.operands
+        path = name_operand if isinstance(name_operand, str) else self.const_str(builder, module, name_operand)
+
+        ret_name = rest[0] if rest else "int"
+        ret_code = NATIVE_RETURNS.get(ret_name)
+        if ret_code is None:
+            raise CodegenError(f"Native call '{path}' cannot return {ret_name}")
+
+        args = []
+        arg_codes = ""
+        for operand in arg_operands:
+            arg = self.to_llvm(builder, module, operand)
+            code = NATIVE_CODES.get(arg.type)
+            if code is None:
+                raise CodegenError(
+                    f"Native call '{path}' takes int, float, bool, str, list[int], list[float], "
+                    f"bytes_buffer, handle and list[handle] arguments, got {arg.type}"
+                )
+            if code == "s":
+                args += [self.runtime.str_data(builder, arg), self.runtime.str_len(builder, arg)]
+            elif code in "IFBH":
+                data = self.runtime.load_field(builder, arg, LIST_DATA)
+                args += [builder.bitcast(data, ir.IntType(8).as_pointer()), self.runtime.list_len(builder, arg)]
             else:
-                builder.ret(ir.IntType(32)(0))
-            return
+                args.append(arg)
+            arg_codes += code
 
-        # ----------------------------------------
-        # Iterators
-        # ----------------------------------------
-        if op == OpCode.MAKE_ITER:
-            iterable = self.to_llvm(builder, module, instr.operands[0])
-            res = builder.call(self.rt_iter_make, [iterable])
-            self.bind_result(instr, res)
-            return
+        signature = f"{ret_code}_{arg_codes}"
+        symbol = NATIVE_SYMBOL_PREFIX + signature
+        trampoline = module.globals.get(symbol)
+        if trampoline is None:
+            fnty = ir.FunctionType(
+                NATIVE_TYPES[ret_code],
+                [ir.IntType(8).as_pointer(), ir.IntType(64).as_pointer(), ir.IntType(64)]
+                + [a.type for a in args],
+            )
+            trampoline = ir.Function(module, fnty, name=symbol)
+        self.natives.add(signature)
 
-        if op == OpCode.ITER_HAS_NEXT:
-            it = self.to_llvm(builder, module, instr.operands[0])
-            res = builder.call(self.rt_iter_has_next, [it])
+        site = ir.GlobalVariable(module, ir.IntType(64), name=f".nova_native_site_{self.native_sites}")
+        site.linkage = "internal"
+        site.initializer = self.native_unbound(module).ptrtoint(ir.IntType(64))
+        self.native_sites += 1
+
+        res = builder.call(trampoline, [self.runtime.cstring(path), site, builder.load(site)] + args)
+        if ret_code != "v":
             self.bind_result(instr, res)
+
+    def native_unbound(self, module):
+        """The launcher's __nova_native_unbound object, every site's value before its first call."""
+        unbound = module.globals.get(NATIVE_UNBOUND_SYMBOL)
+        if unbound is None:
+            unbound = ir.GlobalVariable(module, ir.IntType(8), name=NATIVE_UNBOUND_SYMBOL)
+        return unbound
+
+    def declare_external(self, module, name):
+        """Declare a function defined in another module (C calling convention)."""
+        signature = self.signatures.get(name)
+        if signature is None:
+            raise CodegenError(
+                f"Unknown function '{name}': not defined in this module "
+                f"nor exported by a module compiled with it"
+            )
+        param_types, return_type = signature
+        fnty = ir.FunctionType(llvm_type(return_type), [llvm_type(t) for t in param_types])
+        func = ir.Function(module, fnty, name=name)
+        self.functions[name] = func
+        self.imports.add(name)
+        return func
+
+    # ----------------------------------------
+    # RETURN
+    # ----------------------------------------
+    @lowers(OpCode.RETURN)
+    def lower_return(self, builder, module, instr):
+        ret_ty = self.current_function.function_type.return_type
+
+        if isinstance(ret_ty, ir.VoidType):
+            builder.ret_void()
             return
 
-        if op == OpCode.ITER_NEXT:
-            it = self.to_llvm(builder, module, instr.operands[0])
-            res = builder.call(self.rt_iter_next, [it])
-            self.bind_result(instr, res)
+        if not instr.operands:
+            builder.ret(ir.Constant(ret_ty, None))
             return
 
-        print(f"[WARN] Unimplemented IR opcode: {op}")
+        val = self.to_llvm(builder, module, instr.operands[0])
+        ret_val = self.coerce(builder, val, ret_ty)
+
+        # Self-recursive return: guarantee the call is lowered as a jump
+        if ret_val is val and self.is_self_call(builder, val):
+            val.tail = "musttail"
+
+        builder.ret(ret_val)
+
+    def is_self_call(self, builder, val):
+        return (
+            isinstance(val, ir.CallInstr)
+            and val.callee is self.current_function
+            and builder.block.instructions
+            and builder.block.instructions[-1] is val
+        )
+
+    # ----------------------------------------
+    # Iterators (stack cursors over lists)
+    # ----------------------------------------
+    @lowers(OpCode.MAKE_ITER)
+    def lower_make_iter(self, builder, module, instr):
+        iterable = self.to_llvm(builder, module, instr.operands[0])
+        kind = self.list_kind(iterable)
+        cursor = self.alloca(iter_struct(kind), name="iter")
+        self.runtime.iter_init(builder, cursor, iterable)
+        self.bind_result(instr, cursor)
+
+    @lowers(OpCode.ITER_HAS_NEXT)
+    def lower_iter_has_next(self, builder, module, instr):
+        it = self.to_llvm(builder, module, instr.operands[0])
+        res = builder.call(self.runtime.iter_has_next(self.iter_kind(it)), [it])
+        self.bind_result(instr, res)
+
+    @lowers(OpCode.ITER_NEXT)
+    def lower_iter_next(self, builder, module, instr):
+        it = self.to_llvm(builder, module, instr.operands[0])
+        kind = self.iter_kind(it)
+        res = builder.call(self.runtime.iter_next(kind), [it])
+        self.bind_result(instr, self.element_value(builder, kind, res))
+
+    # ----------------------------------------
+    # Lists
+    # ----------------------------------------
+    @lowers(OpCode.LIST_NEW)
+    def lower_list_new(self, builder, module, instr):
+        elem = instr.operands[0].value if instr.operands else "int"
+        res = builder.call(self.runtime.list_new(element_kind(elem)), [])
+        self.bind_result(instr, res)
+
+    @lowers(OpCode.LIST_APPEND)
+    def lower_list_append(self, builder, module, instr):
+        lst = self.to_llvm(builder, module, instr.operands[0])
+        append = self.runtime.list_append(self.list_kind(lst))
+        val = self.to_llvm(builder, module, instr.operands[1])
+        builder.call(append, [lst, self.coerce(builder, val, append.function_type.args[1])])
+
+    @lowers(OpCode.LIST_GET)
+    def lower_list_get(self, builder, module, instr):
+        lst = self.to_llvm(builder, module, instr.operands[0])
+        idx = self.to_llvm(builder, module, instr.operands[1])
+        kind = self.list_kind(lst)
+        get = self.runtime.list_get(kind)
+        res = builder.call(get, [lst, self.coerce(builder, idx, ir.IntType(64))])
+        self.bind_result(instr, self.element_value(builder, kind, res))
+
+    @lowers(OpCode.LIST_SET)
+    def lower_list_set(self, builder, module, instr):
+        lst = self.to_llvm(builder, module, instr.operands[0])
+        idx = self.to_llvm(builder, module, instr.operands[1])
+        val = self.to_llvm(builder, module, instr.operands[2])
+        set_ = self.runtime.list_set(self.list_kind(lst))
+        builder.call(set_, [
+            lst,
+            self.coerce(builder, idx, ir.IntType(64)),
+            self.coerce(builder, val, set_.function_type.args[2]),
+        ])
+
+    @lowers(OpCode.LIST_LEN)
+    def lower_list_len(self, builder, module, instr):
+        lst = self.to_llvm(builder, module, instr.operands[0])
+        self.list_kind(lst)
+        length = self.runtime.list_len(builder, lst)
+        self.bind_result(instr, builder.trunc(length, ir.IntType(32)))
+
+    # ----------------------------------------
+    # Maps (string keys)
+    # ----------------------------------------
+    @lowers(OpCode.MAP_NEW)
+    def lower_map_new(self, builder, module, instr):
+        value_type = instr.operands[0].value if instr.operands else "int"
+        res = builder.call(self.runtime.map_new(element_kind(value_type)), [])
+        self.bind_result(instr, res)
+
+    @lowers(OpCode.MAP_GET)
+    def lower_map_get(self, builder, module, instr):
+        m = self.to_llvm(builder, module, instr.operands[0])
+        key = self.map_key(builder, module, instr.operands[1])
+        res = builder.call(self.runtime.map_get(self.map_kind(m)), [m, key])
+        self.bind_result(instr, res)
+
+    @lowers(OpCode.MAP_SET)
+    def lower_map_set(self, builder, module, instr):
+        m = self.to_llvm(builder, module, instr.operands[0])
+        key = self.map_key(builder, module, instr.operands[1])
+        val = self.to_llvm(builder, module, instr.operands[2])
+        set_ = self.runtime.map_set(self.map_kind(m))
+        builder.call(set_, [m, key, self.coerce(builder, val, set_.function_type.args[2])])
+
+    @lowers(OpCode.MAP_HAS_KEY)
+    def lower_map_has_key(self, builder, module, instr):
+        m = self.to_llvm(builder, module, instr.operands[0])
+        key = self.map_key(builder, module, instr.operands[1])
+        res = builder.call(self.runtime.map_has(self.map_kind(m)), [m, key])
+        self.bind_result(instr, res)
+
+    @lowers(OpCode.MAP_KEYS)
+    def lower_map_keys(self, builder, module, instr):
+        m = self.to_llvm(builder, module, instr.operands[0])
+        res = builder.call(self.runtime.map_keys(self.map_kind(m)), [m])
+        self.bind_result(instr, res)
+
+    @lowers(OpCode.MAP_VALUES)
+    def lower_map_values(self, builder, module, instr):
+        m = self.to_llvm(builder, module, instr.operands[0])
+        res = builder.call(self.runtime.map_values(self.map_kind(m)), [m])
+        self.bind_result(instr, res)
+
+    # ----------------------------------------
+    # Compile-time only
+    # ----------------------------------------
+    @lowers(OpCode.NOP, OpCode.USE_MODULE)
+    def lower_nop(self, builder, module, instr):
+        # Module resolution happens before codegen; nothing to emit
+        pass
+
+    # ----------------------------------------
+    # Declare a function (signature only)
+    # ----------------------------------------
+    def declare_function(self, module, ir_module, func):
+        ret_ty = llvm_type(func.return_type)
+        arg_tys = [llvm_type(t) for t in func.param_types]
+        llvm_func = ir.Function(module, ir.FunctionType(ret_ty, arg_tys), name=func.name)
+
+        # Module-private functions can use the faster convention
+        if not ir_module.is_exported(func.name):
+            llvm_func.linkage = "internal"
+            llvm_func.calling_convention = "fastcc"
+
+        for arg, name in zip(llvm_func.args, func.params):
+            arg.name = name
+
+        self.functions[func.name] = llvm_func
+        return llvm_func
+
+    # ----------------------------------------
+    # PGO: counters and profile use
+    # ----------------------------------------
+    def instrument_function(self, module, func):
+        """Define the function's counter array and count the entry."""
+        layout = CounterLayout(self.module_name, func)
+        ty = ir.ArrayType(ir.IntType(64), layout.size)
+        counters = ir.GlobalVariable(module, ty, name=layout.symbol)
+        counters.initializer = ir.Constant(ty, None)
+
+        self.counter_layouts[func.name] = layout
+        self.counters = (layout, counters)
+        self.count(self.alloca_builder, ir.IntType(32)(0))
+
+    def count(self, builder, slot):
+        _, counters = self.counters
+        ptr = builder.gep(counters, [ir.IntType(32)(0), slot], inbounds=True)
+        builder.store(builder.add(builder.load(ptr), ir.IntType(64)(1)), ptr)
+
+    def count_branch(self, builder, cond, jump_if_true, ordinal):
+        layout, _ = self.counters
+        slot = layout.branch_slots[branch_key(self.current_block, ordinal)]
+        taken, not_taken = ir.IntType(32)(slot), ir.IntType(32)(slot + 1)
+        if jump_if_true:
+            self.count(builder, builder.select(cond, taken, not_taken))
+        else:
+            self.count(builder, builder.select(cond, not_taken, taken))
+
+    def apply_profile(self, llvm_func, profile):
+        """Entry count plus hot/cold hints from a FunctionProfile."""
+        entry_count = llvm_func.module.add_metadata([
+            ir.MetaDataString(llvm_func.module, "function_entry_count"),
+            ir.IntType(64)(profile.entry),
+        ])
+        llvm_func.set_metadata("prof", entry_count)
+
+        if profile.cold:
+            llvm_func.attributes.add("cold")
+            llvm_func.attributes.add("optsize")
+            llvm_func.attributes.add("noinline")
+        elif profile.hot:
+            llvm_func.attributes.add("inlinehint")
+            llvm_func.section = ".text.hot"
 
     # ----------------------------------------
     # Lower a function
     # ----------------------------------------
     def lower_function(self, module, func):
-        func_ty = ir.FunctionType(ir.IntType(32), [])
-        llvm_func = ir.Function(module, func_ty, name=func.name)
+        llvm_func = self.functions[func.name]
         self.current_function = llvm_func
 
+        # Prologue block: parameter spills and every alloca
+        prologue = llvm_func.append_basic_block("prologue")
+        self.alloca_builder = ir.IRBuilder(prologue)
+
         # Create LLVM blocks for each IRBlock
         self.block_map = {
             block.name: llvm_func.append_basic_block(block.name)
@@ -261,22 +990,64 @@ class LLVMBackend:
         self.value_map = {}
         self.var_map = {}
 
+        for arg, name in zip(llvm_func.args, func.params):
+            ptr = self.alloca(arg.type, name=name)
+            self.alloca_builder.store(arg, ptr)
+            self.var_map[name] = ptr
+
+        self.counters = None
+        if self.instrument:
+            self.instrument_function(module, func)
+
+        self.current_profile = self.function_profiles.get(func.name)
+        if self.current_profile is not None:
+            self.apply_profile(llvm_func, self.current_profile)
+
         # Lower blocks
         for block in func.blocks:
             builder = ir.IRBuilder(self.block_map[block.name])
+            self.current_block = block.name
+            self.branch_ordinal = 0
+            if self.counters is not None:
+                layout, _ = self.counters
+                self.count(builder, ir.IntType(32)(layout.block_slots[block.name]))
+
             for instr in block.instructions:
+                if builder.block.is_terminated:
+                    break  # unreachable tail after jump/return
                 self.lower_instruction(builder, module, instr)
 
             # Ensure block ends with a terminator
             if not builder.block.is_terminated:
-                builder.ret(ir.IntType(32)(0))
+                self.lower_return(builder, module, IRInstruction(OpCode.RETURN))
+
+        if func.blocks:
+            self.alloca_builder.branch(self.block_map[func.blocks[0].name])
+        else:
+            self.lower_return(self.alloca_builder, module, IRInstruction(OpCode.RETURN))
 
     # ----------------------------------------
     # Build LLVM module
     # ----------------------------------------
     def build_llvm_module(self, ir_module):
         llvm_module = ir.Module(name=ir_module.name)
-        self.declare_runtime(llvm_module)
+        self.runtime = NovaRuntime(llvm_module)
+        self.module_name = ir_module.name
+        self.exports = [f.name for f in ir_module.functions if ir_module.is_exported(f.name)]
+        self.spans = {f.name: list(f.span) for f in ir_module.functions if f.span}
+        self.imports = set()
+        self.natives = set()
+        self.native_sites = 0
+        self.uses_math = any(
+            instr.opcode == OpCode.USE_MODULE and instr.operands[0].value == "std/math"
+            for func in ir_module.functions for block in func.blocks for instr in block.instructions
+        )
+        self.counter_layouts = {}
+        self.function_profiles = self.profile.module(ir_module) if self.profile else {}
+
+        # Forward-declare everything first so calls can precede definitions
+        for func in ir_module.functions:
+            self.declare_function(llvm_module, ir_module, func)
 
         for func in ir_module.functions:
             self.lower_function(llvm_module, func)
@@ -284,25 +1055,193 @@ class LLVMBackend:
         return llvm_module
 
     # ----------------------------------------
-    # Emit .nomc
+    # Target machine + optimization pipeline
     # ----------------------------------------
-    def emit_nomc(self, llvm_module, output):
+    def target_spec(self, cpu=None, features=None):
+        """Resolve (cpu, features), expanding cpu="native" to this host."""
+        cpu = self.cpu if cpu is None else cpu
+        features = self.features if features is None else features
+
+        if cpu == "native":
+            # Host features first so explicit --features can override them
+            cpu = binding.get_host_cpu_name()
+            features = ",".join(filter(None, [binding.get_host_cpu_features().flatten(), features]))
+
+        return cpu, features
+
+    def create_target_machine(self, cpu=None, features=None):
+        cpu, features = self.target_spec(cpu, features)
         target = binding.Target.from_default_triple()
-        target_machine = target.create_target_machine(opt=3)
+        return target.create_target_machine(cpu=cpu, features=features, opt=3)
+
+    def optimize(self, llvm_module, target_machine):
+        """Verify llvm_module and run the -O3 pipeline; returns a binding ModuleRef."""
+        llvm_module.triple = target_machine.triple
+        llvm_module.data_layout = str(target_machine.target_data)
+
+        mod = binding.parse_assembly(str(llvm_module))
+        mod.verify()
 
-        obj = target_machine.emit_object(llvm_module)
+        pto = binding.create_pipeline_tuning_options(speed_level=3)
+        pass_builder = binding.create_pass_builder(target_machine, pto)
+        pass_builder.getModulePassManager().run(mod, pass_builder)
+        return mod
+
+    # ----------------------------------------
+    # Emit .nomc
+    # ----------------------------------------
+    def emit_nomc(self, llvm_module, output, cpu=None, features=None, requires=None):
+        """
+        Write a .nomc container (see nomc_format.py): optimized bitcode plus,
+        unless with_object is off, the object compiled for cpu/features.
+        requires lists the host features the object needs; by default the
+        features enabled with "+" in the feature string.
+        """
+        cpu, features = self.target_spec(cpu, features)
+        target_machine = self.create_target_machine(cpu, features)
+        mod = self.optimize(llvm_module, target_machine)
+        functions = self.expose_functions(mod)
+
+        if requires is None:
+            requires = [f[1:] for f in features.split(",") if f.startswith("+")]
+
+        meta = {
+            "module": llvm_module.name,
+            "triple": target_machine.triple,
+            "cpu": cpu,
+            "features": features,
+            "requires": sorted(requires),
+            # Portable objects run on any host with the required features;
+            # others only on the exact CPU they were tuned for
+            "portable": cpu in PORTABLE_CPUS,
+            # Symbol lists the launcher links modules on demand with
+            "exports": self.exports,
+            "imports": sorted(self.imports),
+            # NATIVE_CALL trampolines the launcher registers before linking
+            "natives": sorted(self.natives),
+            # Every function in the object, for perf maps and sampling
+            "functions": functions,
+        }
+        if self.counter_layouts:
+            # Instrumented build: where the launcher finds each counter array
+            meta["profile"] = {name: layout.to_meta() for name, layout in self.counter_layouts.items()}
+        obj = target_machine.emit_object(mod) if self.with_object else None
 
         with open(output, "wb") as f:
-            f.write(obj)
+            f.write(pack_nomc(meta, mod.as_bitcode(), obj))
 
         return output
 
+    def expose_functions(self, mod):
+        """
+        Give every function left after optimization a global symbol, so
+        the launcher can look up its address; internal ones are renamed
+        <module>.<name> to stay unique in the shared engine. All IPO has
+        run by now, so this does not change the generated code.
+        Returns the META "functions" records.
+        """
+        records = []
+        for func in mod.functions:
+            if func.is_declaration:
+                continue
+
+            name = func.name
+            if func.linkage == binding.Linkage.internal:
+                func.name = f"{self.module_name}.{name}"
+                func.linkage = "external"
+
+            records.append({"name": name, "symbol": func.name, "span": self.spans.get(name)})
+
+        return records
+
+    def emit_variants(self, llvm_module, output):
+        """
+        Emit one .nomc per CPU_VARIANTS entry next to output.
+
+        The baseline variant is written to output itself, the others to
+        <name>.<variant>.nomc. Returns the triple and a best-first list of
+        {"variant", "requires", "path"} records for the manifest.
+        """
+        triple = binding.get_default_triple()
+        if not triple.startswith("x86_64"):
+            # Only x86-64 has micro-architecture levels to choose between
+            path = self.emit_nomc(llvm_module, output)
+            return triple, [{"variant": "baseline", "requires": [], "path": path}]
+
+        stem, ext = os.path.splitext(output)
+        variants = []
+
+        for name, cpu, requires in CPU_VARIANTS:
+            path = output if name == "baseline" else f"{stem}.{name}{ext}"
+            self.emit_nomc(llvm_module, path, cpu=cpu, features="", requires=requires)
+            variants.append({"variant": name, "requires": list(requires), "path": path})
+
+        return triple, variants
+
+    # ----------------------------------------
+    # Emit native objects (novac --native)
+    # ----------------------------------------
+    def emit_native_object(self, llvm_module, entry=False):
+        """
+        Position-independent object of llvm_module for native_link.py.
+        In the entry module main() is renamed to the shim's __nova_main;
+        elsewhere it is made internal so modules do not clash.
+        """
+        cpu, features = self.target_spec()
+        target_machine = pic_target_machine(cpu, features)
+        mod = self.optimize(llvm_module, target_machine)
+
+        try:
+            main = mod.get_function("main")
+        except NameError:
+            main = None
+
+        if main is not None and not main.is_declaration:
+            if entry:
+                main.name = ENTRY_SYMBOL
+            else:
+                main.linkage = "internal"
+
+        return target_machine.emit_object(mod)
+
 
 # ============================================
 # Public API
 # ============================================
 
-def generate_nomc(ir_module, output="bin/main.nomc"):
-    backend = LLVMBackend()
+def module_signatures(ir_modules):
+    """
+    name -> (param types, return type) of every function exported by
+    ir_modules (the first module wins a duplicate name), for the
+    signatures= of backends compiling modules that call them.
+    """
+    signatures = {}
+    for ir_module in ir_modules:
+        for func in ir_module.functions:
+            if ir_module.is_exported(func.name):
+                signatures.setdefault(func.name, (func.param_types, func.return_type))
+    return signatures
+
+
+def generate_nomc(ir_module, output="bin/main.nomc", cpu="", features="", with_object=True,
+                  instrument=False, profile=None, libm=True, signatures=None):
+    backend = LLVMBackend(cpu=cpu, features=features, with_object=with_object,
+                          instrument=instrument, profile=profile, libm=libm, signatures=signatures)
     llvm_module = backend.build_llvm_module(ir_module)
     return backend.emit_nomc(llvm_module, output)
+
+
+def generate_nomc_variants(ir_module, output="bin/main.nomc", with_object=True,
+                           instrument=False, profile=None, libm=True, signatures=None):
+    """Multiversioned build: baseline, AVX2 and AVX-512 objects of one module."""
+    backend = LLVMBackend(with_object=with_object, instrument=instrument, profile=profile, libm=libm,
+                          signatures=signatures)
+    llvm_module = backend.build_llvm_module(ir_module)
+    return backend.emit_variants(llvm_module, output)
+
+
+def generate_native_object(ir_module, cpu="", features="", entry=False, libm=True, signatures=None):
+    """Object bytes of ir_module for linking into a native executable."""
+    backend = LLVMBackend(cpu=cpu, features=features, libm=libm, signatures=signatures)
+    llvm_module = backend.build_llvm_module(ir_module)
+    return backend.emit_native_object(llvm_module, entry=entry)
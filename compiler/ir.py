@@ -83,7 +83,7 @@ class OpCode(Enum):
     # ----------------------------------------
     # Lists / Arrays
     # ----------------------------------------
-    LIST_NEW    = auto()     # dest_list
+    LIST_NEW    = auto()     # dest_list [, elem_type IRConst (default "int")]
     LIST_APPEND = auto()     # list_temp, value_temp
     LIST_GET    = auto()     # dest, list_temp, index_temp
     LIST_SET    = auto()     # list_temp, index_temp, value_temp
@@ -92,7 +92,7 @@ class OpCode(Enum):
     # ----------------------------------------
     # Maps / Dictionaries
     # ----------------------------------------
-    MAP_NEW     = auto()     # dest_map
+    MAP_NEW     = auto()     # dest_map [, value_type IRConst (default "int")]
     MAP_GET     = auto()     # dest, map_temp, key_temp
     MAP_SET     = auto()     # map_temp, key_temp, value_temp
     MAP_HAS_KEY = auto()     # dest_bool, map_temp, key_temp
@@ -214,16 +214,22 @@ class IRFunction:
     Attributes:
         name: function name
         params: list of parameter names
+        param_types: list of Nova type names, one per parameter ("int" if omitted)
+        return_type: Nova type name of the return value
         blocks: list of IRBlock
+        span: (line, column) of the definition in the source, if known
         _temp_counter: counter for generating unique IRTemp names
     """
 
-    __slots__ = ("name", "params", "blocks", "_temp_counter")
+    __slots__ = ("name", "params", "param_types", "return_type", "blocks", "span", "_temp_counter")
 
-    def __init__(self, name: str, params=None):
+    def __init__(self, name: str, params=None, param_types=None, return_type="int", span=None):
         self.name = name
         self.params = params or []
+        self.param_types = param_types or ["int"] * len(self.params)
+        self.return_type = return_type
         self.blocks = []
+        self.span = span
         self._temp_counter = 0
 
     def new_block(self, name: str) -> IRBlock:
@@ -237,7 +243,8 @@ class IRFunction:
         return IRTemp(tname)
 
     def __repr__(self):
-        lines = [f"func {self.name}({', '.join(self.params)})"]
+        params = ", ".join(f"{p}: {t}" for p, t in zip(self.params, self.param_types))
+        lines = [f"func {self.name}({params}) -> {self.return_type}"]
         for block in self.blocks:
             lines.append(repr(block))
         return "\n".join(lines)
@@ -248,13 +255,29 @@ class IRFunction:
 # --------------------------------------------
 
 class IRModule:
-    """Represents a Nova module containing multiple IR functions."""
+    """
+    Represents a Nova module containing multiple IR functions.
 
-    __slots__ = ("name", "functions")
+    Attributes:
+        name: module name
+        functions: list of IRFunction
+        exports: names visible to other modules, or None to export every
+                 function whose name does not start with "_"
+    """
 
-    def __init__(self, name: str):
+    __slots__ = ("name", "functions", "exports")
+
+    def __init__(self, name: str, exports=None):
         self.name = name
         self.functions = []
+        self.exports = exports
+
+    def is_exported(self, name: str) -> bool:
+        if name == "main":
+            return True
+        if self.exports is None:
+            return not name.startswith("_")
+        return name in self.exports
 
     def add_function(self, func: IRFunction):
         self.functions.append(func)
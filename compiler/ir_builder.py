@@ -95,7 +95,16 @@ class IRBuilder:
     # ----------------------------------------
 
     def build_function(self, node: FunctionDef):
-        func = IRFunction(node.name, params=node.params)
+        # Annotations: param_types has one Nova type name or None per
+        # parameter, return_type a name or None; unannotated means int
+        param_types = getattr(node, "param_types", None) or [None] * len(node.params)
+        func = IRFunction(
+            node.name,
+            params=node.params,
+            param_types=[t or "int" for t in param_types],
+            return_type=getattr(node, "return_type", None) or "int",
+            span=getattr(node, "span", None),
+        )
         self.module.add_function(func)
 
         self.current_function = func
@@ -0,0 +1,106 @@
+# ============================================
+# Native executables (novac --native)
+# --------------------------------------------
+# Links the position-independent objects of a program,
+# each carrying its own generated runtime (runtime_ir.py),
+# and a small C-ABI entry shim into a standalone
+# executable with the system linker:
+#
+#   int main(void)                     shim, from libc crt
+#       return __nova_main();          the entry module's main()
+#
+# The resulting binary needs neither Python nor llvmlite
+# at run time. Code that depends on launcher-provided
+# Python natives cannot be linked this way; the linker
+# reports those symbols as undefined. sys_args is one of
+# them, so native executables get no command-line
+# arguments.
+# ============================================
+
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+
+from llvmlite import ir, binding
+
+ENTRY_SYMBOL = "__nova_main"
+
+# C compiler drivers tried in order; they know where crt and libc live
+DEFAULT_LINKERS = ("cc", "gcc", "clang")
+LINK_LIBRARIES = ("m",)
+
+
+class NativeLinkError(Exception):
+    """No usable system linker, or the link step failed."""
+    pass
+
+
+def find_linker():
+    """Linker command: $NOVA_LINKER, $CC, or the first of cc/gcc/clang on PATH."""
+    for candidate in (os.environ.get("NOVA_LINKER"), os.environ.get("CC"), *DEFAULT_LINKERS):
+        if not candidate:
+            continue
+        command = shlex.split(candidate)
+        path = shutil.which(command[0])
+        if path:
+            return [path, *command[1:]]
+
+    raise NativeLinkError("No system linker found (install cc, or set NOVA_LINKER)")
+
+
+def pic_target_machine(cpu="", features=""):
+    """Target machine for objects linked into (PIE) executables."""
+    target = binding.Target.from_default_triple()
+    return target.create_target_machine(cpu=cpu, features=features, opt=3, reloc="pic")
+
+
+def entry_shim():
+    """Object defining the C main() that calls __nova_main()."""
+    target_machine = pic_target_machine()
+    i32 = ir.IntType(32)
+
+    module = ir.Module(name="nova_entry")
+    module.triple = target_machine.triple
+
+    nova_main = ir.Function(module, ir.FunctionType(i32, []), name=ENTRY_SYMBOL)
+    main = ir.Function(module, ir.FunctionType(i32, []), name="main")
+
+    builder = ir.IRBuilder(main.append_basic_block("entry"))
+    builder.ret(builder.call(nova_main, []))
+
+    mod = binding.parse_assembly(str(module))
+    mod.verify()
+    return target_machine.emit_object(mod)
+
+
+def link_executable(objects, output, linker=None):
+    """
+    Link objects (bytes, the entry module's among them) plus the entry
+    shim into the executable output. Returns output.
+    """
+    command = linker or find_linker()
+
+    with tempfile.TemporaryDirectory(prefix="nova-link-") as tmp:
+        paths = []
+        for i, obj in enumerate([entry_shim(), *objects]):
+            path = os.path.join(tmp, f"{i}.o")
+            with open(path, "wb") as f:
+                f.write(obj)
+            paths.append(path)
+
+        out_dir = os.path.dirname(output)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+        cmd = [*command, "-o", output, *paths, *(f"-l{lib}" for lib in LINK_LIBRARIES)]
+        try:
+            proc = subprocess.run(cmd, capture_output=True, text=True)
+        except OSError as e:
+            raise NativeLinkError(f"Failed to run linker '{command[0]}': {e}")
+
+        if proc.returncode != 0:
+            raise NativeLinkError(f"Linking {output} failed:\n{proc.stderr.strip()}")
+
+    return output
@@ -0,0 +1,97 @@
+# ============================================
+# .nomc container format
+# --------------------------------------------
+#   offset  size
+#   0       4     magic "NOMC"
+#   4       2     format version (u16, little endian)
+#   6       2     section count n (u16)
+#   8       24*n  section table: tag (4 ascii bytes), 4 pad,
+#                 offset (u64), size (u64)
+#
+# Section payloads follow the table, each 16-byte aligned:
+#   META  JSON: module, triple, cpu, features, requires,
+#         exports/imports (defined / external symbols),
+#         functions (name, symbol, span; for profilers),
+#         natives (native call trampoline signatures)
+#   BITC  LLVM bitcode of the optimized module (JIT fallback)
+#   OBJ   relocatable object built for META triple/cpu (optional)
+#
+# The launcher keeps a read-only copy of this layout in
+# runtime/nomc_format.py; bump NOMC_VERSION in both.
+# ============================================
+
+import json
+import struct
+
+NOMC_MAGIC = b"NOMC"
+NOMC_VERSION = 2
+# Native call sites hold the handle object from this version on
+# (runtime/native_bridge.py); older ones cannot use the trampolines
+NATIVE_CALL_VERSION = 2
+
+HEADER = struct.Struct("<4sHH")
+SECTION = struct.Struct("<4s4xQQ")
+SECTION_ALIGN = 16
+
+META = b"META"
+BITCODE = b"BITC"
+OBJECT = b"OBJ "
+
+
+class NomcFormatError(Exception):
+    """Raised for truncated or foreign .nomc data."""
+    pass
+
+
+def _align(offset):
+    return (offset + SECTION_ALIGN - 1) // SECTION_ALIGN * SECTION_ALIGN
+
+
+def pack_nomc(meta, bitcode, obj=None):
+    """Serialize one module; obj is omitted for bitcode-only builds."""
+    sections = [(META, json.dumps(meta, sort_keys=True).encode("utf8")), (BITCODE, bytes(bitcode))]
+    if obj is not None:
+        sections.append((OBJECT, bytes(obj)))
+
+    table = []
+    offset = _align(HEADER.size + SECTION.size * len(sections))
+    for tag, payload in sections:
+        table.append((tag, offset, len(payload)))
+        offset = _align(offset + len(payload))
+
+    out = bytearray(offset)
+    HEADER.pack_into(out, 0, NOMC_MAGIC, NOMC_VERSION, len(sections))
+    for i, (tag, start, size) in enumerate(table):
+        SECTION.pack_into(out, HEADER.size + i * SECTION.size, tag, start, size)
+    for (tag, start, size), (_, payload) in zip(table, sections):
+        out[start:start + size] = payload
+
+    return bytes(out)
+
+
+def unpack_nomc(data):
+    """Return (meta dict, {tag: memoryview}) without copying payloads."""
+    view = memoryview(data)
+    if len(view) < HEADER.size:
+        raise NomcFormatError("file too short for a .nomc header")
+
+    magic, version, count = HEADER.unpack_from(view, 0)
+    if magic != NOMC_MAGIC:
+        raise NomcFormatError("not a .nomc container (bad magic)")
+    if version > NOMC_VERSION:
+        raise NomcFormatError(f".nomc format version {version} is newer than supported ({NOMC_VERSION})")
+
+    sections = {}
+    for i in range(count):
+        tag, start, size = SECTION.unpack_from(view, HEADER.size + i * SECTION.size)
+        if start + size > len(view):
+            raise NomcFormatError(f"section {tag!r} runs past the end of the file")
+        sections[tag] = view[start:start + size]
+
+    if META not in sections or BITCODE not in sections:
+        raise NomcFormatError(".nomc container is missing META or BITC")
+
+    meta = json.loads(bytes(sections.pop(META)).decode("utf8"))
+    if version < NATIVE_CALL_VERSION and meta.get("natives"):
+        raise NomcFormatError(f".nomc format version {version} predates the native call ABI; rebuild it")
+    return meta, sections
@@ -4,23 +4,50 @@
 # ============================================
 
 import os
-import tarfile
 import json
+import shutil
+from llvmlite import binding
 
 from compiler.lexer import tokenize
 from compiler.parser import parse
 from compiler.ir_builder import build_ir
-from compiler.codegen_nomc import generate_nomc
+from compiler.codegen_nomc import (
+    generate_nomc,
+    generate_nomc_variants,
+    generate_native_object,
+    module_signatures,
+)
+from compiler.native_link import NativeLinkError, link_executable
+from compiler.novar_pack import pack_novar
 from compiler.issues import IssueReporter
 
 
-def build_novar(project_name, source_dir="nova", bin_dir="bin", target_dir="target"):
+def build_novar(project_name, source_dir="nova", bin_dir="bin", target_dir="target",
+                cpu="", features="", multiversion=False, with_object=True,
+                instrument=False, profile=None, native=False, embed_native=False,
+                resource_dir=None, compress=False, libm=True):
+    """
+    cpu/features tune every .nomc for one CPU ("native" = this host).
+    multiversion instead emits baseline/AVX2/AVX-512 variants and records
+    them in the manifest "targets" map for the launcher to choose from.
+    with_object=False leaves out the precompiled objects (bitcode only).
+    instrument adds PGO counters; profile (pgo.ProfileUse) optimizes with one.
+    libm=False keeps std/math calls on the pure-Nova stdlib instead of
+    LLVM intrinsics and libm (targets without libm).
+    native also links target/<project> as a standalone executable (see
+    native_link.py); embed_native packs it into the .novar as well.
+    resource_dir is packed as res/; compress picks a codec per member.
+    """
     # Ensure directories exist
     os.makedirs(bin_dir, exist_ok=True)
     os.makedirs(target_dir, exist_ok=True)
 
     reporter = IssueReporter()
     compiled_files = []
+    targets = {}
+    exports = {}   # symbol -> .nomc defining it
+    entry = None
+    ir_modules = []  # (nomc path, IRModule), for native linking
 
     # ----------------------------------------
     # Collect .nova files
@@ -40,8 +67,9 @@ def build_novar(project_name, source_dir="nova", bin_dir="bin", target_dir="targ
         reporter.report()
 
     # ----------------------------------------
-    # Compile each .nova file
+    # Parse each .nova file into IR
     # ----------------------------------------
+    parsed = []  # (file name, IRModule)
     for fname in nova_files:
         path = os.path.join(source_dir, fname)
 
@@ -71,16 +99,48 @@ def build_novar(project_name, source_dir="nova", bin_dir="bin", target_dir="targ
             reporter.error(f"IR generation failed for {fname}: {e}")
             continue
 
+        # Named after the source file: symbol prefixes, profiles and perf maps use it
+        ir_module.name = os.path.splitext(fname)[0]
+        parsed.append((fname, ir_module))
+
+    # Cross-module calls are declared with the callee's own types
+    signatures = module_signatures(ir_module for _, ir_module in parsed)
+
+    # ----------------------------------------
+    # Compile each module
+    # ----------------------------------------
+    for fname, ir_module in parsed:
         # Output .nomc file
         nomc_path = os.path.join(bin_dir, fname.replace(".nova", ".nomc"))
 
         try:
-            generate_nomc(ir_module, output=nomc_path)
+            if multiversion:
+                triple, variants = generate_nomc_variants(ir_module, output=nomc_path,
+                                                        with_object=with_object,
+                                                        instrument=instrument, profile=profile,
+                                                        libm=libm, signatures=signatures)
+                add_target_variants(targets.setdefault(triple, []), variants)
+            else:
+                generate_nomc(ir_module, output=nomc_path, cpu=cpu, features=features,
+                              with_object=with_object, instrument=instrument, profile=profile,
+                              libm=libm, signatures=signatures)
             compiled_files.append(nomc_path)
+            ir_modules.append((nomc_path, ir_module))
         except Exception as e:
             reporter.error(f"Codegen failed for {fname}: {e}")
             continue
 
+        # Entry point and export list for the launcher's on-demand linking
+        for func in ir_module.functions:
+            if func.name == "main":
+                if entry is None or fname == "main.nova":
+                    entry = nomc_path
+            elif ir_module.is_exported(func.name):
+                if func.name in exports:
+                    reporter.warning(f"'{func.name}' is exported by both "
+                                     f"{exports[func.name]} and {nomc_path}")
+                exports.setdefault(func.name, nomc_path)
+
     # ----------------------------------------
     # Write manifest
     # ----------------------------------------
@@ -91,6 +151,28 @@ def build_novar(project_name, source_dir="nova", bin_dir="bin", target_dir="targ
         },
         "bin": compiled_files
     }
+    if entry is not None:
+        manifest["entry"] = entry
+        manifest["exports"] = exports
+    if targets:
+        manifest["targets"] = targets
+
+    # ----------------------------------------
+    # Link native executable
+    # ----------------------------------------
+    if native or embed_native:
+        exe_path = link_native(project_name, ir_modules, entry, target_dir, cpu, features, libm,
+                               signatures, reporter)
+        if exe_path is None:
+            reporter.report()
+            return None
+
+        if embed_native:
+            triple = binding.get_default_triple()
+            embedded = os.path.join(bin_dir, "native", triple, project_name)
+            os.makedirs(os.path.dirname(embedded), exist_ok=True)
+            shutil.copy2(exe_path, embedded)
+            manifest["native"] = {triple: f"bin/native/{triple}/{project_name}"}
 
     manifest_path = os.path.join(bin_dir, "Manifest.json")
     try:
@@ -107,8 +189,7 @@ def build_novar(project_name, source_dir="nova", bin_dir="bin", target_dir="targ
     novar_path = os.path.join(target_dir, f"{project_name}.novar")
 
     try:
-        with tarfile.open(novar_path, "w") as tar:
-            tar.add(bin_dir, arcname="bin")
+        pack_novar(novar_path, bin_dir, resource_dir=resource_dir, compress=compress)
     except Exception as e:
         reporter.error(f"Failed to create .novar archive: {e}")
         reporter.report()
@@ -116,3 +197,46 @@ def build_novar(project_name, source_dir="nova", bin_dir="bin", target_dir="targ
 
     print(f"✅ Built {novar_path} with LTO")
     return novar_path
+
+
+def link_native(project_name, ir_modules, entry, target_dir, cpu, features, libm, signatures,
+                reporter):
+    """Link every compiled module into target_dir/<project_name>; None on failure."""
+    if entry is None:
+        reporter.error("Native executables need a main() function")
+        return None
+
+    try:
+        objects = [
+            generate_native_object(ir_module, cpu=cpu, features=features, entry=path == entry,
+                                   libm=libm, signatures=signatures)
+            for path, ir_module in ir_modules
+        ]
+        exe_path = link_executable(objects, os.path.join(target_dir, project_name))
+    except NativeLinkError as e:
+        reporter.error(str(e))
+        return None
+    except Exception as e:
+        reporter.error(f"Native codegen failed: {e}")
+        return None
+
+    print(f"✅ Linked native executable {exe_path}")
+    return exe_path
+
+
+def add_target_variants(entries, variants):
+    """
+    Merge one module's variants into a manifest "targets" list.
+
+    Each entry lists the variant's binaries in the same order as "bin":
+        {"variant": "avx2", "requires": ["avx2", ...], "bin": [...]}
+    """
+    by_name = {entry["variant"]: entry for entry in entries}
+
+    for variant in variants:
+        entry = by_name.get(variant["variant"])
+        if entry is None:
+            entry = {"variant": variant["variant"], "requires": variant["requires"], "bin": []}
+            by_name[variant["variant"]] = entry
+            entries.append(entry)
+        entry["bin"].append(variant["path"])
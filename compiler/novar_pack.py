@@ -0,0 +1,125 @@
+# ============================================
+# .novar packing
+# Writes bin/ (and res/) into a USTAR archive led by
+# a member index (see runtime/novar_archive.py), with
+# optional per-member compression. No front-end
+# imports, so tools and benchmarks can pack archives
+# without the compiler.
+# ============================================
+
+import hashlib
+import io
+import lzma
+import os
+import struct
+import tarfile
+import zlib
+
+# Member index at the front of every .novar (see runtime/novar_archive.py)
+INDEX_NAME = "NOVAR.INDEX"
+INDEX_MAGIC = b"NVIX"
+INDEX_VERSION = 2
+INDEX_HEADER = struct.Struct("<4sIII")
+INDEX_RECORD = struct.Struct("<IIQQQB7x32s")
+TAR_BLOCK = 512
+MANIFEST_NAME = "Manifest.json"
+
+# Per-member codecs (novac --compress)
+CODEC_STORE = 0
+CODEC_ZLIB = 1
+CODEC_LZMA = 2
+CODEC_SUFFIX = {CODEC_ZLIB: ".zz", CODEC_LZMA: ".xz"}
+MIN_COMPRESS_SIZE = 16 * 1024
+LZMA_MIN_SIZE = 256 * 1024
+MIN_SAVING = 0.1
+PRECOMPRESSED = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".mp3", ".ogg", ".mp4",
+                 ".zip", ".gz", ".xz", ".bz2", ".zst"}
+
+
+def choose_codec(name, data):
+    """
+    (codec, payload) for one member. Small members and formats that are
+    already compressed are stored; code uses zlib, which decompresses
+    several times faster than lzma; large resources get lzma's better
+    ratio. Compression that saves too little is not worth a decompress.
+    """
+    if len(data) < MIN_COMPRESS_SIZE or name == f"bin/{MANIFEST_NAME}":
+        return CODEC_STORE, data
+    if os.path.splitext(name)[1].lower() in PRECOMPRESSED:
+        return CODEC_STORE, data
+
+    if name.startswith("bin/") or len(data) < LZMA_MIN_SIZE:
+        codec, packed = CODEC_ZLIB, zlib.compress(data, 9)
+    else:
+        codec, packed = CODEC_LZMA, lzma.compress(data, preset=6)
+
+    if len(packed) > len(data) * (1 - MIN_SAVING):
+        return CODEC_STORE, data
+    return codec, packed
+
+
+def pack_novar(novar_path, bin_dir, arcname="bin", resource_dir=None, compress=False):
+    """
+    Write bin_dir (and resource_dir as res/) into a USTAR archive whose
+    first member is NOVAR.INDEX.
+
+    The index holds one fixed-size record per member (name, data offset,
+    stored size, size, codec, SHA-256 of the content), sorted by name, so
+    the launcher can mmap the archive and binary-search members without
+    scanning tar headers. Its size only depends on the member names, so
+    it is reserved first and filled in once the tar offsets are known.
+
+    With compress, each member is compressed on its own (choose_codec)
+    and stored as <name>.zz / <name>.xz, so the launcher only ever
+    decompresses the members it reads.
+    """
+    files = []
+    for source, prefix in ((bin_dir, arcname), (resource_dir, "res")):
+        if source is None or not os.path.isdir(source):
+            continue
+        for root, dirs, names in os.walk(source):
+            dirs.sort()
+            for name in sorted(names):
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, source).replace(os.sep, "/")
+                files.append((f"{prefix}/{rel}", path))
+
+    files.sort(key=lambda item: item[0].encode("utf8"))
+    encoded = [name.encode("utf8") for name, _ in files]
+    names_offset = INDEX_HEADER.size + INDEX_RECORD.size * len(files)
+    index_size = names_offset + sum(len(name) for name in encoded)
+
+    members = []  # (tar name, size, codec, sha256)
+    with tarfile.open(novar_path, "w", format=tarfile.USTAR_FORMAT) as tar:
+        info = tarfile.TarInfo(INDEX_NAME)
+        info.size = index_size
+        tar.addfile(info, io.BytesIO(bytes(index_size)))
+
+        for name, path in files:
+            with open(path, "rb") as f:
+                data = f.read()
+            codec, payload = choose_codec(name, data) if compress else (CODEC_STORE, data)
+
+            info = tar.gettarinfo(path, arcname=name + CODEC_SUFFIX.get(codec, ""))
+            info.size = len(payload)
+            tar.addfile(info, io.BytesIO(payload))
+            members.append((info.name, len(data), codec, hashlib.sha256(data).digest()))
+
+    with tarfile.open(novar_path, "r") as tar:
+        offsets = {info.name: (info.offset_data, info.size) for info in tar.getmembers()}
+
+    index = bytearray(index_size)
+    INDEX_HEADER.pack_into(index, 0, INDEX_MAGIC, INDEX_VERSION, len(files), names_offset)
+    name_pos = names_offset
+    for i, ((tar_name, size, codec, digest), raw) in enumerate(zip(members, encoded)):
+        offset, stored_size = offsets[tar_name]
+        INDEX_RECORD.pack_into(index, INDEX_HEADER.size + i * INDEX_RECORD.size,
+                               name_pos, len(raw), offset, stored_size, size, codec, digest)
+        index[name_pos:name_pos + len(raw)] = raw
+        name_pos += len(raw)
+
+    with open(novar_path, "r+b") as f:
+        f.seek(TAR_BLOCK)
+        f.write(index)
+
+    return novar_path
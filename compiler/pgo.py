@@ -0,0 +1,176 @@
+# ============================================
+# Profile-guided optimization support
+# --------------------------------------------
+# Instrumented builds (novac --profile-generate) give
+# every IRFunction an exported i64 counter array:
+#
+#   [0]          function entries
+#   [1 .. B]     entries into each IRBlock (func.blocks order)
+#   [B+1 ..]     (taken, not taken) per conditional jump
+#
+# The layout goes into the .nomc META record, so the
+# launcher can read the counters by symbol name when
+# main() returns and write a profile:
+#
+#   {"version": 1, "runs": 1,
+#    "modules": {module: {function: {
+#        "entry": n,
+#        "blocks": {block: n},
+#        "branches": {"block#k": [taken, not_taken]}}}}}
+#
+# novaprof merges profiles; novac --profile-use feeds one
+# back as branch weights, entry counts and hot/cold
+# function attributes.
+# ============================================
+
+import json
+
+from .ir import OpCode
+
+PROFILE_VERSION = 1
+
+# A function is hot once it accounts for this share of the
+# module's executed blocks
+HOT_FRACTION = 0.01
+
+# Branch weights are i32 in LLVM metadata
+MAX_WEIGHT = 0x7FFFFFFF
+
+COND_JUMPS = (OpCode.JUMP_IF_TRUE, OpCode.JUMP_IF_FALSE)
+
+
+class ProfileError(Exception):
+    """Unreadable or incompatible profile data."""
+    pass
+
+
+# ============================================
+# Instrumentation layout
+# ============================================
+
+def counter_symbol(module_name, func_name):
+    return f"__nova_prof.{module_name}.{func_name}"
+
+
+def branch_key(block_name, ordinal):
+    """Key of the ordinal-th conditional jump inside an IRBlock."""
+    return f"{block_name}#{ordinal}"
+
+
+class CounterLayout:
+    """Counter slots of one instrumented IRFunction."""
+
+    def __init__(self, module_name, func):
+        self.symbol = counter_symbol(module_name, func.name)
+        self.blocks = [block.name for block in func.blocks]
+        self.block_slots = {name: 1 + i for i, name in enumerate(self.blocks)}
+
+        self.branches = []
+        self.branch_slots = {}
+        for block in func.blocks:
+            jumps = [i for i in block.instructions if i.opcode in COND_JUMPS]
+            for ordinal in range(len(jumps)):
+                key = branch_key(block.name, ordinal)
+                self.branch_slots[key] = 1 + len(self.blocks) + 2 * len(self.branches)
+                self.branches.append(key)
+
+    @property
+    def size(self):
+        return 1 + len(self.blocks) + 2 * len(self.branches)
+
+    def to_meta(self):
+        return {"symbol": self.symbol, "blocks": self.blocks, "branches": self.branches}
+
+
+# ============================================
+# Profile files
+# ============================================
+
+def empty_profile():
+    return {"version": PROFILE_VERSION, "runs": 0, "modules": {}}
+
+
+def load_profile(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ProfileError(f"Failed to read profile '{path}': {e}")
+
+    if profile.get("version") != PROFILE_VERSION:
+        raise ProfileError(f"Profile '{path}' has version {profile.get('version')}, "
+                           f"expected {PROFILE_VERSION}")
+    return profile
+
+
+def save_profile(profile, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=1, sort_keys=True)
+
+
+def merge_profiles(profiles):
+    """Sum counters of several profiles (runs of the same program)."""
+    merged = empty_profile()
+
+    for profile in profiles:
+        merged["runs"] += profile.get("runs", 1)
+        for module_name, functions in profile.get("modules", {}).items():
+            out_module = merged["modules"].setdefault(module_name, {})
+            for func_name, counts in functions.items():
+                out = out_module.setdefault(func_name, {"entry": 0, "blocks": {}, "branches": {}})
+                out["entry"] += counts.get("entry", 0)
+                for block, n in counts.get("blocks", {}).items():
+                    out["blocks"][block] = out["blocks"].get(block, 0) + n
+                for key, (taken, not_taken) in counts.get("branches", {}).items():
+                    prev = out["branches"].get(key, [0, 0])
+                    out["branches"][key] = [prev[0] + taken, prev[1] + not_taken]
+
+    return merged
+
+
+# ============================================
+# Profile use
+# ============================================
+
+class FunctionProfile:
+    def __init__(self, counts, hot, cold):
+        self.entry = counts.get("entry", 0)
+        self.branches = counts.get("branches", {})
+        self.hot = hot
+        self.cold = cold
+
+    def branch_weights(self, block_name, ordinal):
+        """[taken, not_taken] scaled into i32 range, or None if never seen."""
+        counts = self.branches.get(branch_key(block_name, ordinal))
+        if counts is None or not any(counts):
+            return None
+
+        scale = max(counts) // MAX_WEIGHT + 1
+        return [n // scale for n in counts]
+
+
+class ProfileUse:
+    """Per-module view of a (merged) profile for an optimized rebuild."""
+
+    def __init__(self, profile):
+        self.profile = profile
+
+    def module(self, ir_module):
+        """{function name: FunctionProfile} for the functions of ir_module."""
+        functions = self.profile.get("modules", {}).get(ir_module.name, {})
+        if not functions:
+            return {}
+
+        weights = {name: sum(c.get("blocks", {}).values()) for name, c in functions.items()}
+        total = sum(weights.values()) or 1
+
+        result = {}
+        for func in ir_module.functions:
+            counts = functions.get(func.name)
+            if counts is None or set(counts.get("blocks", {})) != {b.name for b in func.blocks}:
+                continue  # not profiled, or the function changed since
+            hot = weights[func.name] >= HOT_FRACTION * total
+            cold = counts.get("entry", 0) == 0 and func.name != "main"
+            result[func.name] = FunctionProfile(counts, hot, cold)
+
+        return result
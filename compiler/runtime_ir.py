@@ -0,0 +1,1186 @@
+# ============================================
+# Nova runtime, generated as LLVM IR
+# --------------------------------------------
+# The helpers behind LIST_* and iterator opcodes
+# are emitted straight into each module that uses
+# them (internal linkage, always-inline), so LLVM
+# sees the whole loop and can optimize across
+# what used to be opaque runtime calls.
+#
+#   list<T>  = { i64 len, i64 cap, T* data }
+#   iter<T>  = { list<T>*, i64 index }   (stack cursor)
+#   bytes_buffer = list<i8>, created at a fixed size
+#                  (zero-filled) and filled in place by
+#                  natives such as fs.readinto
+#
+#   map<V>   = { i64 len, i64 mask, i8* ctrl, i32* slots,
+#                entry<V>* entries, i64 entry_cap }
+#   entry<V> = { i64 hash, str* key, V value }
+#
+#   str      = { i64 len, i64 hash, i8* data, strbuf* buf }
+#   strbuf   = { i64 cap, i64 used, i8* bytes }
+#
+# Strings are length-prefixed views with a lazily cached
+# hash (0 = not yet computed). Literals are interned
+# constants with a precomputed hash. Concatenation
+# appends in place when the left operand ends exactly
+# at the tail of its growable buffer, so "s = s + c"
+# loops are amortized O(1) per append while every
+# earlier view keeps seeing its own immutable prefix.
+#
+# Maps use open addressing over groups of 16 control
+# bytes (0x80 = empty, else the low 7 hash bits), probed
+# with one vector compare per group. Slots index into a
+# dense entry array, which keeps insertion order and
+# caches each key's hash for lookups and rehashing.
+#
+# Bulk numeric list operations (sum, dot, scale, add,
+# min, max) run over int/float lists in 256-bit vector
+# steps with several independent accumulators, then
+# finish the tail one element at a time. Float sums are
+# therefore accumulated lane-wise, not left to right.
+#
+# Lists and map values are specialised per element kind:
+#   "int"   -> i32
+#   "float" -> double
+#   "byte"  -> i8    (read back as an unsigned int)
+#   "str"   -> str*
+#   "ptr"   -> i8*   (list, map, any)
+#   "handle" -> i64  (launcher object handles, see
+#                     runtime/native_objects.py)
+# ============================================
+
+from llvmlite import ir
+
+I1 = ir.IntType(1)
+I8 = ir.IntType(8)
+I32 = ir.IntType(32)
+I64 = ir.IntType(64)
+I8P = I8.as_pointer()
+F64 = ir.DoubleType()
+
+STRBUF = ir.LiteralStructType([I64, I64, I8P])
+STR = ir.LiteralStructType([I64, I64, I8P, STRBUF.as_pointer()]).as_pointer()
+
+# Element kind -> LLVM element type
+ELEMENT_TYPES = {
+    "int": I32,
+    "float": F64,
+    "byte": I8,
+    "str": STR,
+    "ptr": I8P,
+    "handle": I64,
+}
+
+# Struct field indices
+LIST_LEN = 0
+LIST_CAP = 1
+LIST_DATA = 2
+
+ITER_LIST = 0
+ITER_INDEX = 1
+
+STR_LEN = 0
+STR_HASH = 1
+STR_DATA = 2
+STR_BUF = 3
+
+BUF_CAP = 0
+BUF_USED = 1
+BUF_BYTES = 2
+
+STR_MIN_CAPACITY = 16
+
+MIN_CAPACITY = 4
+
+MAP_LEN = 0
+MAP_MASK = 1
+MAP_CTRL = 2
+MAP_SLOTS = 3
+MAP_ENTRIES = 4
+MAP_ENTRY_CAP = 5
+
+ENTRY_HASH = 0
+ENTRY_KEY = 1
+ENTRY_VALUE = 2
+
+GROUP_WIDTH = 16
+MAP_MIN_SLOTS = 16
+MAP_MIN_ENTRIES = 8
+CTRL_EMPTY = 0x80
+
+# Resize once len exceeds 7/8 of the slots
+MAX_LOAD_NUM = 7
+MAX_LOAD_DEN = 8
+
+FNV_OFFSET = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+
+V16I8 = ir.VectorType(I8, GROUP_WIDTH)
+
+# Bulk list operations: vector width and independent accumulators
+VECTOR_BITS = 256
+VECTOR_UNROLL = 4
+VECTOR_LANES = {"int": 8, "float": 4}
+
+# libc functions the runtime calls: name -> (return, args, var_arg)
+LIBC_FUNCTIONS = {
+    "malloc": (I8P, [I64], False),
+    "calloc": (I8P, [I64, I64], False),
+    "realloc": (I8P, [I8P, I64], False),
+    "free": (ir.VoidType(), [I8P], False),
+    "exit": (ir.VoidType(), [I32], False),
+    "printf": (I32, [I8P], True),
+    "memcmp": (I32, [I8P, I8P, I64], False),
+    # libm: std/math calls that have no LLVM intrinsic
+    "tan": (F64, [F64], False),
+    "atan": (F64, [F64], False),
+    "atan2": (F64, [F64, F64], False),
+    "hypot": (F64, [F64, F64], False),
+}
+
+
+def signed64(value):
+    """Two's-complement view of an unsigned 64-bit constant."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def fnv1a(data):
+    """Compile-time twin of nova_str_hash; never returns 0 (0 marks "not cached")."""
+    h = FNV_OFFSET
+    for byte in data:
+        h = ((h ^ byte) * FNV_PRIME) & 0xFFFFFFFFFFFFFFFF
+    return h or 1
+
+
+def element_kind(type_name):
+    """Map a Nova element type name to the runtime's element kind."""
+    if type_name in ("int", "bool"):
+        return "int"
+    if type_name in ("float", "byte", "str", "handle"):
+        return type_name
+    return "ptr"
+
+
+def list_type(kind):
+    return ir.LiteralStructType([I64, I64, ELEMENT_TYPES[kind].as_pointer()]).as_pointer()
+
+
+def iter_struct(kind):
+    return ir.LiteralStructType([list_type(kind), I64])
+
+
+def entry_struct(kind):
+    return ir.LiteralStructType([I64, STR, ELEMENT_TYPES[kind]])
+
+
+def map_type(kind):
+    return ir.LiteralStructType([
+        I64, I64, I8P, I32.as_pointer(), entry_struct(kind).as_pointer(), I64,
+    ]).as_pointer()
+
+
+# Reverse lookups used by the backend to recover the element kind
+def vector_type(kind):
+    return ir.VectorType(ELEMENT_TYPES[kind], VECTOR_LANES[kind])
+
+
+LIST_KINDS = {list_type(kind): kind for kind in ELEMENT_TYPES}
+ITER_KINDS = {iter_struct(kind).as_pointer(): kind for kind in ELEMENT_TYPES}
+MAP_KINDS = {map_type(kind): kind for kind in ELEMENT_TYPES}
+
+
+def sizeof(builder, ty):
+    """Size of ty in bytes as i64 (gep-from-null idiom, target independent)."""
+    null = ir.Constant(ty.as_pointer(), None)
+    return builder.ptrtoint(builder.gep(null, [I32(1)]), I64)
+
+
+# ============================================
+# Runtime emitter
+# ============================================
+
+class NovaRuntime:
+    """Defines runtime helpers in an LLVM module on first use."""
+
+    def __init__(self, module):
+        self.module = module
+        self.functions = {}
+        self.strings = {}
+        self.literals = {}
+        self.literal_texts = {}
+        self.char_table = None
+
+    # ----------------------------------------
+    # libc
+    # ----------------------------------------
+    def libc(self, name):
+        func = self.module.globals.get(name)
+        if func is None:
+            ret, args, var_arg = LIBC_FUNCTIONS[name]
+            func = ir.Function(self.module, ir.FunctionType(ret, args, var_arg=var_arg), name=name)
+        return func
+
+    def cstring(self, text):
+        """NUL-terminated C string constant (printf formats and the like)."""
+        ptr = self.strings.get(text)
+        if ptr is None:
+            gv = self.byte_array(text.encode("utf8") + b"\00", f".nova_cstr_{len(self.strings)}")
+            ptr = self.strings[text] = gv.bitcast(I8P)
+        return ptr
+
+    def byte_array(self, data, name):
+        ty = ir.ArrayType(I8, len(data))
+        gv = ir.GlobalVariable(self.module, ty, name=name)
+        gv.linkage = "internal"
+        gv.global_constant = True
+        gv.initializer = ir.Constant(ty, bytearray(data))
+        return gv
+
+    def str_constant(self, data, data_ptr):
+        return ir.Constant(STR.pointee, [
+            I64(len(data)),
+            I64(signed64(fnv1a(data))),
+            data_ptr,
+            ir.Constant(STRBUF.as_pointer(), None),
+        ])
+
+    def str_literal(self, text):
+        """Interned Nova string literal: one constant header per distinct text."""
+        ptr = self.literals.get(text)
+        if ptr is None:
+            n = len(self.literals)
+            data = text.encode("utf8")
+            raw = self.byte_array(data + b"\00", f".nova_str_bytes_{n}")
+            gv = ir.GlobalVariable(self.module, STR.pointee, name=f".nova_str_{n}")
+            gv.linkage = "internal"
+            gv.global_constant = True
+            gv.initializer = self.str_constant(data, raw.gep([I32(0), I32(0)]))
+            ptr = self.literals[text] = gv
+            self.literal_texts[gv.name] = text
+        return ptr
+
+    def literal_text(self, value):
+        """Python text of an interned literal, or None for any other value."""
+        if isinstance(value, ir.GlobalVariable):
+            return self.literal_texts.get(value.name)
+        return None
+
+    # ----------------------------------------
+    # Function definition helper
+    # ----------------------------------------
+    def define(self, name, ret, args, body, inline=True):
+        """
+        Define name once per module; body(builder, func) emits the code.
+        inline: True -> alwaysinline, False -> noinline, None -> inliner decides.
+        """
+        func = self.functions.get(name)
+        if func is not None:
+            return func
+
+        func = ir.Function(self.module, ir.FunctionType(ret, args), name=name)
+        func.linkage = "internal"
+        func.attributes.add("nounwind")
+        if inline is not None:
+            func.attributes.add("alwaysinline" if inline else "noinline")
+        self.functions[name] = func
+
+        builder = ir.IRBuilder(func.append_basic_block("entry"))
+        body(builder, func)
+        return func
+
+    def field(self, builder, ptr, index):
+        return builder.gep(ptr, [I32(0), I32(index)], inbounds=True)
+
+    def load_field(self, builder, ptr, index):
+        return builder.load(self.field(builder, ptr, index))
+
+    def counted_loop(self, builder, count, body, start=None):
+        """Emit for (i = start; i < count; i++) body(builder, i); start defaults to 0."""
+        func = builder.function
+        head = func.append_basic_block("loop")
+        step = func.append_basic_block("loop.body")
+        done = func.append_basic_block("loop.end")
+
+        entry = builder.block
+        builder.branch(head)
+        builder.position_at_end(head)
+        i = builder.phi(I64)
+        i.add_incoming(I64(0) if start is None else start, entry)
+        builder.cbranch(builder.icmp_signed("<", i, count), step, done)
+
+        builder.position_at_end(step)
+        body(builder, i)
+        i.add_incoming(builder.add(i, I64(1)), builder.block)
+        builder.branch(head)
+
+        builder.position_at_end(done)
+
+    def strided_loop(self, builder, count, width, body):
+        """
+        Emit for (i = 0; i + width <= count; i += width) body(builder, i).
+        Returns the first index not covered, where a scalar epilogue starts.
+        """
+        func = builder.function
+        head = func.append_basic_block("vloop")
+        step = func.append_basic_block("vloop.body")
+        done = func.append_basic_block("vloop.end")
+
+        entry = builder.block
+        builder.branch(head)
+        builder.position_at_end(head)
+        i = builder.phi(I64)
+        i.add_incoming(I64(0), entry)
+        fits = builder.icmp_signed("<=", builder.add(i, I64(width)), count)
+        builder.cbranch(fits, step, done)
+
+        builder.position_at_end(step)
+        body(builder, i)
+        i.add_incoming(builder.add(i, I64(width)), builder.block)
+        builder.branch(head)
+
+        builder.position_at_end(done)
+        return i
+
+    def memset(self, builder, ptr, byte, nbytes):
+        fn = self.module.declare_intrinsic("llvm.memset", [I8P, I64])
+        builder.call(fn, [ptr, I8(byte), nbytes, I1(0)])
+
+    def memcpy(self, builder, dst, src, nbytes):
+        fn = self.module.declare_intrinsic("llvm.memcpy", [I8P, I8P, I64])
+        builder.call(fn, [dst, src, nbytes, I1(0)])
+
+    def splat(self, builder, value):
+        vec = builder.insert_element(ir.Constant(V16I8, None), value, I32(0))
+        return builder.shuffle_vector(vec, ir.Constant(V16I8, None),
+                                      ir.Constant(ir.VectorType(I32, GROUP_WIDTH), None))
+
+    def group_mask(self, builder, group, pattern):
+        """Bitmask (i32) of the control bytes in group equal to pattern."""
+        hits = builder.icmp_unsigned("==", group, pattern)
+        return builder.zext(builder.bitcast(hits, ir.IntType(GROUP_WIDTH)), I32)
+
+    def load_group(self, builder, ctrl, pos):
+        ptr = builder.bitcast(builder.gep(ctrl, [pos], inbounds=True), V16I8.as_pointer())
+        return builder.load(ptr, align=1)
+
+    def lowest_bit(self, builder, mask):
+        return builder.zext(builder.cttz(mask, I1(1)), I64)
+
+    # ----------------------------------------
+    # Errors
+    # ----------------------------------------
+    def index_error(self):
+        def body(b, f):
+            idx, length = f.args
+            fmt = self.cstring("IndexError: index %lld out of range (len %lld)\n")
+            b.call(self.libc("printf"), [fmt, idx, length])
+            b.call(self.libc("exit"), [I32(1)])
+            b.unreachable()
+
+        func = self.define("nova_index_error", ir.VoidType(), [I64, I64], body, inline=False)
+        func.attributes.add("cold")
+        func.attributes.add("noreturn")
+        return func
+
+    def key_error(self):
+        def body(b, f):
+            (key,) = f.args
+            fmt = self.cstring("KeyError: '%.*s'\n")
+            b.call(self.libc("printf"), [fmt, self.str_len_i32(b, key), self.load_field(b, key, STR_DATA)])
+            b.call(self.libc("exit"), [I32(1)])
+            b.unreachable()
+
+        func = self.define("nova_key_error", ir.VoidType(), [STR], body, inline=False)
+        func.attributes.add("cold")
+        func.attributes.add("noreturn")
+        return func
+
+    def value_error(self):
+        def body(b, f):
+            (message,) = f.args
+            b.call(self.libc("printf"), [self.cstring("ValueError: %s\n"), message])
+            b.call(self.libc("exit"), [I32(1)])
+            b.unreachable()
+
+        func = self.define("nova_value_error", ir.VoidType(), [I8P], body, inline=False)
+        func.attributes.add("cold")
+        func.attributes.add("noreturn")
+        return func
+
+    def fail_if(self, builder, cond, message):
+        with builder.if_then(cond, likely=False):
+            builder.call(self.value_error(), [self.cstring(message)])
+            builder.unreachable()
+
+    def checked_index(self, builder, length, idx):
+        """Normalize a negative index and trap when it is out of range."""
+        wrapped = builder.add(idx, length)
+        idx = builder.select(builder.icmp_signed("<", idx, I64(0)), wrapped, idx)
+
+        out_of_range = builder.icmp_unsigned(">=", idx, length)
+        with builder.if_then(out_of_range, likely=False):
+            builder.call(self.index_error(), [idx, length])
+            builder.unreachable()
+        return idx
+
+    # ----------------------------------------
+    # Vector
+    # ----------------------------------------
+    def list_new(self, kind):
+        lty = list_type(kind)
+
+        def body(b, f):
+            raw = b.call(self.libc("malloc"), [sizeof(b, lty.pointee)])
+            lst = b.bitcast(raw, lty)
+            b.store(I64(0), self.field(b, lst, LIST_LEN))
+            b.store(I64(0), self.field(b, lst, LIST_CAP))
+            b.store(ir.Constant(ELEMENT_TYPES[kind].as_pointer(), None),
+                    self.field(b, lst, LIST_DATA))
+            b.ret(lst)
+
+        return self.define(f"nova_list_new_{kind}", lty, [], body)
+
+    def list_grow(self, kind):
+        """Out-of-line slow path: grow capacity to max(2*cap, need, MIN_CAPACITY)."""
+        lty = list_type(kind)
+        elem_ptr = ELEMENT_TYPES[kind].as_pointer()
+
+        def body(b, f):
+            lst, need = f.args
+            cap = b.load(self.field(b, lst, LIST_CAP))
+            new_cap = b.mul(cap, I64(2))
+            new_cap = b.select(b.icmp_signed("<", new_cap, I64(MIN_CAPACITY)), I64(MIN_CAPACITY), new_cap)
+            new_cap = b.select(b.icmp_signed("<", new_cap, need), need, new_cap)
+
+            data_ptr = self.field(b, lst, LIST_DATA)
+            old = b.bitcast(b.load(data_ptr), I8P)
+            nbytes = b.mul(new_cap, sizeof(b, ELEMENT_TYPES[kind]))
+            new = b.call(self.libc("realloc"), [old, nbytes])
+
+            b.store(b.bitcast(new, elem_ptr), data_ptr)
+            b.store(new_cap, self.field(b, lst, LIST_CAP))
+            b.ret_void()
+
+        func = self.define(f"nova_list_grow_{kind}", ir.VoidType(), [lty, I64], body, inline=False)
+        func.attributes.add("cold")
+        return func
+
+    def list_append(self, kind):
+        lty = list_type(kind)
+
+        def body(b, f):
+            lst, value = f.args
+            len_ptr = self.field(b, lst, LIST_LEN)
+            length = b.load(len_ptr)
+            cap = b.load(self.field(b, lst, LIST_CAP))
+            with b.if_then(b.icmp_signed("==", length, cap), likely=False):
+                b.call(self.list_grow(kind), [lst, b.add(length, I64(1))])
+
+            data = b.load(self.field(b, lst, LIST_DATA))
+            b.store(value, b.gep(data, [length], inbounds=True))
+            b.store(b.add(length, I64(1)), len_ptr)
+            b.ret_void()
+
+        return self.define(f"nova_list_append_{kind}", ir.VoidType(),
+                           [lty, ELEMENT_TYPES[kind]], body)
+
+    def list_get(self, kind):
+        lty = list_type(kind)
+
+        def body(b, f):
+            lst, idx = f.args
+            idx = self.checked_index(b, self.list_len(b, lst), idx)
+            data = b.load(self.field(b, lst, LIST_DATA))
+            b.ret(b.load(b.gep(data, [idx], inbounds=True)))
+
+        return self.define(f"nova_list_get_{kind}", ELEMENT_TYPES[kind], [lty, I64], body)
+
+    def list_set(self, kind):
+        lty = list_type(kind)
+
+        def body(b, f):
+            lst, idx, value = f.args
+            idx = self.checked_index(b, self.list_len(b, lst), idx)
+            data = b.load(self.field(b, lst, LIST_DATA))
+            b.store(value, b.gep(data, [idx], inbounds=True))
+            b.ret_void()
+
+        return self.define(f"nova_list_set_{kind}", ir.VoidType(),
+                           [lty, I64, ELEMENT_TYPES[kind]], body)
+
+    def list_len(self, builder, lst):
+        """LIST_LEN is a plain field load, no call."""
+        return builder.load(self.field(builder, lst, LIST_LEN))
+
+    def bytes_new(self):
+        """bytes_buffer of size zero bytes (len = cap = size)."""
+        lty = list_type("byte")
+
+        def body(b, f):
+            (size,) = f.args
+            self.fail_if(b, b.icmp_signed("<", size, I64(0)), "negative bytes_buffer size")
+            raw = b.call(self.libc("malloc"), [sizeof(b, lty.pointee)])
+            buf = b.bitcast(raw, lty)
+            b.store(size, self.field(b, buf, LIST_LEN))
+            b.store(size, self.field(b, buf, LIST_CAP))
+            b.store(b.call(self.libc("calloc"), [size, I64(1)]), self.field(b, buf, LIST_DATA))
+            b.ret(buf)
+
+        return self.define("nova_bytes_new", lty, [I64], body)
+
+    # ----------------------------------------
+    # Bulk numeric list operations
+    # ----------------------------------------
+    def arith(self, builder, kind, op, lhs, rhs):
+        """add/mul for int lanes, fadd/fmul for float lanes (scalars or vectors)."""
+        return getattr(builder, op if kind == "int" else "f" + op)(lhs, rhs)
+
+    def less(self, builder, kind, lhs, rhs):
+        if kind == "int":
+            return builder.icmp_signed("<", lhs, rhs)
+        return builder.fcmp_ordered("<", lhs, rhs)
+
+    def broadcast(self, builder, kind, value):
+        vty = vector_type(kind)
+        vec = builder.insert_element(ir.Constant(vty, None), value, I32(0))
+        return builder.shuffle_vector(vec, ir.Constant(vty, None),
+                                      ir.Constant(ir.VectorType(I32, vty.count), None))
+
+    def vector_ptr(self, builder, data, i, kind):
+        """(align, <N x T>*) for data[i .. i + N)."""
+        vty = vector_type(kind)
+        ptr = builder.bitcast(builder.gep(data, [i], inbounds=True), vty.as_pointer())
+        return VECTOR_BITS // 8 // vty.count, ptr
+
+    def load_vector(self, builder, data, i, kind):
+        align, ptr = self.vector_ptr(builder, data, i, kind)
+        return builder.load(ptr, align=align)
+
+    def store_vector(self, builder, value, data, i, kind):
+        align, ptr = self.vector_ptr(builder, data, i, kind)
+        builder.store(value, ptr, align=align)
+
+    def horizontal(self, builder, vec, combine):
+        """Fold the lanes of vec with combine(builder, a, b)."""
+        acc = builder.extract_element(vec, I32(0))
+        for lane in range(1, vec.type.count):
+            acc = combine(builder, acc, builder.extract_element(vec, I32(lane)))
+        return acc
+
+    def list_reduce(self, kind, name, args, init, step, combine):
+        """
+        Shared shape of sum/dot/min/max:
+            init(b, data)                -> starting scalar
+            step(b, datas, i, vector)    -> contribution of lane block / element i
+            combine(b, acc, value)       -> folded accumulator
+        """
+        elem = ELEMENT_TYPES[kind]
+        lanes = VECTOR_LANES[kind]
+
+        def body(b, f):
+            # Allocas stay in the entry block so they are promoted to registers
+            accs = [b.alloca(vector_type(kind)) for _ in range(VECTOR_UNROLL)]
+            total = b.alloca(elem)
+
+            n = self.list_len(b, f.args[0])
+            if len(f.args) > 1:
+                self.fail_if(b, b.icmp_signed("!=", n, self.list_len(b, f.args[1])),
+                             f"{name}() of lists with different lengths")
+            datas = [self.load_field(b, lst, LIST_DATA) for lst in f.args]
+            start = init(b, n, datas)
+
+            # Vector body: VECTOR_UNROLL independent accumulators
+            for acc in accs:
+                b.store(self.broadcast(b, kind, start), acc)
+
+            def vector_step(b, i):
+                for u, acc in enumerate(accs):
+                    value = step(b, datas, b.add(i, I64(u * lanes)), True)
+                    b.store(combine(b, b.load(acc), value), acc)
+
+            tail = self.strided_loop(b, n, lanes * VECTOR_UNROLL, vector_step)
+
+            vec = b.load(accs[0])
+            for acc in accs[1:]:
+                vec = combine(b, vec, b.load(acc))
+
+            # Scalar epilogue over the remaining < lanes * VECTOR_UNROLL elements
+            b.store(self.horizontal(b, vec, combine), total)
+
+            def scalar_step(b, i):
+                b.store(combine(b, b.load(total), step(b, datas, i, False)), total)
+
+            self.counted_loop(b, n, scalar_step, start=tail)
+            b.ret(b.load(total))
+
+        return self.define(f"nova_list_{name}_{kind}", elem, args, body, inline=None)
+
+    def element(self, builder, data, i, kind, vector):
+        if vector:
+            return self.load_vector(builder, data, i, kind)
+        return builder.load(builder.gep(data, [i], inbounds=True))
+
+    def list_sum(self, kind):
+        zero = ir.Constant(ELEMENT_TYPES[kind], 0)
+        return self.list_reduce(
+            kind, "sum", [list_type(kind)],
+            init=lambda b, n, datas: zero,
+            step=lambda b, datas, i, vec: self.element(b, datas[0], i, kind, vec),
+            combine=lambda b, acc, value: self.arith(b, kind, "add", acc, value),
+        )
+
+    def list_dot(self, kind):
+        def step(b, datas, i, vec):
+            lhs = self.element(b, datas[0], i, kind, vec)
+            rhs = self.element(b, datas[1], i, kind, vec)
+            return self.arith(b, kind, "mul", lhs, rhs)
+
+        zero = ir.Constant(ELEMENT_TYPES[kind], 0)
+        return self.list_reduce(
+            kind, "dot", [list_type(kind), list_type(kind)],
+            init=lambda b, n, datas: zero,
+            step=step,
+            combine=lambda b, acc, value: self.arith(b, kind, "add", acc, value),
+        )
+
+    def list_extreme(self, kind, name):
+        def init(b, n, datas):
+            self.fail_if(b, b.icmp_signed("==", n, I64(0)), f"{name}() of empty list")
+            return b.load(datas[0])
+
+        def combine(b, acc, value):
+            # min keeps acc unless value < acc; max keeps acc unless acc < value
+            if name == "min":
+                replace = self.less(b, kind, value, acc)
+            else:
+                replace = self.less(b, kind, acc, value)
+            return b.select(replace, value, acc)
+
+        return self.list_reduce(
+            kind, name, [list_type(kind)],
+            init=init,
+            step=lambda b, datas, i, vec: self.element(b, datas[0], i, kind, vec),
+            combine=combine,
+        )
+
+    def list_min(self, kind):
+        return self.list_extreme(kind, "min")
+
+    def list_max(self, kind):
+        return self.list_extreme(kind, "max")
+
+    def list_map(self, kind, name, args, apply):
+        """
+        New list with out[i] = apply(b, kind, operands, i, vector), where
+        operands are the data pointers of list arguments and the remaining
+        scalar arguments (broadcast for the vector body).
+        """
+        lty = list_type(kind)
+        lanes = VECTOR_LANES[kind]
+
+        def body(b, f):
+            n = self.list_len(b, f.args[0])
+            lists = [a for a in f.args if a.type == lty]
+            if len(lists) > 1:
+                self.fail_if(b, b.icmp_signed("!=", n, self.list_len(b, lists[1])),
+                             f"{name}() of lists with different lengths")
+
+            out = b.call(self.list_new(kind), [])
+            with b.if_then(b.icmp_signed(">", n, I64(0))):
+                b.call(self.list_grow(kind), [out, n])
+            b.store(n, self.field(b, out, LIST_LEN))
+            out_data = self.load_field(b, out, LIST_DATA)
+
+            # Lists are read through their data pointers; scalars are
+            # broadcast once for the vector body
+            scalars = [self.load_field(b, a, LIST_DATA) if a.type == lty else a for a in f.args]
+            vectors = [s if a.type == lty else self.broadcast(b, kind, s)
+                       for a, s in zip(f.args, scalars)]
+
+            def vector_step(b, i):
+                for u in range(VECTOR_UNROLL):
+                    j = b.add(i, I64(u * lanes))
+                    self.store_vector(b, apply(b, vectors, j, True), out_data, j, kind)
+
+            tail = self.strided_loop(b, n, lanes * VECTOR_UNROLL, vector_step)
+
+            def scalar_step(b, i):
+                b.store(apply(b, scalars, i, False), b.gep(out_data, [i], inbounds=True))
+
+            self.counted_loop(b, n, scalar_step, start=tail)
+            b.ret(out)
+
+        return self.define(f"nova_list_{name}_{kind}", lty, args, body, inline=None)
+
+    def list_scale(self, kind):
+        lty = list_type(kind)
+
+        def apply(b, operands, i, vec):
+            data, factor = operands
+            return self.arith(b, kind, "mul", self.element(b, data, i, kind, vec), factor)
+
+        return self.list_map(kind, "scale", [lty, ELEMENT_TYPES[kind]], apply)
+
+    def list_add(self, kind):
+        lty = list_type(kind)
+
+        def apply(b, operands, i, vec):
+            lhs, rhs = operands
+            return self.arith(b, kind, "add", self.element(b, lhs, i, kind, vec),
+                              self.element(b, rhs, i, kind, vec))
+
+        return self.list_map(kind, "add", [lty, lty], apply)
+
+    # ----------------------------------------
+    # Iterator cursors
+    # ----------------------------------------
+    def iter_init(self, builder, cursor, lst):
+        builder.store(lst, self.field(builder, cursor, ITER_LIST))
+        builder.store(I64(0), self.field(builder, cursor, ITER_INDEX))
+
+    def iter_has_next(self, kind):
+        ity = iter_struct(kind).as_pointer()
+
+        def body(b, f):
+            (cursor,) = f.args
+            lst = b.load(self.field(b, cursor, ITER_LIST))
+            idx = b.load(self.field(b, cursor, ITER_INDEX))
+            b.ret(b.icmp_signed("<", idx, self.list_len(b, lst)))
+
+        return self.define(f"nova_iter_has_next_{kind}", I1, [ity], body)
+
+    def iter_next(self, kind):
+        ity = iter_struct(kind).as_pointer()
+
+        def body(b, f):
+            (cursor,) = f.args
+            lst = b.load(self.field(b, cursor, ITER_LIST))
+            idx_ptr = self.field(b, cursor, ITER_INDEX)
+            idx = b.load(idx_ptr)
+            data = b.load(self.field(b, lst, LIST_DATA))
+            value = b.load(b.gep(data, [idx], inbounds=True))
+            b.store(b.add(idx, I64(1)), idx_ptr)
+            b.ret(value)
+
+        return self.define(f"nova_iter_next_{kind}", ELEMENT_TYPES[kind], [ity], body)
+
+    # ----------------------------------------
+    # Strings
+    # ----------------------------------------
+    def str_len(self, builder, s):
+        """STR_LEN is a plain field load, no call."""
+        return self.load_field(builder, s, STR_LEN)
+
+    def str_len_i32(self, builder, s):
+        return builder.trunc(self.str_len(builder, s), I32)
+
+    def str_data(self, builder, s):
+        return self.load_field(builder, s, STR_DATA)
+
+    def str_new(self, builder, length, data, buf):
+        s = builder.bitcast(builder.call(self.libc("malloc"), [sizeof(builder, STR.pointee)]), STR)
+        builder.store(length, self.field(builder, s, STR_LEN))
+        builder.store(I64(0), self.field(builder, s, STR_HASH))
+        builder.store(data, self.field(builder, s, STR_DATA))
+        builder.store(buf, self.field(builder, s, STR_BUF))
+        return s
+
+    def str_hash_compute(self):
+        """FNV-1a over the string bytes; caches the result in the header."""
+        def body(b, f):
+            (s,) = f.args
+            data = self.load_field(b, s, STR_DATA)
+            acc = b.alloca(I64)
+            b.store(I64(signed64(FNV_OFFSET)), acc)
+
+            def mix(b, i):
+                c = b.zext(b.load(b.gep(data, [i], inbounds=True)), I64)
+                b.store(b.mul(b.xor(b.load(acc), c), I64(FNV_PRIME)), acc)
+
+            self.counted_loop(b, self.str_len(b, s), mix)
+            h = b.load(acc)
+            h = b.select(b.icmp_unsigned("==", h, I64(0)), I64(1), h)
+            b.store(h, self.field(b, s, STR_HASH))
+            b.ret(h)
+
+        return self.define("nova_str_hash_compute", I64, [STR], body, inline=False)
+
+    def str_hash(self):
+        def body(b, f):
+            (s,) = f.args
+            cached = self.load_field(b, s, STR_HASH)
+            entry = b.block
+            compute_bb = f.append_basic_block("compute")
+            done_bb = f.append_basic_block("done")
+            b.cbranch(b.icmp_unsigned("==", cached, I64(0)), compute_bb, done_bb)
+
+            b.position_at_end(compute_bb)
+            computed = b.call(self.str_hash_compute(), [s])
+            b.branch(done_bb)
+
+            b.position_at_end(done_bb)
+            h = b.phi(I64)
+            h.add_incoming(cached, entry)
+            h.add_incoming(computed, compute_bb)
+            b.ret(h)
+
+        return self.define("nova_str_hash", I64, [STR], body)
+
+    def str_eq(self):
+        def body(b, f):
+            lhs, rhs = f.args
+            with b.if_then(b.icmp_unsigned("==", lhs, rhs)):
+                b.ret(I1(1))
+
+            length = self.str_len(b, lhs)
+            with b.if_then(b.icmp_unsigned("!=", length, self.str_len(b, rhs))):
+                b.ret(I1(0))
+
+            # Two cached hashes that differ settle it without touching bytes
+            h1 = self.load_field(b, lhs, STR_HASH)
+            h2 = self.load_field(b, rhs, STR_HASH)
+            both = b.and_(b.icmp_unsigned("!=", h1, I64(0)), b.icmp_unsigned("!=", h2, I64(0)))
+            with b.if_then(b.and_(both, b.icmp_unsigned("!=", h1, h2))):
+                b.ret(I1(0))
+
+            diff = b.call(self.libc("memcmp"), [
+                self.load_field(b, lhs, STR_DATA), self.load_field(b, rhs, STR_DATA), length,
+            ])
+            b.ret(b.icmp_signed("==", diff, I32(0)))
+
+        return self.define("nova_str_eq", I1, [STR, STR], body)
+
+    def str_concat(self):
+        def body(b, f):
+            lhs, rhs = f.args
+            a_len = self.str_len(b, lhs)
+            b_len = self.str_len(b, rhs)
+            with b.if_then(b.icmp_unsigned("==", b_len, I64(0))):
+                b.ret(lhs)
+            with b.if_then(b.icmp_unsigned("==", a_len, I64(0))):
+                b.ret(rhs)
+
+            a_data = self.load_field(b, lhs, STR_DATA)
+            b_data = self.load_field(b, rhs, STR_DATA)
+            total = b.add(a_len, b_len)
+            buf = self.load_field(b, lhs, STR_BUF)
+
+            # Fast path: lhs ends at the tail of its buffer and the bytes fit
+            has_buf = b.icmp_unsigned("!=", buf, ir.Constant(STRBUF.as_pointer(), None))
+            with b.if_then(has_buf, likely=True):
+                used_ptr = self.field(b, buf, BUF_USED)
+                used = b.load(used_ptr)
+                bytes_ = self.load_field(b, buf, BUF_BYTES)
+                tail = b.gep(bytes_, [used], inbounds=True)
+                at_tail = b.icmp_unsigned("==", b.gep(a_data, [a_len], inbounds=True), tail)
+                room = b.icmp_unsigned(">=", b.sub(self.load_field(b, buf, BUF_CAP), used), b_len)
+                with b.if_then(b.and_(at_tail, room), likely=True):
+                    self.memcpy(b, tail, b_data, b_len)
+                    b.store(b.add(used, b_len), used_ptr)
+                    b.ret(self.str_new(b, total, a_data, buf))
+
+            # Slow path: start a fresh buffer with room to keep appending
+            cap = b.mul(total, I64(2))
+            cap = b.select(b.icmp_unsigned("<", cap, I64(STR_MIN_CAPACITY)), I64(STR_MIN_CAPACITY), cap)
+            bytes_ = b.call(self.libc("malloc"), [cap])
+            self.memcpy(b, bytes_, a_data, a_len)
+            self.memcpy(b, b.gep(bytes_, [a_len], inbounds=True), b_data, b_len)
+
+            new_buf = b.bitcast(b.call(self.libc("malloc"), [sizeof(b, STRBUF)]), STRBUF.as_pointer())
+            b.store(cap, self.field(b, new_buf, BUF_CAP))
+            b.store(total, self.field(b, new_buf, BUF_USED))
+            b.store(bytes_, self.field(b, new_buf, BUF_BYTES))
+            b.ret(self.str_new(b, total, bytes_, new_buf))
+
+        return self.define("nova_str_concat", STR, [STR, STR], body, inline=None)
+
+    def get_char_table(self):
+        """256 interned one-byte strings, so STR_GET never allocates."""
+        if self.char_table is None:
+            raw = self.byte_array(bytes(range(256)), ".nova_str_char_bytes")
+            table_ty = ir.ArrayType(STR.pointee, 256)
+            self.char_table = ir.GlobalVariable(self.module, table_ty, name=".nova_str_chars")
+            self.char_table.linkage = "internal"
+            self.char_table.global_constant = True
+            self.char_table.initializer = ir.Constant(table_ty, [
+                self.str_constant(bytes([c]), raw.gep([I32(0), I32(c)]))
+                for c in range(256)
+            ])
+        return self.char_table
+
+    def str_get(self):
+        def body(b, f):
+            s, idx = f.args
+            idx = self.checked_index(b, self.str_len(b, s), idx)
+            byte = b.load(b.gep(self.load_field(b, s, STR_DATA), [idx], inbounds=True))
+            b.ret(b.gep(self.get_char_table(), [I32(0), b.zext(byte, I64)], inbounds=True))
+
+        return self.define("nova_str_get", STR, [STR, I64], body)
+
+    # ----------------------------------------
+    # Hash map
+    # ----------------------------------------
+    def map_new(self, kind):
+        mty = map_type(kind)
+
+        def body(b, f):
+            m = b.bitcast(b.call(self.libc("malloc"), [sizeof(b, mty.pointee)]), mty)
+            ctrl = b.call(self.libc("malloc"), [I64(MAP_MIN_SLOTS)])
+            self.memset(b, ctrl, CTRL_EMPTY, I64(MAP_MIN_SLOTS))
+            slots = b.call(self.libc("malloc"), [I64(MAP_MIN_SLOTS * 4)])
+
+            b.store(I64(0), self.field(b, m, MAP_LEN))
+            b.store(I64(MAP_MIN_SLOTS - 1), self.field(b, m, MAP_MASK))
+            b.store(ctrl, self.field(b, m, MAP_CTRL))
+            b.store(b.bitcast(slots, I32.as_pointer()), self.field(b, m, MAP_SLOTS))
+            b.store(ir.Constant(entry_struct(kind).as_pointer(), None), self.field(b, m, MAP_ENTRIES))
+            b.store(I64(0), self.field(b, m, MAP_ENTRY_CAP))
+            b.ret(m)
+
+        return self.define(f"nova_map_new_{kind}", mty, [], body)
+
+    def map_find(self, kind):
+        """Probe for key; returns its entry index or -1. Inlined at every lookup."""
+        def body(b, f):
+            m, key, hash_ = f.args
+            mask = self.load_field(b, m, MAP_MASK)
+            ctrl = self.load_field(b, m, MAP_CTRL)
+            slots = self.load_field(b, m, MAP_SLOTS)
+            entries = self.load_field(b, m, MAP_ENTRIES)
+
+            tag = self.splat(b, b.trunc(b.and_(hash_, I64(0x7F)), I8))
+            empty = ir.Constant(V16I8, [CTRL_EMPTY] * GROUP_WIDTH)
+            start = b.and_(b.lshr(hash_, I64(7)), b.and_(mask, I64(-GROUP_WIDTH)))
+
+            entry = b.block
+            group_bb = f.append_basic_block("group")
+            match_bb = f.append_basic_block("match")
+            check_bb = f.append_basic_block("check")
+            key_bb = f.append_basic_block("check.key")
+            found_bb = f.append_basic_block("found")
+            next_match_bb = f.append_basic_block("match.next")
+            no_match_bb = f.append_basic_block("group.done")
+            next_group_bb = f.append_basic_block("group.next")
+            missing_bb = f.append_basic_block("missing")
+            b.branch(group_bb)
+
+            # One vector compare per group of 16 control bytes
+            b.position_at_end(group_bb)
+            pos = b.phi(I64)
+            stride = b.phi(I64)
+            pos.add_incoming(start, entry)
+            stride.add_incoming(I64(0), entry)
+            group = self.load_group(b, ctrl, pos)
+            first = self.group_mask(b, group, tag)
+            b.branch(match_bb)
+
+            b.position_at_end(match_bb)
+            bits = b.phi(I32)
+            bits.add_incoming(first, group_bb)
+            b.cbranch(b.icmp_unsigned("!=", bits, I32(0)), check_bb, no_match_bb)
+
+            # Candidate slot: compare cached hash, then key bytes
+            b.position_at_end(check_bb)
+            slot = b.add(pos, self.lowest_bit(b, bits))
+            index = b.zext(b.load(b.gep(slots, [slot], inbounds=True)), I64)
+            item = b.gep(entries, [index], inbounds=True)
+            same_hash = b.icmp_unsigned("==", self.load_field(b, item, ENTRY_HASH), hash_)
+            b.cbranch(same_hash, key_bb, next_match_bb)
+
+            b.position_at_end(key_bb)
+            same_key = b.call(self.str_eq(), [self.load_field(b, item, ENTRY_KEY), key])
+            b.cbranch(same_key, found_bb, next_match_bb)
+
+            b.position_at_end(found_bb)
+            b.ret(index)
+
+            b.position_at_end(next_match_bb)
+            bits.add_incoming(b.and_(bits, b.sub(bits, I32(1))), next_match_bb)
+            b.branch(match_bb)
+
+            # An empty byte in this group ends the probe sequence
+            b.position_at_end(no_match_bb)
+            has_empty = b.icmp_unsigned("!=", self.group_mask(b, group, empty), I32(0))
+            b.cbranch(has_empty, missing_bb, next_group_bb)
+
+            b.position_at_end(next_group_bb)
+            next_stride = b.add(stride, I64(GROUP_WIDTH))
+            stride.add_incoming(next_stride, next_group_bb)
+            pos.add_incoming(b.and_(b.add(pos, next_stride), mask), next_group_bb)
+            b.branch(group_bb)
+
+            b.position_at_end(missing_bb)
+            b.ret(I64(-1))
+
+        return self.define(f"nova_map_find_{kind}", I64, [map_type(kind), STR, I64], body)
+
+    def map_place(self, kind):
+        """Claim the first empty slot on hash's probe sequence for entry index."""
+        def body(b, f):
+            m, hash_, index = f.args
+            mask = self.load_field(b, m, MAP_MASK)
+            ctrl = self.load_field(b, m, MAP_CTRL)
+            empty = ir.Constant(V16I8, [CTRL_EMPTY] * GROUP_WIDTH)
+            start = b.and_(b.lshr(hash_, I64(7)), b.and_(mask, I64(-GROUP_WIDTH)))
+
+            entry = b.block
+            group_bb = f.append_basic_block("group")
+            place_bb = f.append_basic_block("place")
+            next_group_bb = f.append_basic_block("group.next")
+            b.branch(group_bb)
+
+            b.position_at_end(group_bb)
+            pos = b.phi(I64)
+            stride = b.phi(I64)
+            pos.add_incoming(start, entry)
+            stride.add_incoming(I64(0), entry)
+            free = self.group_mask(b, self.load_group(b, ctrl, pos), empty)
+            b.cbranch(b.icmp_unsigned("!=", free, I32(0)), place_bb, next_group_bb)
+
+            b.position_at_end(next_group_bb)
+            next_stride = b.add(stride, I64(GROUP_WIDTH))
+            stride.add_incoming(next_stride, next_group_bb)
+            pos.add_incoming(b.and_(b.add(pos, next_stride), mask), next_group_bb)
+            b.branch(group_bb)
+
+            b.position_at_end(place_bb)
+            slot = b.add(pos, self.lowest_bit(b, free))
+            b.store(b.trunc(b.and_(hash_, I64(0x7F)), I8), b.gep(ctrl, [slot], inbounds=True))
+            slots = self.load_field(b, m, MAP_SLOTS)
+            b.store(b.trunc(index, I32), b.gep(slots, [slot], inbounds=True))
+            b.ret_void()
+
+        return self.define(f"nova_map_place_{kind}", ir.VoidType(), [map_type(kind), I64, I64], body)
+
+    def map_resize(self, kind):
+        """Slow path: double the slot table and re-place entries by cached hash."""
+        def body(b, f):
+            (m,) = f.args
+            nslots = b.mul(b.add(self.load_field(b, m, MAP_MASK), I64(1)), I64(2))
+
+            ctrl_ptr = self.field(b, m, MAP_CTRL)
+            slots_ptr = self.field(b, m, MAP_SLOTS)
+            b.call(self.libc("free"), [b.load(ctrl_ptr)])
+            b.call(self.libc("free"), [b.bitcast(b.load(slots_ptr), I8P)])
+
+            ctrl = b.call(self.libc("malloc"), [nslots])
+            self.memset(b, ctrl, CTRL_EMPTY, nslots)
+            slots = b.call(self.libc("malloc"), [b.mul(nslots, I64(4))])
+            b.store(ctrl, ctrl_ptr)
+            b.store(b.bitcast(slots, I32.as_pointer()), slots_ptr)
+            b.store(b.sub(nslots, I64(1)), self.field(b, m, MAP_MASK))
+
+            entries = self.load_field(b, m, MAP_ENTRIES)
+
+            def place(b, i):
+                item = b.gep(entries, [i], inbounds=True)
+                b.call(self.map_place(kind), [m, self.load_field(b, item, ENTRY_HASH), i])
+
+            self.counted_loop(b, self.load_field(b, m, MAP_LEN), place)
+            b.ret_void()
+
+        func = self.define(f"nova_map_resize_{kind}", ir.VoidType(), [map_type(kind)], body, inline=False)
+        func.attributes.add("cold")
+        return func
+
+    def map_grow_entries(self, kind):
+        def body(b, f):
+            (m,) = f.args
+            cap_ptr = self.field(b, m, MAP_ENTRY_CAP)
+            cap = b.mul(b.load(cap_ptr), I64(2))
+            cap = b.select(b.icmp_signed("<", cap, I64(MAP_MIN_ENTRIES)), I64(MAP_MIN_ENTRIES), cap)
+
+            entries_ptr = self.field(b, m, MAP_ENTRIES)
+            old = b.bitcast(b.load(entries_ptr), I8P)
+            nbytes = b.mul(cap, sizeof(b, entry_struct(kind)))
+            new = b.call(self.libc("realloc"), [old, nbytes])
+            b.store(b.bitcast(new, entry_struct(kind).as_pointer()), entries_ptr)
+            b.store(cap, cap_ptr)
+            b.ret_void()
+
+        func = self.define(f"nova_map_grow_entries_{kind}", ir.VoidType(), [map_type(kind)], body,
+                           inline=False)
+        func.attributes.add("cold")
+        return func
+
+    def map_get(self, kind):
+        def body(b, f):
+            m, key = f.args
+            index = b.call(self.map_find(kind), [m, key, b.call(self.str_hash(), [key])])
+            with b.if_then(b.icmp_signed("<", index, I64(0)), likely=False):
+                b.call(self.key_error(), [key])
+                b.unreachable()
+            item = b.gep(self.load_field(b, m, MAP_ENTRIES), [index], inbounds=True)
+            b.ret(self.load_field(b, item, ENTRY_VALUE))
+
+        return self.define(f"nova_map_get_{kind}", ELEMENT_TYPES[kind], [map_type(kind), STR], body)
+
+    def map_has(self, kind):
+        def body(b, f):
+            m, key = f.args
+            index = b.call(self.map_find(kind), [m, key, b.call(self.str_hash(), [key])])
+            b.ret(b.icmp_signed(">=", index, I64(0)))
+
+        return self.define(f"nova_map_has_{kind}", I1, [map_type(kind), STR], body)
+
+    def map_set(self, kind):
+        def body(b, f):
+            m, key, value = f.args
+            hash_ = b.call(self.str_hash(), [key])
+            index = b.call(self.map_find(kind), [m, key, hash_])
+
+            # Existing key: overwrite in place, order unchanged
+            with b.if_then(b.icmp_signed(">=", index, I64(0))):
+                item = b.gep(self.load_field(b, m, MAP_ENTRIES), [index], inbounds=True)
+                b.store(value, self.field(b, item, ENTRY_VALUE))
+                b.ret_void()
+
+            len_ptr = self.field(b, m, MAP_LEN)
+            length = b.load(len_ptr)
+            nslots = b.add(self.load_field(b, m, MAP_MASK), I64(1))
+            over = b.icmp_signed(">", b.mul(b.add(length, I64(1)), I64(MAX_LOAD_DEN)),
+                                 b.mul(nslots, I64(MAX_LOAD_NUM)))
+            with b.if_then(over, likely=False):
+                b.call(self.map_resize(kind), [m])
+
+            full = b.icmp_signed("==", length, self.load_field(b, m, MAP_ENTRY_CAP))
+            with b.if_then(full, likely=False):
+                b.call(self.map_grow_entries(kind), [m])
+
+            item = b.gep(self.load_field(b, m, MAP_ENTRIES), [length], inbounds=True)
+            b.store(hash_, self.field(b, item, ENTRY_HASH))
+            b.store(key, self.field(b, item, ENTRY_KEY))
+            b.store(value, self.field(b, item, ENTRY_VALUE))
+            b.call(self.map_place(kind), [m, hash_, length])
+            b.store(b.add(length, I64(1)), len_ptr)
+            b.ret_void()
+
+        return self.define(f"nova_map_set_{kind}", ir.VoidType(),
+                           [map_type(kind), STR, ELEMENT_TYPES[kind]], body)
+
+    def map_collect(self, kind, field_index, out_kind, name):
+        """New list of one entry field (keys or values), in insertion order."""
+        def body(b, f):
+            (m,) = f.args
+            out = b.call(self.list_new(out_kind), [])
+            length = self.load_field(b, m, MAP_LEN)
+            with b.if_then(b.icmp_signed(">", length, I64(0))):
+                b.call(self.list_grow(out_kind), [out, length])
+
+            entries = self.load_field(b, m, MAP_ENTRIES)
+
+            def push(b, i):
+                item = b.gep(entries, [i], inbounds=True)
+                b.call(self.list_append(out_kind), [out, self.load_field(b, item, field_index)])
+
+            self.counted_loop(b, length, push)
+            b.ret(out)
+
+        return self.define(f"nova_map_{name}_{kind}", list_type(out_kind), [map_type(kind)], body)
+
+    def map_keys(self, kind):
+        return self.map_collect(kind, ENTRY_KEY, "str", "keys")
+
+    def map_values(self, kind):
+        return self.map_collect(kind, ENTRY_VALUE, kind, "values")
@@ -12,8 +12,12 @@ def make_cli_scripts(output_dir):
     with open(os.path.join(output_dir, "nova"), "w") as f:
         f.write("#!/usr/bin/env python3\nfrom tools.nova import main\nmain()\n")
 
+    # novaprof
+    with open(os.path.join(output_dir, "novaprof"), "w") as f:
+        f.write("#!/usr/bin/env python3\nfrom tools.novaprof import main\nmain()\n")
+
     # executable flags
-    for name in ("novac", "nova"):
+    for name in ("novac", "nova", "novaprof"):
         path = os.path.join(output_dir, name)
         st = os.stat(path)
         os.chmod(path, st.st_mode | stat.S_IEXEC)
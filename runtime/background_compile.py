@@ -0,0 +1,242 @@
+# ============================================
+# Background compilation of non-entry modules
+# --------------------------------------------
+# The launcher links the entry module, starts main()
+# and leaves the modules it imports to a worker thread:
+#
+#   CompileWorker  compiles modules (bitcode -> native
+#                  object, in its own LLVM context) in
+#                  priority order, breadth-first along
+#                  META "imports"; a module needed before
+#                  the worker got to it is compiled by the
+#                  thread that needs it
+#   StubTable      one trampoline per imported function
+#                  whose module is not linked yet:
+#
+#       stub(args):
+#           f = slot                      # atomic load
+#           if f == null:
+#               await_module(owner)       # Python; links it, fills slot
+#               f = slot
+#           return musttail f(args)
+#
+# MCJIT resolves every symbol when an engine is finalized,
+# so the stubs are registered under the real names
+# (binding.add_symbol) before the importer is finalized.
+# A module linked later resolves to real definitions
+# already in the engine first, so only calls made from
+# modules linked before their callee pay the indirection.
+# ============================================
+
+import ctypes
+import heapq
+import itertools
+import os
+import sys
+import threading
+
+from llvmlite import binding
+
+STUB_PREFIX = "__nova_stub."
+SLOT_PREFIX = "__nova_slot."
+
+AWAIT_CALLBACK = ctypes.CFUNCTYPE(None, ctypes.c_int32)
+
+
+def import_signatures(module, symbols):
+    """
+    {symbol: (return type, [param types])} of the functions module
+    declares among symbols, as IR text. Functions a stub cannot forward
+    (varargs, named struct types) are left out.
+    """
+    signatures = {}
+    for symbol in symbols:
+        try:
+            fn = module.get_function(symbol)
+        except NameError:
+            continue
+
+        fn_type = fn.global_value_type
+        if fn_type.is_function_vararg:
+            continue
+        ret, *params = (str(t) for t in fn_type.elements)
+        if any("%" in t for t in (ret, *params)):
+            continue
+        signatures[symbol] = (ret, params)
+    return signatures
+
+
+class CompileWorker:
+    """
+    One thread running compile(path) for queued paths, by priority.
+    A path nobody has started yet is compiled by the thread waiting for
+    it. llvmlite serializes all LLVM calls behind one lock, so a waiter
+    may still sit out the module the worker is compiling at the time.
+    """
+
+    def __init__(self, compile):
+        self.compile = compile
+        self.cond = threading.Condition()
+        self.heap = []       # (sequence, path)
+        self.queued = {}     # path -> its live heap key
+        self.running = set()
+        self.results = {}    # path -> (ok, result or exception)
+        self.sequence = itertools.count()
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, name="nova-compile", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def submit(self, path):
+        """Queue path for the worker unless it is known already."""
+        with self.cond:
+            if path in self.results or path in self.running or path in self.queued:
+                return
+            key = (next(self.sequence), path)
+            self.queued[path] = key
+            heapq.heappush(self.heap, key)
+            self.cond.notify_all()
+
+    def wait(self, path):
+        """Result of compile(path); compiled right here if it has not started."""
+        with self.cond:
+            claimed = path not in self.results and path not in self.running
+            if claimed:
+                self.queued.pop(path, None)
+                self.running.add(path)
+
+        if claimed:
+            self.finish(path)
+
+        with self.cond:
+            while path not in self.results:
+                self.cond.wait()
+            ok, result = self.results[path]
+
+        if not ok:
+            raise result
+        return result
+
+    def run(self):
+        while True:
+            with self.cond:
+                while not self.heap and not self.closed:
+                    self.cond.wait()
+                if self.closed:
+                    return
+                key = heapq.heappop(self.heap)
+                path = key[1]
+                if self.queued.get(path) != key:
+                    continue  # claimed by a waiter meanwhile
+                del self.queued[path]
+                self.running.add(path)
+
+            self.finish(path)
+
+    def finish(self, path):
+        try:
+            outcome = (True, self.compile(path))
+        except BaseException as e:
+            outcome = (False, e)
+
+        with self.cond:
+            self.running.discard(path)
+            self.results[path] = outcome
+            self.cond.notify_all()
+
+    def close(self):
+        """Stop after the module being compiled, if any."""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        if self.thread.is_alive():
+            self.thread.join()
+
+
+class StubTable:
+    """
+    Trampolines for functions of modules that are not linked yet.
+    link(owner) is called on the first call of such a function from
+    inside JIT code; it must link owner and patch() its symbols.
+    """
+
+    def __init__(self, target_machine, link):
+        self.link = link
+        self.callback = AWAIT_CALLBACK(self.await_module)
+        self.callback_address = ctypes.cast(self.callback, ctypes.c_void_p).value
+
+        backing_mod = binding.parse_assembly("")
+        backing_mod.triple = target_machine.triple
+        self.engine = binding.create_mcjit_compiler(backing_mod, target_machine)
+
+        self.owners = []  # owner id -> bin path
+        self.owner_ids = {}
+        self.slots = {}   # symbol -> slot address
+
+    def __contains__(self, symbol):
+        return symbol in self.slots
+
+    def add(self, stubs):
+        """Register stubs {symbol: ((ret, params), owner path)} under their symbols."""
+        stubs = {symbol: stub for symbol, stub in stubs.items() if symbol not in self.slots}
+        if not stubs:
+            return
+
+        lines = []
+        for symbol, (signature, owner) in stubs.items():
+            if owner not in self.owner_ids:
+                self.owner_ids[owner] = len(self.owners)
+                self.owners.append(owner)
+            lines.append(self.stub_ir(symbol, signature, self.owner_ids[owner]))
+
+        mod = binding.parse_assembly("\n".join(lines))
+        self.engine.add_module(mod)
+        self.engine.finalize_object()
+
+        for symbol in stubs:
+            self.slots[symbol] = self.engine.get_global_value_address(SLOT_PREFIX + symbol)
+            binding.add_symbol(symbol, self.engine.get_function_address(STUB_PREFIX + symbol))
+
+    def stub_ir(self, symbol, signature, owner_id):
+        ret, params = signature
+        slot = f'@"{SLOT_PREFIX}{symbol}"'
+        args = ", ".join(f"{t} %a{i}" for i, t in enumerate(params))
+        call = f"musttail call {ret} %f({args})"
+        tail = "ret void" if ret == "void" else f"ret {ret} %r"
+        if ret != "void":
+            call = "%r = " + call
+
+        return f"""
+{slot} = global ptr null, align 8
+define {ret} @"{STUB_PREFIX}{symbol}"({args}) {{
+entry:
+  %linked = load atomic ptr, ptr {slot} acquire, align 8
+  %ready = icmp ne ptr %linked, null
+  br i1 %ready, label %call, label %wait
+wait:
+  call void inttoptr (i64 {self.callback_address} to ptr)(i32 {owner_id})
+  %loaded = load atomic ptr, ptr {slot} acquire, align 8
+  br label %call
+call:
+  %f = phi ptr [ %linked, %entry ], [ %loaded, %wait ]
+  {call}
+  {tail}
+}}"""
+
+    def patch(self, symbol, address):
+        """Point symbol's stub at its real definition."""
+        slot = self.slots.get(symbol)
+        if slot is not None:
+            ctypes.c_void_p.from_address(slot).value = address
+
+    def await_module(self, owner_id):
+        # Runs inside JIT code: nothing may propagate, and returning
+        # with an empty slot would jump to null
+        try:
+            self.link(self.owners[owner_id])
+        except BaseException as e:
+            print(f"[{type(e).__name__}] {e}", file=sys.stderr)
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(1)
@@ -0,0 +1,318 @@
+# ============================================
+# Nova runtime daemon (nova --daemon)
+# --------------------------------------------
+# A long-lived launcher process listening on a Unix
+# socket. llvmlite stays initialized, and every .novar
+# it has run stays linked and finalized, keyed by the
+# archive digest (see NovarArchive.digest), so a warm
+# request skips interpreter startup, archive parsing
+# and code generation entirely.
+#
+# Request (client -> daemon):
+#   u32 length, sent together with the client's
+#       stdin/stdout/stderr descriptors (SCM_RIGHTS)
+#   JSON {"version": 1, "argv": [...], "cwd": ..., "env": {...}}
+#   env holds only PATH, HOME, USER, LANG, TERM, TZ,
+#   LC_* and NOVA_* (see cli/nova.py)
+#
+# The socket lives in a directory owned by the daemon's
+# user with mode 0700; the client checks the directory,
+# the socket and the listening peer's uid before sending
+# anything.
+#
+# Each request runs in a forked worker that takes over
+# the client's descriptors, so the program reads and
+# writes the client's terminal or pipes directly and
+# starts from the pristine module state of the cache.
+# Once the worker is reaped the daemon answers with
+#   i32 exit status (128 + signal if it was killed)
+# and closes the connection. cli/nova.py is the client
+# and runs the launcher directly when nobody listens.
+#
+# Known limit: an archive the daemon has not seen yet
+# is compiled in the accept loop (the parent must hold
+# the linked Program to serve it warm later), so one
+# cold compile delays every request behind it.
+# ============================================
+
+import collections
+import ctypes
+import json
+import os
+import selectors
+import signal
+import socket
+import stat
+import struct
+import sys
+import tempfile
+import traceback
+
+from launcher import NovaLauncherError, Program, nova_globals, parse_args, settings
+from novar_archive import NovarArchive, NovarArchiveError
+from jit_cache import JITCache
+
+# Must match cli/nova.py
+PROTOCOL_VERSION = 1
+REQUEST_HEADER = struct.Struct("<I")
+EXIT_STATUS = struct.Struct("<i")
+STDIO_FDS = 3
+
+MAX_REQUEST = 1 << 20
+MAX_PROGRAMS = 16
+
+
+def default_socket_path():
+    """$NOVA_DAEMON_SOCKET, else a per-user socket in $XDG_RUNTIME_DIR or the temp dir."""
+    override = os.environ.get("NOVA_DAEMON_SOCKET")
+    if override:
+        return override
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"nova-{os.getuid()}")
+    return os.path.join(base, "nova-daemon.sock")
+
+
+class Daemon:
+    """Accepts launch requests and runs each in a forked worker."""
+
+    def __init__(self, socket_path=None, max_programs=MAX_PROGRAMS):
+        self.socket_path = socket_path or default_socket_path()
+        self.max_programs = max_programs
+        self.programs = collections.OrderedDict()  # archive digest -> Program, LRU order
+        self.workers = {}                          # pid -> connection awaiting its status
+        self.jit_cache = JITCache()
+        self.listener = None
+        self.libc = ctypes.CDLL(None)
+
+    # ----------------------------------------
+    # Event loop
+    # ----------------------------------------
+    def serve_forever(self):
+        self.listener = self.bind()
+
+        # SIGCHLD only needs to wake the selector; workers are reaped there
+        wake_r, wake_w = os.pipe()
+        os.set_blocking(wake_r, False)
+        os.set_blocking(wake_w, False)
+        signal.set_wakeup_fd(wake_w)
+        signal.signal(signal.SIGCHLD, lambda *_: None)
+        signal.signal(signal.SIGTERM, self.terminate)  # unwind, removing the socket
+
+        selector = selectors.DefaultSelector()
+        selector.register(self.listener, selectors.EVENT_READ)
+        selector.register(wake_r, selectors.EVENT_READ)
+
+        print(f"Nova daemon listening on {self.socket_path}")
+        sys.stdout.flush()
+
+        try:
+            while True:
+                for key, _ in selector.select():
+                    if key.fileobj is self.listener:
+                        self.accept()
+                    else:
+                        try:
+                            os.read(wake_r, 4096)
+                        except BlockingIOError:
+                            pass
+                        self.reap()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.set_wakeup_fd(-1)
+            selector.close()
+            self.listener.close()
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+            for program in self.programs.values():
+                program.close()
+
+    @staticmethod
+    def terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    def bind(self):
+        directory = os.path.dirname(self.socket_path) or "."
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        # Clients hand their stdio and environment to this socket: its
+        # directory must be ours alone, not one another user created first
+        st = os.lstat(directory)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+            raise NovaLauncherError(f"Refusing to listen in {directory}: "
+                                    f"it must be a directory owned by you with mode 0700")
+
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)  # stale socket of a dead daemon
+            else:
+                raise NovaLauncherError(f"A Nova daemon is already listening on {self.socket_path}")
+            finally:
+                probe.close()
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        listener.listen()
+        return listener
+
+    # ----------------------------------------
+    # Requests
+    # ----------------------------------------
+    def accept(self):
+        conn, _ = self.listener.accept()
+        try:
+            request, fds = self.receive(conn)
+        except (OSError, ValueError) as e:
+            print(f"Rejected request: {e}")
+            self.finish(conn, 1)
+            return
+
+        # A failed request (fork, or compiling a new archive) fails only its client
+        try:
+            self.dispatch(conn, request, fds)
+        except NovaLauncherError as e:
+            self.fail(conn, fds, f"[NovaLauncherError] {e}")
+        except Exception as e:
+            self.fail(conn, fds, f"[NovaDaemonError] {type(e).__name__}: {e}")
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def fail(self, conn, fds, message):
+        """Report message on the client's stderr and answer exit status 1."""
+        try:
+            os.write(fds[2], f"{message}\n".encode("utf8", "replace"))
+        except OSError:
+            pass  # the client's stderr is gone
+        self.finish(conn, 1)
+
+    def receive(self, conn):
+        """(request dict, [stdin, stdout, stderr] descriptors) of one client."""
+        header, fds, _, _ = socket.recv_fds(conn, REQUEST_HEADER.size, STDIO_FDS)
+        try:
+            if len(header) != REQUEST_HEADER.size or len(fds) != STDIO_FDS:
+                raise ValueError("malformed request header")
+
+            (size,) = REQUEST_HEADER.unpack(header)
+            if size > MAX_REQUEST:
+                raise ValueError(f"request of {size} bytes is too large")
+
+            payload = bytearray()
+            while len(payload) < size:
+                chunk = conn.recv(size - len(payload))
+                if not chunk:
+                    raise ValueError("truncated request")
+                payload += chunk
+
+            request = json.loads(payload)
+            if request.get("version") != PROTOCOL_VERSION:
+                raise ValueError(f"unsupported protocol version {request.get('version')}")
+        except BaseException:
+            for fd in fds:
+                os.close(fd)
+            raise
+
+        return request, fds
+
+    def dispatch(self, conn, request, fds):
+        options, novar_path, program_args = parse_args(request.get("argv", []))
+        if novar_path is None or options["daemon"]:
+            raise NovaLauncherError("Usage: nova [--no-jit-cache] <file.novar> [args...]")
+
+        program = self.program(os.path.join(request.get("cwd", ""), novar_path), options["jit_cache"])
+
+        # Nothing buffered may be inherited and written twice
+        sys.stdout.flush()
+        sys.stderr.flush()
+        self.libc.fflush(None)
+
+        pid = os.fork()
+        if pid == 0:
+            settings["quiet"] = options["quiet"]
+            settings["perf_map"] = options["perf_map"] or bool(request.get("env", {}).get("NOVA_PERF_MAP"))
+            settings["sample_hz"] = options["sample_hz"]
+            self.worker(program, request, program_args, fds)
+        self.workers[pid] = conn
+
+    def program(self, novar_path, use_jit_cache=True):
+        """Linked Program for novar_path, from the cache when its digest is known."""
+        try:
+            with NovarArchive(novar_path) as archive:
+                digest = archive.digest()
+        except NovarArchiveError as e:
+            raise NovaLauncherError(str(e))
+
+        program = self.programs.get(digest)
+        if program is not None:
+            self.programs.move_to_end(digest)
+            return program
+
+        program = Program(novar_path, self.jit_cache if use_jit_cache else None)
+        self.programs[digest] = program
+        if len(self.programs) > self.max_programs:
+            _, evicted = self.programs.popitem(last=False)
+            evicted.close()
+        return program
+
+    # ----------------------------------------
+    # Workers
+    # ----------------------------------------
+    def worker(self, program, request, program_args, fds):
+        """Forked child: become the client's process and run main(); never returns."""
+        status = 1
+        try:
+            signal.set_wakeup_fd(-1)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            self.listener.close()
+
+            for target, fd in enumerate(fds):
+                os.dup2(fd, target)
+            os.chdir(request.get("cwd") or ".")
+            os.environ.clear()
+            os.environ.update(request.get("env", {}))
+
+            nova_globals["sys_args"] = program_args
+            status = program.run()
+        except NovaLauncherError as e:
+            print(f"[NovaLauncherError] {e}")
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                self.libc.fflush(None)
+            finally:
+                os._exit(status & 0xFF)
+
+    def reap(self):
+        """Send the exit status of every finished worker to its client."""
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            conn = self.workers.pop(pid, None)
+            if conn is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if code < 0:
+                code = 128 - code  # killed by a signal, reported like a shell does
+            self.finish(conn, code)
+
+    def finish(self, conn, code):
+        try:
+            conn.sendall(EXIT_STATUS.pack(code))
+        except OSError:
+            pass  # the client went away
+        finally:
+            conn.close()
@@ -0,0 +1,143 @@
+# ============================================
+# Persistent MCJIT object cache
+# --------------------------------------------
+# Modules JIT-compiled from bitcode (no usable
+# precompiled object in the .nomc) are cached as
+# native objects in a per-user directory:
+#
+#   $NOVA_CACHE_DIR, else
+#   $XDG_CACHE_HOME/nova/jit, ~/.cache/nova/jit,
+#   %LOCALAPPDATA%\nova\jit on Windows
+#
+# Entries are keyed by the module content hash, the
+# target triple, the host CPU and features and the LLVM
+# version, so a warm launch of an unchanged app skips
+# code generation. Files are touched on every hit and
+# the least recently used ones are evicted once the
+# directory grows past its size bound.
+# ============================================
+
+import hashlib
+import os
+import tempfile
+
+from llvmlite import binding
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+ENTRY_SUFFIX = ".o"
+
+
+def default_cache_dir():
+    override = os.environ.get("NOVA_CACHE_DIR")
+    if override:
+        return override
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "nova", "jit")
+
+
+class JITCache:
+    """Object cache shared by every engine of one launcher process."""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.keys = {}  # id(ModuleRef) -> cache key
+        self.hits = 0
+        self.misses = 0
+
+        # Everything except the module itself that changes the machine code
+        self.target_id = "|".join([
+            binding.get_default_triple(),
+            binding.get_host_cpu_name(),
+            binding.get_host_cpu_features().flatten(),
+            ".".join(map(str, binding.llvm_version_info)),
+        ])
+
+    # ----------------------------------------
+    # Keys
+    # ----------------------------------------
+    def key(self, content_hash):
+        return hashlib.sha256(f"{content_hash}|{self.target_id}".encode("utf8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    # ----------------------------------------
+    # MCJIT hooks
+    # ----------------------------------------
+    def attach(self, engine, module, content_hash):
+        """Serve module's object from the cache; call before finalize_object()."""
+        self.keys[id(module)] = self.key(content_hash)
+        engine.set_object_cache(self.notify, self.getbuffer)
+
+    def getbuffer(self, module):
+        key = self.keys.get(id(module))
+        if key is None:
+            return None
+        return self.read(key)
+
+    def notify(self, module, obj):
+        key = self.keys.get(id(module))
+        if key is not None:
+            self.write(key, obj)
+
+    # ----------------------------------------
+    # Direct access (objects compiled outside MCJIT)
+    # ----------------------------------------
+    def load(self, content_hash):
+        """Cached object for content_hash, or None."""
+        return self.read(self.key(content_hash))
+
+    def store(self, content_hash, obj):
+        self.write(self.key(content_hash), obj)
+
+    def read(self, key):
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # LRU: mark as recently used
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data
+
+    def write(self, key, obj):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write then rename so concurrent launches never read half a file
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(obj)
+            os.replace(tmp, self.path(key))
+            self.evict()
+        except OSError:
+            pass  # the cache is best effort; never fail a launch over it
+
+    # ----------------------------------------
+    # Size bound
+    # ----------------------------------------
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
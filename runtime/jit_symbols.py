@@ -0,0 +1,196 @@
+# ============================================
+# JIT symbols for profilers (nova --perf-map / --sample)
+# --------------------------------------------
+# Every .nomc lists its functions in META "functions"
+# (Nova name, global symbol, source span). Once the
+# engine is finalized their addresses are known, so the
+# launcher can:
+#
+#   - append them to /tmp/perf-<pid>.map, the plain-text
+#     JIT symbol map Linux perf reads ("START SIZE name",
+#     hex), so perf report / flame graphs show Nova names
+#   - sample the running program itself: a SIGPROF handler
+#     JIT-compiled here records the interrupted program
+#     counter into a fixed buffer (async-signal-safe, no
+#     Python involved), and the samples are grouped by
+#     Nova function when main() returns
+#
+# Sizes are the distance to the next known function; the
+# last one gets TAIL_SIZE.
+# ============================================
+
+import bisect
+import collections
+import ctypes
+import os
+import platform
+import signal
+import sys
+
+from llvmlite import ir, binding
+
+PERF_MAP_DIR = "/tmp"
+TAIL_SIZE = 4096
+MAX_FUNCTION_SIZE = 1 << 20
+
+DEFAULT_SAMPLE_HZ = 997  # prime, so sampling does not lock step with periodic work
+SAMPLE_CAPACITY = 1 << 16
+REPORT_LIMIT = 25
+
+# Offset of the interrupted program counter inside the ucontext_t
+# passed to SA_SIGINFO handlers (glibc layouts)
+PC_OFFSETS = {
+    ("Linux", "x86_64"): 40 + 16 * 8,       # uc_mcontext.gregs[REG_RIP]
+    ("Linux", "aarch64"): 176 + 8 + 31 * 8 + 8,  # uc_mcontext.pc
+}
+
+SA_SIGINFO = 0x4
+SA_RESTART = 0x10000000
+
+
+class SamplingError(Exception):
+    """Sampling is not available on this platform."""
+    pass
+
+
+def function_label(module, record):
+    label = f"{module}.{record['name']}"
+    span = record.get("span")
+    if span:
+        label += f" ({module}.nova:{span[0]})"
+    return label
+
+
+class FunctionTable:
+    """Address ranges of the Nova functions linked into one engine."""
+
+    def __init__(self, engine, metas):
+        found = []
+        for meta in metas:
+            module = meta.get("module", "<unknown>")
+            for record in meta.get("functions", []):
+                address = engine.get_function_address(record["symbol"])
+                if address:
+                    found.append((address, function_label(module, record)))
+        found.sort()
+
+        # Modules linked into one engine may share a code section,
+        # so the next function can belong to any of them
+        self.entries = []  # (start, size, label), sorted by start
+        for i, (address, label) in enumerate(found):
+            size = TAIL_SIZE
+            if i + 1 < len(found) and found[i + 1][0] - address <= MAX_FUNCTION_SIZE:
+                size = found[i + 1][0] - address
+            self.entries.append((address, size, label))
+
+        self.starts = [start for start, _, _ in self.entries]
+
+    def lookup(self, address):
+        """Label of the function containing address, or None."""
+        i = bisect.bisect_right(self.starts, address) - 1
+        if i < 0:
+            return None
+        start, size, label = self.entries[i]
+        return label if address < start + size else None
+
+    def write_perf_map(self, path=None):
+        """Append the table to perf's JIT map (default /tmp/perf-<pid>.map)."""
+        path = path or os.path.join(PERF_MAP_DIR, f"perf-{os.getpid()}.map")
+        with open(path, "a", encoding="utf-8") as f:
+            for start, size, label in self.entries:
+                f.write(f"{start:x} {size:x} {label}\n")
+        return path
+
+
+# ============================================
+# Sampling
+# ============================================
+
+class _SigAction(ctypes.Structure):
+    # struct sigaction on glibc (x86-64, aarch64)
+    _fields_ = [
+        ("sa_sigaction", ctypes.c_void_p),
+        ("sa_mask", ctypes.c_ulong * (128 // ctypes.sizeof(ctypes.c_ulong))),
+        ("sa_flags", ctypes.c_int),
+        ("sa_restorer", ctypes.c_void_p),
+    ]
+
+
+def sampler_module(pc_offset, capacity):
+    """
+    void nova_sample(int sig, siginfo_t *info, ucontext_t *uc):
+        i = atomic nova_sample_count++
+        if i < capacity: nova_samples[i] = pc of uc
+    """
+    i8p = ir.IntType(8).as_pointer()
+    i32 = ir.IntType(32)
+    i64 = ir.IntType(64)
+
+    module = ir.Module(name="nova_sampler")
+    samples = ir.GlobalVariable(module, ir.ArrayType(i64, capacity), "nova_samples")
+    samples.initializer = ir.Constant(samples.value_type, None)
+    count = ir.GlobalVariable(module, i64, "nova_sample_count")
+    count.initializer = ir.Constant(i64, 0)
+
+    handler = ir.Function(module, ir.FunctionType(ir.VoidType(), [i32, i8p, i8p]), name="nova_sample")
+    builder = ir.IRBuilder(handler.append_basic_block("entry"))
+    index = builder.atomic_rmw("add", count, ir.Constant(i64, 1), "monotonic")
+    with builder.if_then(builder.icmp_unsigned("<", index, ir.Constant(i64, capacity))):
+        pc_ptr = builder.gep(handler.args[2], [ir.Constant(i64, pc_offset)])
+        pc = builder.load(builder.bitcast(pc_ptr, i64.as_pointer()))
+        builder.store(pc, builder.gep(samples, [ir.Constant(i32, 0), index]))
+    builder.ret_void()
+    return module
+
+
+class Sampler:
+    """SIGPROF sampler of the program counter (CPU time, all threads)."""
+
+    def __init__(self, hz=DEFAULT_SAMPLE_HZ, capacity=SAMPLE_CAPACITY):
+        pc_offset = PC_OFFSETS.get((platform.system(), platform.machine()))
+        if pc_offset is None:
+            raise SamplingError(f"Sampling is not supported on {platform.system()} {platform.machine()}")
+
+        self.hz = hz
+        self.capacity = capacity
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.previous = _SigAction()
+
+        mod = binding.parse_assembly(str(sampler_module(pc_offset, capacity)))
+        mod.verify()
+        target = binding.Target.from_default_triple()
+        self.engine = binding.create_mcjit_compiler(mod, target.create_target_machine())
+        self.engine.finalize_object()
+
+        self.handler = self.engine.get_function_address("nova_sample")
+        self.count = ctypes.c_uint64.from_address(self.engine.get_global_value_address("nova_sample_count"))
+        self.samples = (ctypes.c_uint64 * capacity).from_address(
+            self.engine.get_global_value_address("nova_samples"))
+
+    def start(self):
+        action = _SigAction()
+        action.sa_sigaction = self.handler
+        action.sa_flags = SA_SIGINFO | SA_RESTART
+        if self.libc.sigaction(signal.SIGPROF, ctypes.byref(action), ctypes.byref(self.previous)) != 0:
+            raise SamplingError(f"sigaction failed: {os.strerror(ctypes.get_errno())}")
+
+        interval = 1.0 / self.hz
+        signal.setitimer(signal.ITIMER_PROF, interval, interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        self.libc.sigaction(signal.SIGPROF, ctypes.byref(self.previous), None)
+
+    def report(self, table, out=None, limit=REPORT_LIMIT):
+        """Print samples per Nova function, most sampled first."""
+        out = out or sys.stderr
+        taken = self.count.value
+        recorded = min(taken, self.capacity)
+
+        counts = collections.Counter(
+            table.lookup(self.samples[i]) or "<outside Nova code>" for i in range(recorded))
+
+        print(f"Samples: {recorded} at {self.hz} Hz"
+              + (f" ({taken - recorded} dropped, buffer full)" if taken > recorded else ""), file=out)
+        for label, n in counts.most_common(limit):
+            print(f"  {n:>8}  {100.0 * n / recorded:6.2f}%  {label}", file=out)
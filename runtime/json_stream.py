@@ -0,0 +1,166 @@
+# ============================================
+# Streaming JSON (std/json.dump_to, loads_iter)
+# --------------------------------------------
+# dump_to(obj, stream) encodes with the C-accelerated
+# encoder of the json module, BATCH top-level elements
+# at a time, into a buffer handed to the stream every
+# FLUSH_CHARS: memory is bounded by a batch instead of
+# the whole document.
+#
+# loads_iter(source) decodes a stream of concatenated
+# or newline-delimited values (JSON Lines logs) and
+# yields each top-level value once it is complete. The
+# pending text is parsed with raw_decode, one linear
+# pass per value. A value cut by a chunk boundary is
+# parsed again only after the pending text has doubled,
+# so one huge value still costs amortized linear time.
+# ============================================
+
+import codecs
+import functools
+import io
+import itertools
+import json
+import os
+import re
+
+CHUNK_BYTES = 1 << 16
+FLUSH_CHARS = 1 << 16
+BATCH = 256  # top-level elements encoded per call
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+# --------------------------------------------
+# Encoder
+# --------------------------------------------
+def dump_to(obj, stream):
+    """
+    Write obj as JSON (same text as json.dumps) to stream: a text or
+    binary file object or a file descriptor. Returns characters written.
+    """
+    write = _writer(stream)
+    buffered = []
+    size = written = 0
+    for fragment in _fragments(obj, json.JSONEncoder().encode):
+        buffered.append(fragment)
+        size += len(fragment)
+        if size >= FLUSH_CHARS:
+            write("".join(buffered))
+            written += size
+            buffered = []
+            size = 0
+
+    write("".join(buffered))
+    return written + size
+
+
+def _fragments(obj, encode):
+    """JSON text of obj in pieces of up to BATCH elements of a top-level list or dict."""
+    if isinstance(obj, (list, tuple)):
+        yield "["
+        for i in range(0, len(obj), BATCH):
+            yield (", " if i else "") + encode(obj[i:i + BATCH])[1:-1]
+        yield "]"
+    elif isinstance(obj, dict):
+        yield "{"
+        items = iter(obj.items())
+        for i in range(0, len(obj), BATCH):
+            # A sub-object converts keys exactly as json.dumps does
+            yield (", " if i else "") + encode(dict(itertools.islice(items, BATCH)))[1:-1]
+        yield "}"
+    else:
+        yield encode(obj)
+
+
+def _writer(stream):
+    if isinstance(stream, int):
+        def write_fd(text):
+            view = memoryview(text.encode("utf8"))
+            while view:
+                view = view[os.write(stream, view):]
+        return write_fd
+
+    if isinstance(stream, io.TextIOBase):
+        return stream.write
+    return lambda text: stream.write(text.encode("utf8"))
+
+
+# --------------------------------------------
+# Decoder
+# --------------------------------------------
+def loads_iter(source, chunk_size=CHUNK_BYTES):
+    """
+    Yield the top-level JSON values of source in order. source is a file
+    object (text or binary), a file descriptor, a str or bytes, or an
+    iterable of str/bytes chunks. Whitespace (newlines included) may
+    separate values.
+    """
+    decoder = json.JSONDecoder()
+    rest = ""      # text not parsed into values yet
+    parts = []     # chunks received since the last parse
+    size = 0
+    retry_at = 0
+
+    for chunk in _text_chunks(source, chunk_size):
+        parts.append(chunk)
+        size += len(chunk)
+        if size < retry_at:
+            continue
+
+        values, rest = _decode_available(decoder, rest + "".join(parts), eof=False)
+        yield from values
+        parts = []
+        size = len(rest)
+        retry_at = 2 * size
+
+    values, _ = _decode_available(decoder, rest + "".join(parts), eof=True)
+    yield from values
+
+
+def _decode_available(decoder, text, eof):
+    """(values complete in text, unparsed rest); before eof a value may be cut off."""
+    values = []
+    pos = 0
+    while True:
+        pos = _WHITESPACE.match(text, pos).end()
+        if pos == len(text):
+            break
+        try:
+            value, end = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            break
+        if end == len(text) and not eof:
+            break  # a number may continue in the next chunk
+        values.append(value)
+        pos = end
+    return values, text[pos:]
+
+
+def _text_chunks(source, chunk_size):
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    for chunk in _raw_chunks(source, chunk_size):
+        yield chunk if isinstance(chunk, str) else utf8.decode(chunk)
+    yield utf8.decode(b"", final=True)
+
+
+def _raw_chunks(source, chunk_size):
+    if isinstance(source, (str, bytes, bytearray)):
+        yield source
+        return
+
+    if isinstance(source, int):
+        read = functools.partial(os.read, source, chunk_size)
+    elif hasattr(source, "read"):
+        read = functools.partial(source.read, chunk_size)
+    else:
+        yield from source
+        return
+
+    while True:
+        chunk = read()
+        if not chunk:
+            return
+        yield chunk
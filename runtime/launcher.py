@@ -3,16 +3,35 @@
 # Executes .novar archives directly (like a JAR)
 # ============================================
 
+from time import perf_counter_ns
+
+STARTED_NS = perf_counter_ns()  # before llvmlite is imported, for --profile-startup
+
+import os
 import sys
-import tarfile
 import json
 import ctypes
+import hashlib
 from llvmlite import binding
 
+from nomc_format import BITCODE, OBJECT, NomcFormatError, is_nomc, unpack_nomc
+from novar_archive import NovarArchive, NovarArchiveError
+from jit_cache import JITCache
+from startup_profile import DISABLED, FORMATS, StartupProfile
+from jit_symbols import DEFAULT_SAMPLE_HZ, FunctionTable, Sampler, SamplingError
+from background_compile import CompileWorker, StubTable, import_signatures
+from native_bridge import NativeBridge, NativeBridgeError
+
 binding.initialize()
 binding.initialize_native_target()
 binding.initialize_native_asmprinter()
 
+INITIALIZED_NS = perf_counter_ns()
+
+
+# Must match compiler/pgo.py
+PROFILE_VERSION = 1
+
 
 class NovaLauncherError(Exception):
     """Generic launcher error for Nova runtime."""
@@ -29,44 +48,412 @@ nova_globals = {
     "sys_input": input,
 }
 
+# NATIVE_CALL trampolines, registered per module META "natives"
+natives = NativeBridge(nova_globals)
 
-def load_nomc_from_bytes(obj_bytes: bytes):
-    """
-    Load a .nomc module into an MCJIT execution engine.
+# Launcher switches (nova --quiet, --perf-map, --sample, --no-background)
+settings = {
+    "quiet": False,
+    "perf_map": bool(os.environ.get("NOVA_PERF_MAP")),
+    "sample_hz": None,
+    "background": True,
+}
+
+
+def status(message):
+    """Banner and progress output; silenced by --quiet."""
+    if not settings["quiet"]:
+        print(message)
+
+
+def host_target_machine():
+    """Target machine for this exact host CPU (each engine takes ownership of one)."""
+    target = binding.Target.from_default_triple()
+    return target.create_target_machine(
+        cpu=binding.get_host_cpu_name(),
+        features=binding.get_host_cpu_features().flatten(),
+        opt=3,
+    )
+
+
+def object_matches_host(meta) -> bool:
+    """Can the precompiled object described by meta run on this machine?"""
+    if meta.get("triple") != binding.get_default_triple():
+        return False
+
+    host_features = binding.get_host_cpu_features()
+    if not all(host_features.get(feature, False) for feature in meta.get("requires", [])):
+        return False
 
-    NOTE:
-        Depending on how you emit .nomc, you might need to switch between:
-          - parse_bitcode()  -> for LLVM bitcode
-          - parse_assembly() -> for textual .ll
-          - create_object_file() -> for native object files
+    return meta.get("portable", False) or meta.get("cpu") == binding.get_host_cpu_name()
 
-        This implementation assumes that .nomc is LLVM bitcode.
+
+def c_buffer(data):
+    """
+    Hand data to LLVM without a Python-side copy where possible.
+    Writable buffers (slices of the mmapped .novar) are passed by address.
     """
+    if isinstance(data, bytes):
+        return data
+    view = memoryview(data)
+    if view.readonly:
+        if isinstance(view.obj, bytes) and len(view.obj) == view.nbytes:
+            return view.obj  # decompressed member: already a private copy
+        return bytes(view)
+    return (ctypes.c_char * len(view)).from_buffer(view)
+
+
+def create_engine():
+    """An MCJIT engine over an empty module; .nomc code is added to it."""
+    target_machine = host_target_machine()
+    backing_mod = binding.parse_assembly("")
+    backing_mod.triple = target_machine.triple
+    return binding.create_mcjit_compiler(backing_mod, target_machine)
+
+
+def add_object(engine, obj):
+    """Link a relocatable object into engine; no code generation."""
+    engine.add_object_file(binding.ObjectFileRef.from_data(c_buffer(obj)))
+
+
+def add_bitcode(engine, bitcode: bytes, jit_cache=None, content_hash=None):
+    """Add LLVM bitcode to engine; it is JIT-compiled for this host on finalize."""
     try:
-        backing_mod = binding.parse_bitcode(obj_bytes)
+        mod = binding.parse_bitcode(bitcode)
     except Exception as e:
         raise NovaLauncherError(f"Failed to parse .nomc bitcode: {e}")
 
-    target = binding.Target.from_default_triple()
-    target_machine = target.create_target_machine(opt=3)
+    if jit_cache is not None:
+        jit_cache.attach(engine, mod, content_hash or hashlib.sha256(bitcode).hexdigest())
+    engine.add_module(mod)
+
 
+def add_nomc(engine, data, jit_cache=None, content_hash=None):
+    """
+    Add a .nomc module (bytes or a memoryview) to engine; returns its META.
+
+    A .nomc container (see nomc_format.py) carries optimized bitcode and
+    usually a precompiled object. The object is linked in directly when
+    it was built for this triple and CPU; otherwise the bitcode is
+    JIT-compiled for the host; with a jit_cache, warm loads reuse the
+    object generated last time (content_hash, e.g. the archive index
+    digest, saves hashing the bitcode). Bare objects and bare bitcode
+    written by older compilers are still accepted (with an empty META).
+    """
+    meta = {}
+    try:
+        if is_nomc(data):
+            meta, sections = unpack_nomc(data)
+            natives.register(meta.get("natives", []))
+            obj = sections.get(OBJECT)
+            if obj is not None and object_matches_host(meta):
+                add_object(engine, obj)
+            else:
+                add_bitcode(engine, bytes(sections[BITCODE]), jit_cache, content_hash)
+        elif bytes(data[:2]) == b"BC":
+            add_bitcode(engine, bytes(data), jit_cache, content_hash)
+        else:
+            add_object(engine, data)
+    except (NomcFormatError, NativeBridgeError) as e:
+        raise NovaLauncherError(f"Invalid .nomc: {e}")
+    except NovaLauncherError:
+        raise
+    except Exception as e:
+        raise NovaLauncherError(f"Failed to load module: {e}")
+
+    return meta
+
+
+def compile_nomc(data, target_machine, jit_cache=None, content_hash=None, context=None):
+    """
+    Native object of a .nomc for this host, without an engine:
+    (META, object bytes, import signatures, see import_signatures()).
+    Used off the main thread, so bitcode is parsed into context.
+    """
+    try:
+        if not is_nomc(data):
+            if bytes(data[:2]) != b"BC":
+                return {}, c_buffer(data), {}
+            meta, sections = {}, {BITCODE: data}
+        else:
+            meta, sections = unpack_nomc(data)
+    except NomcFormatError as e:
+        raise NovaLauncherError(f"Invalid .nomc: {e}")
+
+    content_hash = content_hash or hashlib.sha256(bytes(sections[BITCODE])).hexdigest()
+    obj = sections.get(OBJECT)
+    if obj is not None and object_matches_host(meta):
+        obj = c_buffer(obj)
+    elif jit_cache is not None:
+        obj = jit_cache.load(content_hash)
+    else:
+        obj = None
+
+    imports = meta.get("imports", [])
+    if obj is not None and not imports:
+        return meta, obj, {}
+
+    try:
+        mod = binding.parse_bitcode(bytes(sections[BITCODE]), context)
+        signatures = import_signatures(mod, imports)
+        if obj is None:
+            obj = target_machine.emit_object(mod)
+            if jit_cache is not None:
+                jit_cache.store(content_hash, obj)
+    except Exception as e:
+        raise NovaLauncherError(f"Failed to compile module: {e}")
+
+    return meta, obj, signatures
+
+
+def finalize_engine(engine):
+    """Generate/relocate code for everything added so far and run constructors."""
     try:
-        engine = binding.create_mcjit_compiler(backing_mod, target_machine)
         engine.finalize_object()
         engine.run_static_constructors()
     except Exception as e:
         raise NovaLauncherError(f"Failed to initialize execution engine: {e}")
 
+
+def load_nomc_from_bytes(data, jit_cache=None):
+    """Load a .nomc module into an MCJIT execution engine."""
+    engine, _ = load_nomc(data, jit_cache)
     return engine
 
 
-def run_main(engine, module_name: str) -> int:
+def load_nomc(data, jit_cache=None, content_hash=None):
+    """Load one .nomc into its own finalized engine; returns (engine, META dict)."""
+    engine = create_engine()
+    meta = add_nomc(engine, data, jit_cache, content_hash)
+    finalize_engine(engine)
+    return engine, meta
+
+
+class ModuleLoader:
+    """
+    Links the modules of one launch into a single MCJIT engine.
+
+    Only the manifest "entry" is added up front. Every module's META
+    "imports" lists the functions it calls but does not define; each is
+    looked up in the manifest "exports" map (symbol -> bin path) and the
+    defining module is added the first time a symbol of it is needed.
+    Modules nothing refers to are never read, parsed or compiled.
+    Everything must be added before finalize(): MCJIT aborts on
+    unresolved symbols instead of asking for them later.
+
+    start() links lazily instead (see background_compile.py): the entry
+    is compiled and linked alone, imported functions of other modules
+    are stubs, and a worker thread compiles those modules while main()
+    runs. The first call into a module waits for that module only and
+    links it.
+    """
+
+    def __init__(self, archive, manifest, binaries, jit_cache=None, startup=DISABLED):
+        self.archive = archive
+        self.jit_cache = jit_cache
+        self.startup = startup
+        self.exports = manifest.get("exports", {})
+        # Manifest paths are those of "bin"; a CPU variant swaps in its own files
+        self.paths = dict(zip(manifest.get("bin", []), binaries))
+        with startup.phase("engine.create"):
+            self.engine = create_engine()
+        self.modules = {}  # bin path -> META, in load order
+        self.worker = None
+        self.stubs = None
+
+    def load(self, path):
+        """Add the module at bin path and, transitively, what it imports."""
+        pending = [path]
+        while pending:
+            path = pending.pop()
+            if path in self.modules:
+                continue
+
+            member, data, content_hash = self.read(path)
+            status(f"  -> Loading {member}...")
+            with self.startup.phase("module.add", member, len(data)):
+                meta = add_nomc(self.engine, data, self.jit_cache, content_hash)
+            self.modules[path] = meta
+
+            for symbol in meta.get("imports", []):
+                owner = self.resolve(symbol)
+                if owner is not None and owner not in self.modules:
+                    pending.append(owner)
+
+    def read(self, path):
+        """(member name, bytes, content hash) of the module at bin path."""
+        member = self.paths.get(path, path)
+        try:
+            with self.startup.phase("module.read", member) as phase:
+                data = self.archive.read(member)
+                content_hash = self.archive.entry(member)["sha256"]
+                phase.nbytes = len(data)
+        except NovarArchiveError as e:
+            raise NovaLauncherError(f"Failed to read '{member}': {e}")
+        return member, data, content_hash
+
+    def resolve(self, symbol):
+        """Bin path of the module exporting symbol, or None for host symbols."""
+        return self.exports.get(symbol)
+
+    def finalize(self):
+        with self.startup.phase("engine.finalize"):
+            finalize_engine(self.engine)
+        return self.engine
+
+    # ----------------------------------------
+    # Background mode
+    # ----------------------------------------
+    def start(self, entry):
+        """Link entry (finalized) and compile what it imports in the background."""
+        self.target_machine = host_target_machine()  # worker thread only
+        self.context = binding.create_context()
+        self.stubs = StubTable(host_target_machine(), self.link)
+        self.worker = CompileWorker(self.compile)
+
+        status(f"  -> Loading {self.paths.get(entry, entry)}...")
+        self.link(entry)
+        self.worker.start()  # only now: LLVM calls of both threads would serialize
+        return self.engine
+
+    def compile(self, path):
+        """Worker thread: compile one module and queue the modules it imports."""
+        member, data, content_hash = self.read(path)
+        with self.startup.phase("module.compile", member, len(data)):
+            compiled = compile_nomc(data, self.target_machine, self.jit_cache, content_hash, self.context)
+
+        for symbol in compiled[0].get("imports", []):
+            owner = self.resolve(symbol)
+            if owner is not None:
+                self.worker.submit(owner)
+        return compiled
+
+    def link(self, path):
+        """
+        Link the compiled module at bin path into the engine and finalize.
+        Imports from modules not linked yet become stubs; a function no
+        stub can forward pulls its module in right away.
+        """
+        linked = []
+        pending = [path]
+        while pending:
+            path = pending.pop()
+            if path in self.modules:
+                continue
+
+            member = self.paths.get(path, path)
+            with self.startup.phase("module.wait", member):
+                meta, obj, signatures = self.worker.wait(path)
+            with self.startup.phase("module.add", member, len(obj)):
+                try:
+                    natives.register(meta.get("natives", []))
+                except NativeBridgeError as e:
+                    raise NovaLauncherError(f"Invalid .nomc: {e}")
+                add_object(self.engine, obj)
+            self.modules[path] = meta
+            linked.append(path)
+
+            stubs = {}
+            for symbol in meta.get("imports", []):
+                owner = self.resolve(symbol)
+                if owner is None or owner in self.modules or symbol in self.stubs:
+                    continue
+                if symbol in signatures:
+                    stubs[symbol] = (signatures[symbol], owner)
+                else:
+                    pending.append(owner)
+            self.stubs.add(stubs)
+
+        self.finalize()
+
+        for path in linked:
+            for symbol in self.modules[path].get("exports", []):
+                if symbol in self.stubs:
+                    self.stubs.patch(symbol, self.engine.get_function_address(symbol))
+
+    def close(self):
+        if self.worker is not None:
+            self.worker.close()
+            self.worker = None
+
+
+def select_target(manifest):
+    """
+    Resolve the binaries to load for this host.
+
+    "targets" maps a triple to multiversioned builds, best first:
+        {"x86_64-unknown-linux-gnu": [
+            {"variant": "avx2", "requires": ["avx2", ...], "bin": [...]}, ...]}
+    The first variant whose required features the host CPU reports wins;
+    without a usable entry the plain "bin" list is loaded.
+    """
+    binaries = manifest.get("bin", [])
+    variants = manifest.get("targets", {}).get(binding.get_default_triple())
+
+    if not isinstance(variants, list):
+        return binaries, None
+
+    host_features = binding.get_host_cpu_features()
+    for variant in variants:
+        if all(host_features.get(feature, False) for feature in variant.get("requires", [])):
+            return variant.get("bin", binaries), variant.get("variant")
+
+    return binaries, None
+
+
+def collect_profile(engine, meta, profile):
+    """
+    Copy the PGO counters of an instrumented module into profile.
+
+    META["profile"] maps each function to its counter symbol and slot
+    layout: [entries, one per block, (taken, not taken) per branch].
+    """
+    functions = profile["modules"].setdefault(meta.get("module", "<unknown>"), {})
+
+    for func_name, layout in meta["profile"].items():
+        blocks = layout["blocks"]
+        branches = layout["branches"]
+        size = 1 + len(blocks) + 2 * len(branches)
+
+        addr = engine.get_global_value_address(layout["symbol"])
+        if addr == 0:
+            continue
+        counts = (ctypes.c_int64 * size).from_address(addr)
+
+        functions[func_name] = {
+            "entry": counts[0],
+            "blocks": {name: counts[1 + i] for i, name in enumerate(blocks)},
+            "branches": {
+                key: [counts[1 + len(blocks) + 2 * i], counts[2 + len(blocks) + 2 * i]]
+                for i, key in enumerate(branches)
+            },
+        }
+
+
+def write_profile(profile, default_name):
+    """Write profile to $NOVA_PROFILE_FILE (%p = pid) or <default_name>.novaprof."""
+    path = os.environ.get("NOVA_PROFILE_FILE") or f"{default_name}.novaprof"
+    path = path.replace("%p", str(os.getpid()))
+
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=1, sort_keys=True)
+    except OSError as e:
+        raise NovaLauncherError(f"Failed to write profile '{path}': {e}")
+
+    status(f"  -> Profile written to {path}")
+
+
+def run_main(engine, module_name: str, meta=None, profile=None) -> int:
     """
     Execute main() from a loaded module.
 
     Convention:
         Nova codegen must emit a C-style entry:
             int main(void);
+
+    For instrumented modules (META "profile") the counters are copied
+    into profile once main() returns.
     """
     try:
         func_ptr = engine.get_function_address("main")
@@ -77,87 +464,292 @@ def run_main(engine, module_name: str) -> int:
         raise NovaLauncherError(f"main() not found in module '{module_name}'")
 
     cfunc = ctypes.CFUNCTYPE(ctypes.c_int)(func_ptr)
-    return cfunc()
+    result = cfunc()
+
+    if meta and "profile" in meta and profile is not None:
+        collect_profile(engine, meta, profile)
 
+    return result
 
-def launch(novar_path: str) -> int:
+
+class Program:
     """
-    Launch a .novar archive:
-      - open tar
-      - read Manifest.json
-      - load and execute all listed .nomc binaries
+    A .novar opened for execution:
+      - mmap it and read the member index
+      - read Manifest.json and select the binaries for this host
+      - link the "entry" .nomc and the modules it imports into one
+        engine (zero-copy slices), ready to run main()
+
+    With background, only the entry is linked before main() starts;
+    the modules it imports are compiled meanwhile on a worker thread
+    (ModuleLoader.start). Forked runs need everything linked up front.
+    run() may be called in forked children (see daemon.py), each of
+    which starts from the freshly initialized module state.
+    startup (a StartupProfile) receives the phase timings.
     """
-    # ----------------------------------------
-    # Open .novar archive
-    # ----------------------------------------
-    try:
-        tar = tarfile.open(novar_path, "r")
-    except Exception as e:
-        raise NovaLauncherError(f"Failed to open .novar '{novar_path}': {e}")
 
-    with tar:
+    def __init__(self, novar_path: str, jit_cache=None, startup=DISABLED, background=False):
+        self.startup = startup
+        self.background = background
+
+        # ----------------------------------------
+        # Open .novar archive
+        # ----------------------------------------
+        try:
+            with startup.phase("archive.open") as phase:
+                self.archive = NovarArchive(novar_path)
+                phase.nbytes = len(self.archive.view)
+        except NovarArchiveError as e:
+            raise NovaLauncherError(str(e))
+
+        try:
+            self.open(jit_cache)
+        except BaseException:
+            self.archive.close()
+            raise
+
+    def open(self, jit_cache):
         # ----------------------------------------
         # Read manifest
         # ----------------------------------------
         try:
-            manifest_file = tar.extractfile("bin/Manifest.json")
-            if manifest_file is None:
-                raise NovaLauncherError("Manifest 'bin/Manifest.json' not found in archive")
-            manifest = json.load(manifest_file)
-        except Exception as e:
+            with self.startup.phase("manifest.read") as phase:
+                manifest = self.archive.read_json("bin/Manifest.json")
+                phase.nbytes = self.archive.entry("bin/Manifest.json")["size"]
+        except NovarArchiveError as e:
             raise NovaLauncherError(f"Failed to read Manifest.json: {e}")
 
         project = manifest.get("project", {})
-        name = project.get("name", "<unknown>")
+        self.name = project.get("name", "<unknown>")
         version = project.get("version", "<unknown>")
 
-        print(f"Launching {name} v{version}")
+        self.binaries, variant = select_target(manifest)
 
-        binaries = manifest.get("bin", [])
-        if not binaries:
+        if variant:
+            status(f"Launching {self.name} v{version} ({variant})")
+        else:
+            status(f"Launching {self.name} v{version}")
+
+        if not self.binaries:
             raise NovaLauncherError("Manifest contains no compiled binaries in 'bin'")
 
         # ----------------------------------------
-        # Load and execute each .nomc module
+        # Link the entry and what it reaches
         # ----------------------------------------
-        last_result = 0
+        self.jit_cache = jit_cache
+        self.entry = manifest.get("entry")
+        self.loader = None
+        if self.entry is not None:
+            self.loader = ModuleLoader(self.archive, manifest, self.binaries, jit_cache, self.startup)
+            # Profilers list the functions linked when main() starts
+            if self.background and not (settings["perf_map"] or settings["sample_hz"]):
+                self.loader.start(self.entry)
+            else:
+                self.loader.load(self.entry)
+                self.loader.finalize()
+
+    def run(self) -> int:
+        """Execute main(); instrumented programs write their profile afterwards."""
+        profile = {"version": PROFILE_VERSION, "runs": 1, "modules": {}}
+
+        if self.loader is None:
+            result = launch_each(self.archive, self.binaries, profile, self.jit_cache, self.startup)
+        else:
+            result = run_entry(self.loader, self.entry, profile, self.startup)
+
+        if profile["modules"]:
+            write_profile(profile, self.name)
+
+        return result
+
+    def close(self):
+        if self.loader is not None:
+            self.loader.close()
+            self.loader = None
+        self.archive.close()
+
+
+def execute(engine, metas, module_name, meta=None, profile=None) -> int:
+    """run_main() plus the --perf-map and --sample hooks for engine's modules."""
+    if not (settings["perf_map"] or settings["sample_hz"]):
+        return run_main(engine, module_name, meta, profile)
+
+    table = FunctionTable(engine, metas)
+    if settings["perf_map"]:
+        table.write_perf_map()
+    if not settings["sample_hz"]:
+        return run_main(engine, module_name, meta, profile)
 
-        for nomc_file in binaries:
-            try:
-                f = tar.extractfile(nomc_file)
-                if f is None:
-                    raise NovaLauncherError(f"Binary '{nomc_file}' not found in archive")
-                obj_bytes = f.read()
-            except Exception as e:
-                raise NovaLauncherError(f"Failed to read '{nomc_file}': {e}")
+    try:
+        sampler = Sampler(settings["sample_hz"])
+        sampler.start()
+    except SamplingError as e:
+        raise NovaLauncherError(str(e))
 
-            print(f"  -> Loading {nomc_file}...")
-            engine = load_nomc_from_bytes(obj_bytes)
+    try:
+        return run_main(engine, module_name, meta, profile)
+    finally:
+        sampler.stop()
+        sampler.report(table)
 
-            # Execute main()
-            try:
-                result = run_main(engine, nomc_file)
-                print(f"     main() returned {result}")
-                last_result = result
-            except NovaLauncherError as e:
-                print(f"     Runtime error in {nomc_file}: {e}")
-                last_result = 1
 
-        return last_result
+def launch(novar_path: str, jit_cache=None, startup=DISABLED) -> int:
+    """Launch a .novar archive (see Program); returns main()'s result."""
+    program = Program(novar_path, jit_cache, startup, background=settings["background"])
+    try:
+        return program.run()
+    finally:
+        program.close()
+
+
+def run_entry(loader, entry, profile, startup=DISABLED) -> int:
+    """Run main() of the linked entry module, then collect PGO counters."""
+    engine = loader.engine
+
+    try:
+        with startup.phase("main", entry):
+            result = execute(engine, loader.modules.values(), entry)
+        status(f"     main() returned {result}")
+    except NovaLauncherError as e:
+        print(f"     Runtime error in {entry}: {e}")
+        return 1
+
+    for meta in loader.modules.values():
+        if "profile" in meta:
+            collect_profile(engine, meta, profile)
+
+    return result
+
+
+def launch_each(archive, binaries, profile, jit_cache=None, startup=DISABLED) -> int:
+    """Manifests without an "entry": load and run every binary on its own."""
+    last_result = 0
+
+    for nomc_file in binaries:
+        try:
+            with startup.phase("module.read", nomc_file) as phase:
+                nomc_data = archive.read(nomc_file)
+                content_hash = archive.entry(nomc_file)["sha256"]
+                phase.nbytes = len(nomc_data)
+        except NovarArchiveError as e:
+            raise NovaLauncherError(f"Failed to read '{nomc_file}': {e}")
+
+        status(f"  -> Loading {nomc_file}...")
+        with startup.phase("module.load", nomc_file, len(nomc_data)):
+            engine, meta = load_nomc(nomc_data, jit_cache, content_hash)
+
+        # Execute main()
+        try:
+            with startup.phase("main", nomc_file):
+                result = execute(engine, [meta], nomc_file, meta, profile)
+            status(f"     main() returned {result}")
+            last_result = result
+        except NovaLauncherError as e:
+            print(f"     Runtime error in {nomc_file}: {e}")
+            last_result = 1
+
+    return last_result
+
+
+def parse_args(argv):
+    """
+    nova [--no-jit-cache] [--no-background] [--quiet] [--profile-startup[=<file>]]
+         [--profile-format=json|chrome] [--perf-map] [--sample[=<hz>]]
+         <file.novar> [args...]
+    nova --daemon
+    Returns (options, novar_path, program args).
+    """
+    options = {"jit_cache": True, "daemon": False, "quiet": False,
+               "profile_startup": None, "profile_format": "json",
+               "perf_map": False, "sample_hz": None, "background": True}
+    args = list(argv)
+
+    while args and args[0].startswith("-"):
+        arg = args.pop(0)
+        if arg == "--no-jit-cache":
+            options["jit_cache"] = False
+        elif arg == "--no-background":
+            options["background"] = False
+        elif arg == "--daemon":
+            options["daemon"] = True
+        elif arg == "--quiet":
+            options["quiet"] = True
+        elif arg == "--profile-startup":
+            options["profile_startup"] = "-"
+        elif arg.startswith("--profile-startup="):
+            options["profile_startup"] = arg[len("--profile-startup="):]
+        elif arg == "--perf-map":
+            options["perf_map"] = True
+        elif arg == "--sample":
+            options["sample_hz"] = DEFAULT_SAMPLE_HZ
+        elif arg.startswith("--sample="):
+            try:
+                options["sample_hz"] = int(arg[len("--sample="):])
+            except ValueError:
+                raise NovaLauncherError(f"Invalid sampling rate: {arg}")
+            if options["sample_hz"] <= 0:
+                raise NovaLauncherError(f"Invalid sampling rate: {arg}")
+        elif arg.startswith("--profile-format="):
+            options["profile_format"] = arg[len("--profile-format="):]
+            if options["profile_format"] not in FORMATS:
+                raise NovaLauncherError(f"Unknown profile format: {options['profile_format']}")
+        elif arg == "-novar":
+            pass  # mode flag forwarded by cli/nova.py
+        else:
+            raise NovaLauncherError(f"Unknown option: {arg}")
+
+    if not args:
+        return options, None, []
+    return options, args[0], args[1:]
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: nova <file.novar> [args...]")
+    try:
+        options, novar_path, program_args = parse_args(sys.argv[1:])
+    except NovaLauncherError as e:
+        print(f"[NovaLauncherError] {e}")
         sys.exit(1)
 
-    novar_path = sys.argv[1]
+    if options["daemon"]:
+        from daemon import Daemon
+
+        try:
+            Daemon().serve_forever()
+        except (NovaLauncherError, OSError) as e:
+            print(f"[NovaLauncherError] {e}")
+            sys.exit(1)
+        sys.exit(0)
+
+    if novar_path is None:
+        print("Usage: nova [--no-jit-cache] [--no-background] [--quiet] [--profile-startup[=<file>]]")
+        print("            [--profile-format=json|chrome] [--perf-map] [--sample[=<hz>]]")
+        print("            <file.novar> [args...]")
+        print("       nova --daemon")
+        sys.exit(1)
+
+    nova_globals["sys_args"] = program_args
+    settings["quiet"] = options["quiet"]
+    settings["perf_map"] = settings["perf_map"] or options["perf_map"]
+    settings["sample_hz"] = options["sample_hz"]
+    settings["background"] = options["background"]
+    jit_cache = JITCache() if options["jit_cache"] else None
+
+    startup = DISABLED
+    if options["profile_startup"] is not None:
+        startup = StartupProfile(origin=STARTED_NS)
+        startup.add("runtime.init", STARTED_NS, INITIALIZED_NS)
 
     try:
-        exit_code = launch(novar_path)
+        exit_code = launch(novar_path, jit_cache, startup)
     except NovaLauncherError as e:
         print(f"[NovaLauncherError] {e}")
-        sys.exit(1)
+        exit_code = 1
+
+    if startup.enabled:
+        try:
+            startup.write(options["profile_startup"], options["profile_format"])
+        except OSError as e:
+            print(f"[NovaLauncherError] Failed to write startup profile: {e}")
 
     sys.exit(exit_code)
 
@@ -6,6 +6,25 @@
 #   - __native__(path, *args)
 #       → calls Python stdlib functions
 #
+#   - bind(path) / invalidate(prefix) / call_counts()
+#       → cached resolution of native paths
+#
+#   - __native_batch__(path, values, out=None), std/math.*_many
+#       → one bridge call for a whole list or buffer
+#
+#   - std/fs.readinto, std/net.recv_into and friends
+#       → streaming I/O into caller-owned buffers;
+#         std/net sockets are integer descriptors
+#
+#   - std/thread.pool, submit, parallel_map, wait_all
+#       → persistent worker pools (worker_pool.py)
+#
+#   - std/thread.spawn, join, sleep, task, std/sys.release
+#       → threads and callables for compiled code
+#
+#   - std/json.dump_to, std/json.loads_iter, std/json.next
+#       → streaming JSON (json_stream.py)
+#
 #   - NOVA_STDLIB
 #       → mapping for Nova's "use std/..." modules
 #
@@ -22,6 +41,19 @@ import os
 import time
 import random
 import json
+import array
+import socket
+import functools
+import threading
+
+import json_stream
+import native_objects
+import worker_pool
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 # Injected by launcher.py
 try:
@@ -53,6 +85,12 @@ except Exception:
 #   use std/json
 #   json.loads("{...}")
 #
+#   math.sqrt_many(values)       (and sin/cos/tan/log/exp)
+#   math.sqrt_many(values, out)  fills out in place
+#
+#   fd = fs.open("data.bin")
+#   n = fs.readinto(fd, buf)     fills a bytes_buffer in place
+#
 # --------------------------------------------
 
 NOVA_STDLIB = {
@@ -65,6 +103,17 @@ NOVA_STDLIB = {
     "std/math.exp": math.exp,
     "std/math.pi": lambda: math.pi,
     "std/math.e": lambda: math.e,
+    # Batched, see map_many(); registered below the table
+
+    # fs, net: streaming into buffers, registered below the table
+
+    # thread: persistent worker pools; spawn/join/sleep/task registered below the table
+    "std/thread.pool": worker_pool.WorkerPool,
+    "std/thread.submit": worker_pool.submit,
+    "std/thread.parallel_map": worker_pool.parallel_map,
+    "std/thread.wait_all": worker_pool.wait_all,
+    "std/thread.metrics": worker_pool.metrics,
+    "std/thread.shutdown": worker_pool.shutdown,
 
     # os
     "std/os.getcwd": os.getcwd,
@@ -86,12 +135,307 @@ NOVA_STDLIB = {
     # json
     "std/json.loads": json.loads,
     "std/json.dumps": json.dumps,
+    "std/json.dump_to": json_stream.dump_to,
+    "std/json.loads_iter": json_stream.loads_iter,
+    "std/json.next": lambda values: next(values, None),
 }
 
 
+# --------------------------------------------
+# Batched math
+# --------------------------------------------
+# A call per element pays the bridge (and, from
+# compiled code, a ctypes callback) every time;
+# map_many() applies one function to a whole list
+# or buffer in a single call. With NumPy installed,
+# buffers (array.array, memoryview, ndarray) run
+# through the function's ufunc twin without a copy;
+# lists, small batches and installs without NumPy
+# use a plain map() loop, which beats converting a
+# list to an array and back at any size. Errors
+# match the math module: ValueError for domain
+# errors, OverflowError for range errors.
+# --------------------------------------------
+NUMPY_MIN_BATCH = 32
+
+BATCHED_MATH = ("sqrt", "sin", "cos", "tan", "log", "exp")
+
+# Scalar function -> NumPy ufunc computing the same thing
+_UFUNCS = {getattr(math, name): getattr(numpy, name) for name in BATCHED_MATH} if numpy else {}
+
+_INT_FORMATS = frozenset("bBhHiIlLqQnN")
+
+
+def map_many(func, values, out=None):
+    """
+    func applied to every number of values (list, tuple, array.array,
+    memoryview or ndarray) in one call. With out (a writable sequence or
+    buffer as long as values, possibly values itself) the results are
+    stored there and out is returned; integer buffers get truncated
+    results. Otherwise returns a list, or an ndarray for ndarray input.
+    """
+    ufunc = _UFUNCS.get(func)
+    if ufunc is not None and len(values) >= NUMPY_MIN_BATCH and not isinstance(values, (list, tuple)):
+        return _map_numpy(ufunc, values, out)
+
+    results = map(func, values)
+    if out is None:
+        return list(results)
+
+    if isinstance(out, list):
+        out[:] = results
+        return out
+
+    view = memoryview(out)
+    if view.format in _INT_FORMATS:
+        results = map(int, results)
+    view[:] = array.array(view.format, results)
+    return out
+
+
+def _map_numpy(ufunc, values, out):
+    data = numpy.asarray(values, dtype=numpy.float64)  # no copy for float64 buffers
+    try:
+        with numpy.errstate(invalid="raise", divide="raise", over="raise"):
+            if out is None:
+                result = ufunc(data)
+            else:
+                ufunc(data, out=numpy.asarray(out), casting="unsafe")
+    except FloatingPointError as e:
+        if "overflow" in str(e):
+            raise OverflowError("math range error")
+        raise ValueError("math domain error")
+
+    if out is not None:
+        return out
+    return result if isinstance(values, numpy.ndarray) else result.tolist()
+
+
+for _name in BATCHED_MATH:
+    NOVA_STDLIB[f"std/math.{_name}_many"] = (
+        lambda values, out=None, _func=getattr(math, _name): map_many(_func, values, out)
+    )
+
+
+# --------------------------------------------
+# Streaming I/O
+# --------------------------------------------
+# Reads land directly in a writable buffer owned by
+# the caller (a compiled bytes_buffer, bytearray,
+# memoryview, ...) and return the byte count, 0 at
+# end of stream; writes send a prefix of one. No
+# bytes or str object is created per chunk. Files
+# and sockets are Python objects or plain integer
+# descriptors, which is what compiled code holds:
+# std/fs.open and std/net.listen, connect and accept
+# return descriptors.
+# --------------------------------------------
+_OPEN_FLAGS = {
+    "r": os.O_RDONLY,
+    "w": os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+    "a": os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+}
+
+
+def fs_open(path, mode="r"):
+    """Descriptor of path opened for reading ("r"), writing ("w") or appending ("a")."""
+    if mode not in _OPEN_FLAGS:
+        raise ValueError(f"Invalid file mode: {mode!r}")
+    return os.open(path, _OPEN_FLAGS[mode] | getattr(os, "O_BINARY", 0), 0o666)
+
+
+def fs_read(file, size):
+    """Up to size bytes of file as str (copies; see fs_readinto)."""
+    data = os.read(file, size) if isinstance(file, int) else file.read(size)
+    return data.decode("utf8", "replace") if isinstance(data, bytes) else data
+
+
+def fs_readinto(file, buf):
+    """Fill buf from file; bytes read."""
+    if isinstance(file, int):
+        return os.readv(file, [buf])
+    return file.readinto(buf)
+
+
+def fs_write_from(file, buf, nbytes=-1):
+    """Write the first nbytes of buf (all of it if negative) to file; bytes written."""
+    view = _prefix(buf, nbytes)
+    if isinstance(file, int):
+        return _write_all(file, view)
+    file.write(view)
+    return len(view)
+
+
+def fs_close(file):
+    if isinstance(file, int):
+        os.close(file)
+    else:
+        file.close()
+
+
+def net_listen(host, port, backlog=128):
+    """Descriptor of a TCP socket listening on (host, port)."""
+    return socket.create_server((host, port), backlog=backlog).detach()
+
+
+def net_connect(host, port):
+    """Descriptor of a TCP connection to (host, port)."""
+    return socket.create_connection((host, port)).detach()
+
+
+def net_accept(server):
+    """Descriptor of the next connection to server (waits for one)."""
+    if not isinstance(server, int):
+        return server.accept()[0]
+    listener = socket.socket(fileno=server)
+    try:
+        return listener.accept()[0].detach()
+    finally:
+        listener.detach()
+
+
+def net_write(sock, data):
+    """Send all of data (str, UTF-8); bytes sent."""
+    return net_send_from(sock, data.encode("utf8"))
+
+
+def net_recv_into(sock, buf, nbytes=0):
+    """Receive up to nbytes (len(buf) if 0) into buf; bytes received."""
+    if isinstance(sock, int):
+        return os.readv(sock, [_prefix(buf, nbytes or -1)])
+    return sock.recv_into(buf, nbytes)
+
+
+def net_send_from(sock, buf, nbytes=-1):
+    """Send the first nbytes of buf (all of it if negative); bytes sent."""
+    view = _prefix(buf, nbytes)
+    if isinstance(sock, int):
+        return _write_all(sock, view)
+    sock.sendall(view)
+    return len(view)
+
+
+def _prefix(buf, nbytes):
+    view = memoryview(buf).cast("B")
+    return view if nbytes < 0 else view[:nbytes]
+
+
+def _write_all(fd, view):
+    written = 0
+    while written < len(view):
+        written += os.write(fd, view[written:])
+    return written
+
+
+NOVA_STDLIB.update({
+    "std/fs.open": fs_open,
+    "std/fs.read": fs_read,
+    "std/fs.readinto": fs_readinto,
+    "std/fs.write_from": fs_write_from,
+    "std/fs.close": fs_close,
+    "std/net.listen": net_listen,
+    "std/net.connect": net_connect,
+    "std/net.accept": net_accept,
+    "std/net.read": fs_read,
+    "std/net.write": net_write,
+    "std/net.close": fs_close,
+    "std/net.recv_into": net_recv_into,
+    "std/net.send_from": net_send_from,
+})
+
+
+# --------------------------------------------
+# Threads from compiled code
+# --------------------------------------------
+# Compiled code holds threads, pools, futures and
+# callables as handles (native_objects.py), so every
+# std/thread entry takes and returns plain values:
+# task(path) is the callable __native__(path, *args),
+# which is how compiled code names work to spawn,
+# submit or parallel_map. Handles stay valid until
+# std/sys.release(handle).
+# --------------------------------------------
+def thread_spawn(func):
+    """Started thread running func()."""
+    thread = threading.Thread(target=func)
+    thread.start()
+    return thread
+
+
+def thread_join(thread):
+    thread.join()
+
+
+def thread_sleep(ms):
+    time.sleep(ms / 1000.0)
+
+
+def thread_task(path):
+    """Callable running __native__(path, *args); picklable for process pools."""
+    return functools.partial(__native__, path)
+
+
+NOVA_STDLIB.update({
+    "std/thread.spawn": thread_spawn,
+    "std/thread.join": thread_join,
+    "std/thread.sleep": thread_sleep,
+    "std/thread.task": thread_task,
+    "std/sys.release": native_objects.release,
+})
+
+
 # --------------------------------------------
 # Native call bridge
 # --------------------------------------------
+# Every path is resolved once into a NativeHandle
+# (the callable or value it names) and cached, so a
+# hot __native__("math.sqrt", x) costs one dict lookup
+# instead of a split, an import and a getattr walk.
+# Call sites may keep the handle from bind(path) and
+# call it directly. Handles count their calls.
+#
+# invalidate(prefix) marks handles stale after a module
+# reload or a stdlib change; a stale handle resolves
+# again on its next call, so pre-bound handles stay
+# valid. "nova." paths read nova_globals on every call
+# because the launcher replaces entries (sys_args).
+# --------------------------------------------
+class NativeHandle:
+    """A native path resolved to what it names."""
+
+    __slots__ = ("path", "calls", "invoke")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.calls = 0
+        self.invoke = _resolve(path)
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.invoke(*args)
+
+    def invalidate(self):
+        self.invoke = self._rebind
+
+    def _rebind(self, *args):
+        self.invoke = _resolve(self.path)
+        return self.invoke(*args)
+
+    def __repr__(self):
+        return f"<NativeHandle {self.path!r} calls={self.calls}>"
+
+
+_handles = {}  # path -> NativeHandle
+
+
+def bind(path: str) -> NativeHandle:
+    """Resolved handle for path (cached); raises like __native__ for bad paths."""
+    handle = _handles.get(path)
+    if handle is None:
+        handle = _handles[path] = NativeHandle(path)
+    return handle
+
+
 def __native__(path: str, *args):
     """
     Execute a native Python call or access a Python attribute.
@@ -102,6 +446,55 @@ def __native__(path: str, *args):
         - builtins (builtins.print)
         - nova runtime globals (nova.sys_args)
     """
+    handle = _handles.get(path)
+    if handle is None:
+        handle = bind(path)
+    return handle(*args)
+
+
+def __native_batch__(path: str, values, out=None):
+    """
+    __native__(path, value) for every value, as one bridge call
+    (see map_many); counts as a single call of path.
+    """
+    handle = _handles.get(path)
+    if handle is None:
+        handle = bind(path)
+    handle.calls += 1
+    return map_many(handle.invoke, values, out)
+
+
+def invalidate(prefix: str = ""):
+    """Mark every handle whose path starts with prefix stale (all by default)."""
+    for path, handle in _handles.items():
+        if path.startswith(prefix):
+            handle.invalidate()
+
+
+def reload_module(module_name: str):
+    """importlib.reload() a Python module and re-resolve paths into it."""
+    module = importlib.reload(importlib.import_module(module_name))
+    invalidate(module_name + ".")
+    return module
+
+
+def register_stdlib(path: str, func):
+    """Add or replace a std/ entry."""
+    NOVA_STDLIB[path] = func
+    invalidate(path)
+
+
+def call_counts():
+    """{path: calls} of every bound path, busiest first."""
+    counts = [(handle.calls, path) for path, handle in _handles.items()]
+    return {path: calls for calls, path in sorted(counts, reverse=True)}
+
+
+# --------------------------------------------
+# Resolution
+# --------------------------------------------
+def _resolve(path: str):
+    """Callable taking the call's args for path; raises for bad paths."""
 
     # ----------------------------------------
     # Nova runtime globals
@@ -110,19 +503,22 @@ def __native__(path: str, *args):
         key = path.split(".", 1)[1]
         if key not in nova_globals:
             raise KeyError(f"Nova runtime variable '{key}' does not exist")
-        value = nova_globals[key]
-        if callable(value):
-            return value(*args)
-        if args:
-            raise TypeError(f"'{path}' is not callable but arguments were given")
-        return value
+
+        def nova_global(*args):
+            value = nova_globals[key]
+            if callable(value):
+                return value(*args)
+            if args:
+                raise TypeError(f"'{path}' is not callable but arguments were given")
+            return value
+
+        return nova_global
 
     # ----------------------------------------
     # Nova Stdlib (std/...)
     # ----------------------------------------
     if path in NOVA_STDLIB:
-        func = NOVA_STDLIB[path]
-        return func(*args)
+        return NOVA_STDLIB[path]
 
     # ----------------------------------------
     # Builtins
@@ -131,12 +527,7 @@ def __native__(path: str, *args):
         name = path.split(".", 1)[1]
         if not hasattr(builtins, name):
             raise AttributeError(f"Builtin '{name}' does not exist")
-        obj = getattr(builtins, name)
-        if callable(obj):
-            return obj(*args)
-        if args:
-            raise TypeError(f"'{path}' is not callable but arguments were given")
-        return obj
+        return _invoker(path, getattr(builtins, name))
 
     # ----------------------------------------
     # Python module import fallback
@@ -157,10 +548,17 @@ def __native__(path: str, *args):
             raise AttributeError(f"'{obj}' has no attribute '{part}'")
         obj = getattr(obj, part)
 
+    return _invoker(path, obj)
+
+
+def _invoker(path: str, obj):
+    """obj itself if callable, else a function returning it (and refusing args)."""
     if callable(obj):
-        return obj(*args)
+        return obj
 
-    if args:
-        raise TypeError(f"'{path}' is not callable but arguments were given")
+    def value(*args):
+        if args:
+            raise TypeError(f"'{path}' is not callable but arguments were given")
+        return obj
 
-    return obj
+    return value
@@ -0,0 +1,265 @@
+# ============================================
+# Native call trampolines (OpCode.NATIVE_CALL)
+# --------------------------------------------
+# Compiled code reaches runtime/native.py through one
+# C-ABI callback per static signature, registered as
+# __nova_native_<ret>_<args> before the engine that
+# calls it is finalized (META "natives"):
+#
+#   ret __nova_native_<sig>(char *path, int64_t *site,
+#                           PyObject *cached, args...)
+#
+# Signature codes (must match compiler/codegen_nomc.py):
+#   i  int    -> int32_t
+#   d  float  -> double
+#   b  bool   -> bool
+#   s  str    -> argument: char *data, int64_t len;
+#                result: a Nova str* allocated here
+#   I  list[int]   -> argument: int32_t *data, int64_t len
+#   F  list[float] -> argument: double *data, int64_t len
+#   B  bytes_buffer -> argument: uint8_t *data, int64_t len
+#                (arguments only; natives get a writable
+#                memoryview of the elements, valid for the
+#                duration of the call: readinto/recv_into
+#                write straight into runtime-owned memory)
+#   h  handle -> int64_t key of a launcher-side object
+#                (native_objects.py): natives get the
+#                object, object results become handles
+#   H  list[handle] -> argument: int64_t *data, int64_t len
+#                (natives get a list of the objects)
+#   v  void   (results only)
+#
+# Each call site owns an int64 slot holding a PyObject*:
+# UNBOUND (the address of __nova_native_unbound) until
+# its first call binds the path (native.bind), then the
+# handle itself, which later calls receive as cached and
+# call without touching the path.
+#
+# Every signature gets its own generated callback with
+# one parameter per C argument (no *args), so a scalar
+# call is a handle check, a count and the native call.
+# ============================================
+
+import ctypes
+import os
+import sys
+
+from llvmlite import binding
+
+from native_objects import get, hold
+
+SYMBOL_PREFIX = "__nova_native_"
+UNBOUND_SYMBOL = SYMBOL_PREFIX + "unbound"
+
+# Per code: C parameters of an argument, C type of a result
+ARG_CTYPES = {
+    "i": (ctypes.c_int32,),
+    "d": (ctypes.c_double,),
+    "b": (ctypes.c_bool,),
+    "s": (ctypes.c_void_p, ctypes.c_int64),
+    "I": (ctypes.c_void_p, ctypes.c_int64),
+    "F": (ctypes.c_void_p, ctypes.c_int64),
+    "B": (ctypes.c_void_p, ctypes.c_int64),
+    "h": (ctypes.c_int64,),
+    "H": (ctypes.c_void_p, ctypes.c_int64),
+}
+
+# Per list code: element C type and memoryview format
+LIST_ELEMENTS = {
+    "I": (ctypes.c_int32, "i"),
+    "F": (ctypes.c_double, "d"),
+    "B": (ctypes.c_uint8, "B"),
+    "H": (ctypes.c_int64, "q"),
+}
+RESULT_CTYPES = {
+    "i": ctypes.c_int32,
+    "d": ctypes.c_double,
+    "b": ctypes.c_bool,
+    "s": ctypes.c_void_p,
+    "h": ctypes.c_int64,
+    "v": None,
+}
+
+
+class NovaStr(ctypes.Structure):
+    """str = { i64 len, i64 hash, i8* data, strbuf* buf }."""
+    _fields_ = [
+        ("len", ctypes.c_int64),
+        ("hash", ctypes.c_int64),
+        ("data", ctypes.c_void_p),
+        ("buf", ctypes.c_void_p),
+    ]
+
+
+_libc = ctypes.CDLL(None)
+_libc.malloc.restype = ctypes.c_void_p
+_libc.malloc.argtypes = [ctypes.c_size_t]
+
+
+def new_str(value):
+    """A Nova str owned by compiled code (malloc'd like the runtime's own)."""
+    data = str(value).encode("utf8")
+    buffer = _libc.malloc(len(data) + 1)
+    ctypes.memmove(buffer, data + b"\0", len(data) + 1)
+
+    header = _libc.malloc(ctypes.sizeof(NovaStr))
+    s = NovaStr.from_address(header)
+    s.len = len(data)
+    s.hash = 0  # computed and cached by the runtime on first use
+    s.data = buffer
+    s.buf = None
+    return header
+
+
+# Per result code: how a generated trampoline returns the native's
+# result. The C conversion takes an int for i, a float for d and a bool
+# for b as they are, so only other types go through int()/float()/bool()
+RETURNS = {
+    "i": "return result if type(result) is int else int(result)",
+    "d": "return result if type(result) is float else float(result)",
+    "b": "return result if type(result) is bool else bool(result)",
+    "s": "return new_str(result)",
+    "h": "return hold(result)",
+    "v": "return None",
+}
+
+
+# Site value before the first call, exported as __nova_native_unbound
+UNBOUND = object()
+
+
+class NativeBridgeError(Exception):
+    """Malformed trampoline signature."""
+    pass
+
+
+class NativeBridge:
+    """Trampolines and call-site handles of one launcher process."""
+
+    def __init__(self, nova_globals=None):
+        self.nova_globals = nova_globals
+        self.native = None
+        self.handles = []      # every handle a site points at (kept alive)
+        self.trampolines = {}  # signature -> ctypes callback (kept alive)
+
+    def register(self, signatures):
+        """Make __nova_native_<sig> resolvable for every signature; call before finalize."""
+        binding.add_symbol(UNBOUND_SYMBOL, id(UNBOUND))
+        for signature in signatures:
+            if signature in self.trampolines:
+                continue
+            callback = self.trampoline(signature)
+            self.trampolines[signature] = callback
+            binding.add_symbol(SYMBOL_PREFIX + signature, ctypes.cast(callback, ctypes.c_void_p).value)
+
+    def bind(self, path, site):
+        """First call at a site: resolve path and point the site slot at the handle."""
+        if self.native is None:
+            import native  # imported late: it imports launcher for nova_globals
+
+            if self.nova_globals is not None:
+                native.nova_globals = self.nova_globals
+            self.native = native
+
+        handle = self.native.bind(ctypes.string_at(path).decode("utf8"))
+        self.handles.append(handle)
+        ctypes.c_int64.from_address(site).value = id(handle)
+        return handle
+
+    def trampoline(self, signature):
+        ret, sep, args = signature.partition("_")
+        if not sep or ret not in RETURNS or any(code not in ARG_CTYPES for code in args):
+            raise NativeBridgeError(f"Invalid native signature: {signature!r}")
+
+        params = [ctype for code in args for ctype in ARG_CTYPES[code]]
+        cfunctype = ctypes.CFUNCTYPE(RESULT_CTYPES[ret], ctypes.c_void_p, ctypes.c_void_p, ctypes.py_object,
+                                     *params)
+        namespace = {
+            "UNBOUND": UNBOUND,
+            "bind": self.bind,
+            "native_error": native_error,
+            "new_str": new_str,
+            "list_view": list_view,
+            "read_text": read_text,
+            "get": get,
+            "hold": hold,
+            "texts": [(None, -1, "")] * len(args),  # per str argument: last (data, len, text)
+        }
+        exec(trampoline_source(ret, args), namespace)
+        return cfunctype(namespace["call"])
+
+
+def trampoline_source(ret, codes):
+    """
+    Python source of the callback for one signature: one parameter per C
+    argument, each (data, len) pair turned into the native's argument
+    inline, then NativeHandle.__call__ without its *args. A str argument
+    repeated from the previous call (a literal, typically) reuses its
+    decoded text: Nova never frees or rewrites the bytes of a str, so a
+    (data, len) pair names the same text for the life of the process.
+    """
+    params = []
+    body = []
+    args = []
+    for i, code in enumerate(codes):
+        if code == "s":
+            params += [f"data{i}", f"len{i}"]
+            body += [
+                f"text = texts[{i}]",
+                f"if text[0] != data{i} or text[1] != len{i}:",
+                f"    text = texts[{i}] = (data{i}, len{i}, read_text(data{i}, len{i}))",
+                f"arg{i} = text[2]",
+            ]
+            args.append(f"arg{i}")
+        elif code == "H":
+            params += [f"data{i}", f"len{i}"]
+            args.append(f"[get(h) for h in list_view('H', data{i}, len{i})]")
+        elif code == "h":
+            params.append(f"arg{i}")
+            args.append(f"get(arg{i})")
+        elif code in LIST_ELEMENTS:
+            params += [f"data{i}", f"len{i}"]
+            args.append(f"list_view({code!r}, data{i}, len{i})")
+        else:
+            params.append(f"arg{i}")
+            args.append(f"arg{i}")
+
+    body += [
+        "handle.calls += 1",
+        f"result = handle.invoke({', '.join(args)})",
+        RETURNS[ret],
+    ]
+    lines = [
+        f"def call(path, site, cached{''.join(', ' + p for p in params)}):",
+        "    try:",
+        "        handle = cached if cached is not UNBOUND else bind(path, site)",
+    ]
+    lines += [f"        {line}" for line in body]
+    lines += [
+        "    except Exception as e:",
+        "        native_error(path, e)",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def list_view(code, address, length):
+    """Writable memoryview over the elements of a compiled list."""
+    ctype, fmt = LIST_ELEMENTS[code]
+    if not length:
+        return memoryview(bytearray()).cast(fmt)
+    return memoryview((ctype * length).from_address(address)).cast("B").cast(fmt)
+
+
+def read_text(address, length):
+    """Python text of a Nova str's bytes."""
+    if not length:
+        return ""
+    return ctypes.string_at(address, length).decode("utf8", "replace")
+
+
+def native_error(path, error):
+    """Like the runtime's own errors: report and exit(1); nothing may unwind through JIT code."""
+    print(f"{type(error).__name__}: {error} (in native call '{ctypes.string_at(path).decode('utf8', 'replace')}')")
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(1)
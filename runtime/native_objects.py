@@ -0,0 +1,55 @@
+# ============================================
+# Object handles (native call code "h")
+# --------------------------------------------
+# Compiled code cannot hold a Python object. A native
+# whose result is one (a worker pool, a future, a
+# callable, an iterator) hands it an int64 handle
+# instead: a key of this table, which keeps the object
+# alive until it is released. An object has one handle
+# however often it is returned, so handles compare like
+# the objects' identities. Handles passed back to
+# natives are looked up here, which is why
+# std/sys.release gets the object and finds its handle.
+# Handle 0 is null and stands for None both ways.
+# ============================================
+
+import itertools
+import threading
+
+objects = {0: None}  # handle -> object
+_held = {}  # id(object) -> handle
+_handles = itertools.count(1)
+_lock = threading.Lock()  # compiled code may run natives on several threads
+
+
+class NativeObjectError(Exception):
+    """A handle that was never issued or is already released."""
+    pass
+
+
+def hold(obj):
+    """Handle of obj (0 for None), valid until obj is released."""
+    if obj is None:
+        return 0
+    with _lock:
+        handle = _held.get(id(obj))
+        if handle is None:
+            handle = _held[id(obj)] = next(_handles)
+            objects[handle] = obj
+        return handle
+
+
+def get(handle):
+    """The object behind handle."""
+    try:
+        return objects[handle]
+    except KeyError:
+        raise NativeObjectError(f"Invalid object handle {handle} (never issued or already released)")
+
+
+def release(obj):
+    """Drop the table's reference to obj, invalidating its handle; None and unheld objects are ignored."""
+    with _lock:
+        handle = _held.pop(id(obj), None)
+        if handle is not None:
+            del objects[handle]
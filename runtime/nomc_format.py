@@ -0,0 +1,63 @@
+# ============================================
+# .nomc container reader
+# Read side of compiler/nomc_format.py; the
+# runtime is built standalone, so the layout
+# is mirrored here. Keep NOMC_VERSION in sync.
+#
+#   "NOMC" u16 version u16 count
+#   count x (tag[4], pad[4], u64 offset, u64 size)
+#   META (JSON) | BITC (bitcode) | OBJ (object, optional)
+# ============================================
+
+import json
+import struct
+
+NOMC_MAGIC = b"NOMC"
+NOMC_VERSION = 2
+# Native call sites hold the handle object from this version on
+# (runtime/native_bridge.py); older ones cannot use the trampolines
+NATIVE_CALL_VERSION = 2
+
+HEADER = struct.Struct("<4sHH")
+SECTION = struct.Struct("<4s4xQQ")
+
+META = b"META"
+BITCODE = b"BITC"
+OBJECT = b"OBJ "
+
+
+class NomcFormatError(Exception):
+    """Raised for truncated or foreign .nomc data."""
+    pass
+
+
+def is_nomc(data):
+    return bytes(data[:len(NOMC_MAGIC)]) == NOMC_MAGIC
+
+
+def unpack_nomc(data):
+    """Return (meta dict, {tag: memoryview}) without copying payloads."""
+    view = memoryview(data)
+    if len(view) < HEADER.size:
+        raise NomcFormatError("file too short for a .nomc header")
+
+    magic, version, count = HEADER.unpack_from(view, 0)
+    if magic != NOMC_MAGIC:
+        raise NomcFormatError("not a .nomc container (bad magic)")
+    if version > NOMC_VERSION:
+        raise NomcFormatError(f".nomc format version {version} is newer than supported ({NOMC_VERSION})")
+
+    sections = {}
+    for i in range(count):
+        tag, start, size = SECTION.unpack_from(view, HEADER.size + i * SECTION.size)
+        if start + size > len(view):
+            raise NomcFormatError(f"section {tag!r} runs past the end of the file")
+        sections[tag] = view[start:start + size]
+
+    if META not in sections or BITCODE not in sections:
+        raise NomcFormatError(".nomc container is missing META or BITC")
+
+    meta = json.loads(bytes(sections.pop(META)).decode("utf8"))
+    if version < NATIVE_CALL_VERSION and meta.get("natives"):
+        raise NomcFormatError(f".nomc format version {version} predates the native call ABI; rebuild it")
+    return meta, sections
@@ -0,0 +1,214 @@
+# ============================================
+# Memory-mapped .novar reader
+# --------------------------------------------
+# A .novar is a plain USTAR archive whose first member
+# is NOVAR.INDEX, so the index always starts at byte 512:
+#
+#   "NVIX" u32 version u32 count u32 names_offset
+#   count x record, sorted by member name:
+#       u32 name_offset  u32 name_len
+#       u64 data_offset  u64 stored_size
+#       u64 size  u8 codec  7 pad  sha256[32]
+#   name table (utf8, concatenated)
+#
+# name_offset is relative to the index start; data_offset
+# points at the member's bytes inside the archive. The
+# launcher maps the file once, binary-searches the fixed
+# width records and hands out memoryview slices, so
+# opening a member costs O(log n) small reads no matter
+# how large the archive is.
+#
+# Members are compressed one by one (codec 0 = stored,
+# 1 = zlib, 2 = lzma; size and sha256 describe the
+# content), so reading one member only decompresses that
+# member. Version 1 indexes (no size/codec, all stored)
+# are still read; archives without an index fall back
+# to one tarfile scan.
+# ============================================
+
+import hashlib
+import json
+import lzma
+import mmap
+import struct
+import tarfile
+import zlib
+
+INDEX_NAME = "NOVAR.INDEX"
+INDEX_MAGIC = b"NVIX"
+INDEX_HEADER = struct.Struct("<4sIII")
+INDEX_RECORDS = {
+    1: struct.Struct("<IIQQ32s"),
+    2: struct.Struct("<IIQQQB7x32s"),
+}
+TAR_BLOCK = 512
+
+CODEC_STORE = 0
+CODEC_ZLIB = 1
+CODEC_LZMA = 2
+DECOMPRESS = {
+    CODEC_ZLIB: zlib.decompress,
+    CODEC_LZMA: lzma.decompress,
+}
+
+
+class NovarArchiveError(Exception):
+    """Raised for unreadable archives or missing members."""
+    pass
+
+
+class NovarArchive:
+    """Read-only, memory-mapped view of one .novar."""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            self.file = open(path, "rb")
+            # Copy-on-write mapping: pages stay shared with the page cache,
+            # but slices are writable buffers ctypes can point into
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError) as e:
+            raise NovarArchiveError(f"Failed to open .novar '{path}': {e}")
+
+        self.view = memoryview(self.map)
+        self.index = self.find_index()
+        # Only filled for archives without NOVAR.INDEX
+        self.members = None if self.index is not None else self.scan_tar()
+
+    # ----------------------------------------
+    # Index
+    # ----------------------------------------
+    def find_index(self):
+        """(count, names_offset, record struct) of the front-loaded NOVAR.INDEX, or None."""
+        if len(self.view) < TAR_BLOCK + INDEX_HEADER.size:
+            return None
+
+        header = self.view[:TAR_BLOCK]
+        name = bytes(header[:100]).rstrip(b"\0")
+        if name != INDEX_NAME.encode() or bytes(header[257:262]) != b"ustar":
+            return None
+
+        magic, version, count, names_offset = INDEX_HEADER.unpack_from(self.view, TAR_BLOCK)
+        if magic != INDEX_MAGIC or version not in INDEX_RECORDS:
+            return None
+        return count, names_offset, INDEX_RECORDS[version]
+
+    def record(self, i):
+        """(name bytes, entry dict) of index record i."""
+        layout = self.index[2]
+        fields = layout.unpack_from(self.view, TAR_BLOCK + INDEX_HEADER.size + i * layout.size)
+        if len(fields) == 5:
+            name_off, name_len, offset, size, digest = fields
+            stored_size, codec = size, CODEC_STORE
+        else:
+            name_off, name_len, offset, stored_size, size, codec, digest = fields
+
+        start = TAR_BLOCK + name_off
+        entry = {"offset": offset, "size": size, "stored_size": stored_size,
+                 "codec": codec, "sha256": digest.hex()}
+        return bytes(self.view[start:start + name_len]), entry
+
+    def lookup(self, name):
+        """Binary search the sorted records; returns the entry dict or None."""
+        if self.members is not None:
+            return self.members.get(name)
+
+        key = name.encode("utf8")
+        lo, hi = 0, self.index[0]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            found, entry = self.record(mid)
+            if found == key:
+                return entry
+            if found < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def names(self):
+        if self.members is not None:
+            return sorted(self.members)
+        return [self.record(i)[0].decode("utf8") for i in range(self.index[0])]
+
+    def digest(self):
+        """
+        Content hash of the archive. The index already holds every
+        member's SHA-256, so hashing it is enough; archives without
+        one are hashed whole.
+        """
+        if self.index is None:
+            return hashlib.sha256(self.view).hexdigest()
+
+        index_size = int(bytes(self.view[124:136]).strip(b"\0 ") or b"0", 8)
+        return hashlib.sha256(self.view[TAR_BLOCK:TAR_BLOCK + index_size]).hexdigest()
+
+    def scan_tar(self):
+        """Build the same entries for archives written without an index."""
+        try:
+            with tarfile.open(self.path, "r") as tar:
+                return {
+                    info.name: {"offset": info.offset_data, "size": info.size, "stored_size": info.size,
+                                 "codec": CODEC_STORE, "sha256": None}
+                    for info in tar.getmembers()
+                    if info.isfile()
+                }
+        except tarfile.TarError as e:
+            raise NovarArchiveError(f"Failed to read .novar '{self.path}': {e}")
+
+    # ----------------------------------------
+    # Members
+    # ----------------------------------------
+    def __contains__(self, name):
+        return self.lookup(name) is not None
+
+    def entry(self, name):
+        entry = self.lookup(name)
+        if entry is None:
+            raise NovarArchiveError(f"'{name}' not found in archive")
+        return entry
+
+    def read(self, name):
+        """
+        Memoryview of a member's bytes: a zero-copy slice of the mapping
+        for stored members, the decompressed content otherwise.
+        """
+        entry = self.entry(name)
+        start = entry["offset"]
+        stored = self.view[start:start + entry["stored_size"]]
+        if entry["codec"] == CODEC_STORE:
+            return stored
+
+        decompress = DECOMPRESS.get(entry["codec"])
+        if decompress is None:
+            raise NovarArchiveError(f"'{name}' uses unknown codec {entry['codec']}")
+        try:
+            data = decompress(stored)
+        except (zlib.error, lzma.LZMAError) as e:
+            raise NovarArchiveError(f"Failed to decompress '{name}': {e}")
+        finally:
+            stored.release()
+
+        if len(data) != entry["size"]:
+            raise NovarArchiveError(f"'{name}' decompressed to {len(data)} bytes, expected {entry['size']}")
+        return memoryview(data)
+
+    def read_json(self, name):
+        try:
+            return json.loads(bytes(self.read(name)))
+        except ValueError as e:
+            raise NovarArchiveError(f"Failed to parse '{name}': {e}")
+
+    def close(self):
+        try:
+            self.view.release()
+            self.map.close()
+        except BufferError:
+            pass  # slices still referenced elsewhere; unmapped with them
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
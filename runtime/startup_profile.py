@@ -0,0 +1,152 @@
+# ============================================
+# Launcher startup profiler (nova --profile-startup)
+# --------------------------------------------
+# Records wall-clock phases of one launch:
+#
+#   runtime.init     llvmlite import + initialization
+#   archive.open     mmap + member index
+#   manifest.read    Manifest.json
+#   engine.create    MCJIT engine + host target machine
+#   module.read      member bytes (decompressed if needed)
+#   module.add       object link / bitcode parse, per module
+#   module.compile   bitcode -> object on the background
+#                    compile thread, per module
+#   module.wait      main thread blocked on a module
+#   engine.finalize  code generation, relocation, constructors
+#   main             the program itself
+#
+# Each phase costs two perf_counter_ns() calls and one
+# tuple append, so it is cheap enough to leave on; a
+# disabled profile hands out one shared no-op phase.
+# Results are written as JSON or as a Chrome trace
+# (chrome://tracing, Perfetto).
+# ============================================
+
+import json
+import os
+import sys
+import threading
+from time import perf_counter_ns
+
+FORMATS = ("json", "chrome")
+
+
+class _Phase:
+    __slots__ = ("events", "name", "module", "nbytes", "start")
+
+    def __init__(self, events, name, module, nbytes):
+        self.events = events
+        self.name = name
+        self.module = module
+        self.nbytes = nbytes
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.events.append((self.name, self.module, self.nbytes, self.start, perf_counter_ns(),
+                            threading.get_ident()))
+        return False
+
+
+class _NullPhase:
+    """Shared phase of a disabled profile; nbytes may be set and is dropped."""
+    nbytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class StartupProfile:
+    """Phase timings and byte counts of one launch."""
+
+    def __init__(self, enabled=True, origin=None):
+        self.enabled = enabled
+        self.origin = perf_counter_ns() if origin is None else origin
+        self.events = []  # (name, module, bytes, start ns, end ns, thread)
+
+    def phase(self, name, module=None, nbytes=0):
+        """Context manager timing one phase; set .nbytes inside if not known up front."""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self.events, name, module, nbytes)
+
+    def add(self, name, start, end, module=None, nbytes=0):
+        """Record a phase measured elsewhere (perf_counter_ns values)."""
+        if self.enabled:
+            self.events.append((name, module, nbytes, start, end, threading.get_ident()))
+
+    # ----------------------------------------
+    # Output
+    # ----------------------------------------
+    def to_json(self):
+        phases = []
+        totals = {}
+        modules = {}
+        end = self.origin
+
+        for name, module, nbytes, start, stop, _ in self.events:
+            duration = (stop - start) / 1e6
+            phases.append({
+                "name": name,
+                "module": module,
+                "start_ms": round((start - self.origin) / 1e6, 3),
+                "duration_ms": round(duration, 3),
+                "bytes": nbytes,
+            })
+            totals[name] = round(totals.get(name, 0.0) + duration, 3)
+            if module is not None:
+                stats = modules.setdefault(module, {"duration_ms": 0.0, "bytes": 0})
+                stats["duration_ms"] = round(stats["duration_ms"] + duration, 3)
+                stats["bytes"] = max(stats["bytes"], nbytes)  # read and add see the same bytes
+            end = max(end, stop)
+
+        return {
+            "version": 1,
+            "pid": os.getpid(),
+            "total_ms": round((end - self.origin) / 1e6, 3),
+            "phases": phases,
+            "totals": totals,
+            "modules": modules,
+        }
+
+    def to_chrome_trace(self):
+        pid = os.getpid()
+        threads = {}  # one trace row per thread, main thread first
+        events = []
+        for name, module, nbytes, start, stop, thread in self.events:
+            args = {"bytes": nbytes}
+            if module is not None:
+                args["module"] = module
+            events.append({
+                "name": name if module is None else f"{name} {module}",
+                "cat": "startup",
+                "ph": "X",
+                "ts": (start - self.origin) / 1e3,
+                "dur": (stop - start) / 1e3,
+                "pid": pid,
+                "tid": threads.setdefault(thread, len(threads)),
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path="-", fmt="json"):
+        """Write to path ("-" = stderr; %p = pid) as "json" or "chrome"."""
+        data = self.to_chrome_trace() if fmt == "chrome" else self.to_json()
+        if path == "-":
+            json.dump(data, sys.stderr)
+            sys.stderr.write("\n")
+            return
+
+        with open(path.replace("%p", str(os.getpid())), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+
+DISABLED = StartupProfile(enabled=False, origin=0)
@@ -0,0 +1,207 @@
+# ============================================
+# Worker pools (std/thread)
+# --------------------------------------------
+# thread.pool(n) starts its workers once; they take
+# tasks from one shared queue, so a task costs a queue
+# put instead of a thread start:
+#
+#   mode "thread"   I/O-bound work and natives that
+#                   release the GIL
+#   mode "process"  CPU-bound Python work; functions,
+#                   arguments and results must pickle
+#                   (module-level functions)
+#
+# submit() returns a Future. parallel_map() cuts a list
+# into chunks, one task each, and keeps the order.
+#
+# Every task records when it was submitted, started and
+# finished (time.monotonic_ns, which is comparable across
+# processes). metrics() reports queue depth (submitted,
+# not finished), time spent waiting for a worker and
+# time spent running.
+# ============================================
+
+import concurrent.futures
+import os
+import threading
+import time
+
+MODES = ("thread", "process")
+CHUNKS_PER_WORKER = 4  # default parallel_map split: enough to even out uneven chunks
+
+WORKERS_ENV = "NOVA_POOL_WORKERS"  # size of the default pool (0 or unset: CPU count)
+
+
+class WorkerPoolError(Exception):
+    """Invalid pool configuration."""
+    pass
+
+
+def _timed_call(func, args):
+    """Runs on a worker: (started ns, finished ns, func(*args))."""
+    started = time.monotonic_ns()
+    result = func(*args)
+    return started, time.monotonic_ns(), result
+
+
+def _map_chunk(func, items):
+    return [func(item) for item in items]
+
+
+class WorkerPool:
+    """Persistent thread or process workers with futures and queue metrics."""
+
+    def __init__(self, workers=0, mode="thread", chunk=0):
+        if mode not in MODES:
+            raise WorkerPoolError(f"Unknown pool mode {mode!r} (expected {' or '.join(MODES)})")
+        if workers < 0 or chunk < 0:
+            raise WorkerPoolError("Worker count and chunk size cannot be negative")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+        self.chunk = chunk
+        if mode == "thread":
+            self.executor = concurrent.futures.ThreadPoolExecutor(self.workers, thread_name_prefix="nova-pool")
+        else:
+            self.executor = concurrent.futures.ProcessPoolExecutor(self.workers)
+
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.pending = 0      # submitted, not finished (queued or running)
+        self.max_pending = 0
+        self.wait_ns = 0      # totals and maxima over completed tasks
+        self.max_wait_ns = 0
+        self.run_ns = 0
+        self.max_run_ns = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        return False
+
+    def submit(self, func, *args):
+        """Future of func(*args) computed on a worker."""
+        submitted = time.monotonic_ns()
+        with self.lock:
+            self.submitted += 1
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+
+        try:
+            task = self.executor.submit(_timed_call, func, args)
+        except BaseException:
+            with self.lock:
+                self.submitted -= 1
+                self.pending -= 1
+            raise
+
+        # The caller gets its own future: the task's result carries timings
+        future = concurrent.futures.Future()
+        future.add_done_callback(lambda f: task.cancel() if f.cancelled() else None)
+        task.add_done_callback(lambda t: self._finish(t, future, submitted))
+        return future
+
+    def _finish(self, task, future, submitted):
+        cancelled = task.cancelled()
+        error = None if cancelled else task.exception()
+        with self.lock:
+            self.pending -= 1
+            if error is not None:
+                self.failed += 1
+            elif not cancelled:
+                started, finished, _ = task.result()
+                self.completed += 1
+                self.wait_ns += started - submitted
+                self.max_wait_ns = max(self.max_wait_ns, started - submitted)
+                self.run_ns += finished - started
+                self.max_run_ns = max(self.max_run_ns, finished - started)
+
+        if cancelled:
+            future.cancel()
+        if not future.set_running_or_notify_cancel():
+            return  # cancelled, by the caller or with the task
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(task.result()[2])
+
+    def map(self, func, items, chunk=0):
+        """
+        [func(x) for x in items], computed in chunks of chunk items (one
+        task each). chunk falls back to the pool's, then to an even split
+        into CHUNKS_PER_WORKER chunks per worker.
+        """
+        items = list(items)
+        if chunk < 0:
+            raise WorkerPoolError("Chunk size cannot be negative")
+        chunk = chunk or self.chunk or max(1, -(-len(items) // (self.workers * CHUNKS_PER_WORKER)))
+
+        futures = [self.submit(_map_chunk, func, items[i:i + chunk]) for i in range(0, len(items), chunk)]
+        return [value for part in wait_all(futures) for value in part]
+
+    def metrics(self):
+        """Task counts, queue depth and wait/run times (ms) so far."""
+        with self.lock:
+            done = self.completed
+            return {
+                "mode": self.mode,
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "queue_depth": self.pending,
+                "max_queue_depth": self.max_pending,
+                "avg_wait_ms": self.wait_ns / done / 1e6 if done else 0.0,
+                "max_wait_ms": self.max_wait_ns / 1e6,
+                "avg_run_ms": self.run_ns / done / 1e6 if done else 0.0,
+                "max_run_ms": self.max_run_ns / 1e6,
+            }
+
+    def shutdown(self, wait=True, cancel=False):
+        """Stop the workers once queued tasks are done (or cancelled, with cancel)."""
+        self.executor.shutdown(wait=wait, cancel_futures=cancel)
+
+
+def wait_all(futures, timeout=None):
+    """Results of futures in order once all are done; raises the first failure."""
+    futures = list(futures)
+    _, not_done = concurrent.futures.wait(futures, timeout)
+    if not_done:
+        raise TimeoutError(f"{len(not_done)} of {len(futures)} task(s) not done after {timeout}s")
+    return [future.result() for future in futures]
+
+
+# --------------------------------------------
+# Default pool (std/thread calls without a pool)
+# --------------------------------------------
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_pool():
+    """Shared thread pool, created on first use with $NOVA_POOL_WORKERS workers."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = WorkerPool(int(os.environ.get(WORKERS_ENV) or 0))
+        return _default
+
+
+def submit(pool, func, args=()):
+    return (pool or default_pool()).submit(func, *args)
+
+
+def parallel_map(func, items, chunk=0, pool=None):
+    return (pool or default_pool()).map(func, items, chunk)
+
+
+def metrics(pool=None):
+    return (pool or default_pool()).metrics()
+
+
+def shutdown(pool, cancel=False):
+    pool.shutdown(cancel=cancel)